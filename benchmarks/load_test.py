@@ -0,0 +1,245 @@
+# [신규 파일] benchmarks/load_test.py
+"""
+HTTP API 부하 테스트
+
+여러 팀이 동시에 /analyze 로 업로드하고, 웹 화면이 /status 를 폴링하고,
+다른 사용자들이 /chat 을 쓰는 상황을 재현해 엔드포인트별 지연 시간과 처리량을 측정합니다.
+
+    # 모델/LLM 단계를 시간 스텁으로 바꾼 서버를 이 프로세스 안에서 띄워서 측정
+    python -m benchmarks.load_test --spawn --uploaders 6 --chat-users 3 --duration 60
+
+    # 이미 실행 중인 서버(uvicorn main:app)를 대상으로 측정
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --uploaders 2
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_media import build_synthetic_video  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+class Recorder:
+    """엔드포인트별 응답 시간/오류와 작업 단위 결과를 스레드 안전하게 모읍니다."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.jobs = []
+
+    def request(self, endpoint: str, elapsed: float, ok: bool):
+        with self.lock:
+            self.latencies[endpoint].append(elapsed)
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def job(self, record: dict):
+        with self.lock:
+            self.jobs.append(record)
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return round(ordered[index] * 1000, 1)
+
+
+def _encode_multipart(fields: dict, file_field: str, file_path: Path):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n{value}\r\n".encode("utf-8"))
+    parts.append((f"--{boundary}\r\nContent-Disposition: form-data; name=\"{file_field}\"; "
+                  f"filename=\"{file_path.name}\"\r\nContent-Type: video/mp4\r\n\r\n").encode("utf-8"))
+    parts.append(file_path.read_bytes())
+    parts.append(f"\r\n--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def _call(recorder: Recorder, endpoint: str, request: urllib.request.Request, timeout: float = 600):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = json.loads(response.read() or b"{}")
+        recorder.request(endpoint, time.perf_counter() - started, True)
+        return body
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        recorder.request(endpoint, time.perf_counter() - started, False)
+        return {"_error": str(e)}
+
+
+def uploader(base_url: str, video: Path, args, recorder: Recorder, deadline: float):
+    """업로드 후 완료될 때까지 /status 를 폴링하는 팀 한 곳을 흉내 냅니다."""
+    criteria = json.dumps([{"name": "전달력", "score": 50, "description": "발표 태도"},
+                           {"name": "내용 구성", "score": 50, "description": "논리적 흐름"}], ensure_ascii=False)
+    while time.monotonic() < deadline:
+        fields = {"criteria": criteria}
+        if args.analysis_profile:
+            fields["analysisProfile"] = args.analysis_profile
+        body, content_type = _encode_multipart(fields, "file", video)
+        submitted = time.perf_counter()
+        response = _call(recorder, "POST /analyze",
+                         urllib.request.Request(f"{base_url}/analyze", data=body, method="POST",
+                                                headers={"Content-Type": content_type}))
+        job_id = response.get("job_id")
+        if not job_id:
+            time.sleep(args.poll_interval)
+            continue
+
+        record = {"job_id": job_id, "status": "Timeout"}
+        while time.monotonic() < deadline + args.drain_timeout:
+            time.sleep(args.poll_interval)
+            status = _call(recorder, "GET /status", urllib.request.Request(f"{base_url}/status/{job_id}"), timeout=30)
+            if status.get("status") in ("Complete", "Error"):
+                record["status"] = status["status"]
+                record["turnaround_sec"] = round(time.perf_counter() - submitted, 3)
+                timings = (status.get("result") or {}).get("analysis_summary", {}).get("timings", {})
+                record["queue_wait_sec"] = timings.get("queue_wait_sec")
+                record["analysis_profile"] = response.get("analysis_profile")
+                break
+        recorder.job(record)
+
+
+def chat_user(base_url: str, args, recorder: Recorder, deadline: float):
+    """일정 간격으로 /chat 을 호출하는 사용자 한 명을 흉내 냅니다."""
+    payload = json.dumps({"message": "발표를 잘하는 방법을 알려줘"}, ensure_ascii=False).encode("utf-8")
+    while time.monotonic() < deadline:
+        _call(recorder, "POST /chat",
+              urllib.request.Request(f"{base_url}/chat", data=payload, method="POST",
+                                     headers={"Content-Type": "application/json"}), timeout=60)
+        time.sleep(args.chat_interval)
+
+
+def spawn_stubbed_server(args) -> str:
+    """모델/LLM 단계를 시간 스텁으로 바꾼 main:app 을 백그라운드 스레드에서 실행합니다."""
+    import uvicorn
+    import main
+    from processing import task_manager, warmup
+    from benchmarks.stubs import stub_openai_scoring, stub_model_stages
+
+    stub_model_stages(task_manager, face_sec=args.face_sec, asr_rtf=args.asr_rtf)
+    stub_openai_scoring(task_manager, args.llm_latency)
+    warmup.setup_face_landmarker = lambda *a, **k: None
+    warmup.load_local_whisper_model = lambda *a, **k: None
+
+    def fake_ask_gpt(prompt):
+        time.sleep(args.chat_latency)
+        return "load-test stub"
+    main.ask_gpt = fake_ask_gpt
+
+    config = uvicorn.Config(main.app, host="127.0.0.1", port=args.port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{args.port}"
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for endpoint, values in sorted(recorder.latencies.items()):
+        endpoints[endpoint] = {
+            "requests": len(values),
+            "errors": recorder.errors[endpoint],
+            "error_rate": round(recorder.errors[endpoint] / len(values), 4) if values else 0,
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "p99_ms": _percentile(values, 99),
+        }
+    completed = [j for j in recorder.jobs if j["status"] == "Complete"]
+    waits = [j["queue_wait_sec"] for j in completed if j.get("queue_wait_sec") is not None]
+    turnarounds = [j["turnaround_sec"] for j in completed]
+    return {
+        "elapsed_sec": round(elapsed, 1),
+        "endpoints": endpoints,
+        "jobs": {
+            "submitted": len(recorder.jobs),
+            "completed": len(completed),
+            "failed": len([j for j in recorder.jobs if j["status"] == "Error"]),
+            "timed_out": len([j for j in recorder.jobs if j["status"] == "Timeout"]),
+            "throughput_per_min": round(len(completed) / elapsed * 60, 2) if elapsed else 0,
+            "queue_wait_p50_ms": _percentile(waits, 50),
+            "queue_wait_p95_ms": _percentile(waits, 95),
+            "turnaround_p50_ms": _percentile(turnarounds, 50),
+            "turnaround_p95_ms": _percentile(turnarounds, 95),
+            "profiles": {p: len([j for j in completed if j.get("analysis_profile") == p])
+                         for p in {j.get("analysis_profile") for j in completed}},
+        },
+    }
+
+
+def print_report(summary: dict):
+    print(f"\n=== 부하 테스트 결과 ({summary['elapsed_sec']}s) ===")
+    print(f"{'endpoint':<16} {'reqs':>6} {'err%':>6} {'p50':>9} {'p95':>9} {'p99':>9}  (ms)")
+    for endpoint, s in summary["endpoints"].items():
+        print(f"{endpoint:<16} {s['requests']:>6} {s['error_rate'] * 100:>6.1f} "
+              f"{s['p50_ms'] or 0:>9.1f} {s['p95_ms'] or 0:>9.1f} {s['p99_ms'] or 0:>9.1f}")
+    jobs = summary["jobs"]
+    print(f"작업: 완료 {jobs['completed']}/{jobs['submitted']} (실패 {jobs['failed']}, 시간초과 {jobs['timed_out']}), "
+          f"처리량 {jobs['throughput_per_min']}건/분, 대기 p50/p95 {jobs['queue_wait_p50_ms']}/{jobs['queue_wait_p95_ms']} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP API 부하 테스트")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default=None, help="대상 서버 주소 (예: http://127.0.0.1:8000)")
+    target.add_argument("--spawn", action="store_true", help="스텁 모델로 이 프로세스 안에서 서버 실행")
+    parser.add_argument("--port", type=int, default=8765, help="--spawn 시 사용할 포트")
+    parser.add_argument("--duration", type=float, default=60, help="업로드/채팅을 새로 시작하는 시간(초)")
+    parser.add_argument("--drain-timeout", type=float, default=300, help="종료 후 남은 작업을 기다릴 최대 시간(초)")
+    parser.add_argument("--uploaders", type=int, default=4, help="동시에 업로드하는 팀 수")
+    parser.add_argument("--chat-users", type=int, default=2, help="동시에 /chat 을 쓰는 사용자 수")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="/status 폴링 간격(초)")
+    parser.add_argument("--chat-interval", type=float, default=2.0, help="사용자별 /chat 호출 간격(초)")
+    parser.add_argument("--video-length", type=int, default=20, help="업로드할 합성 영상 길이(초)")
+    parser.add_argument("--video-resolution", default="640x360")
+    parser.add_argument("--analysis-profile", default=None, help="업로드 시 analysisProfile 값")
+    parser.add_argument("--face-sec", type=float, default=0.02, help="[스텁] 프레임당 얼굴 분석 시간(초)")
+    parser.add_argument("--asr-rtf", type=float, default=0.3, help="[스텁] 음성 인식 실시간 배율")
+    parser.add_argument("--llm-latency", type=float, default=3.0, help="[스텁] AI 채점 응답 시간(초)")
+    parser.add_argument("--chat-latency", type=float, default=1.5, help="[스텁] /chat 응답 시간(초)")
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    base_url = spawn_stubbed_server(args) if args.spawn or not args.url else args.url.rstrip("/")
+    video = build_synthetic_video(args.video_length, args.video_resolution)
+
+    recorder = Recorder()
+    started = time.monotonic()
+    deadline = started + args.duration
+    threads = [threading.Thread(target=uploader, args=(base_url, video, args, recorder, deadline), daemon=True)
+               for _ in range(args.uploaders)]
+    threads += [threading.Thread(target=chat_user, args=(base_url, args, recorder, deadline), daemon=True)
+                for _ in range(args.chat_users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    summary = summarize(recorder, time.monotonic() - started)
+    summary["config"] = {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()}
+    print_report(summary)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or RESULTS_DIR / f"load-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    output.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"✅ 결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+# [신규 파일] benchmarks/pipeline_bench.py
+"""
+분석 파이프라인 벤치마크
+
+합성 영상(길이 x 해상도 조합)마다 각 단계를 따로 측정하고,
+OpenAI 채점만 스텁으로 바꾼 run_analysis_task 전체 실행 시간도 측정합니다.
+
+    python -m benchmarks.pipeline_bench --lengths 30,120 --resolutions 640x360,1280x720 \\
+        --face-image face.jpg
+    python -m benchmarks.pipeline_bench --compare benchmarks/results/bench-이전실행.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_media import build_synthetic_video  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _current_rss_bytes() -> int:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _dir_bytes(paths) -> int:
+    total = 0
+    for root in paths:
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, name))
+                except OSError:
+                    pass
+    return total
+
+
+@contextmanager
+def measure(results: dict, name: str, watch_dirs=(), interval: float = 0.05):
+    """블록 실행 동안 wall/CPU(하위 프로세스 포함) 시간, 최대 RSS, 임시 디스크 사용량을 기록합니다."""
+    peak = {"rss": _current_rss_bytes(), "disk": _dir_bytes(watch_dirs)}
+    stop = threading.Event()
+
+    def sample():
+        while not stop.wait(interval):
+            peak["rss"] = max(peak["rss"], _current_rss_bytes())
+            peak["disk"] = max(peak["disk"], _dir_bytes(watch_dirs))
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    self_before = resource.getrusage(resource.RUSAGE_SELF)
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - started
+        stop.set()
+        sampler.join()
+        peak["rss"] = max(peak["rss"], _current_rss_bytes())
+        peak["disk"] = max(peak["disk"], _dir_bytes(watch_dirs))
+        self_after = resource.getrusage(resource.RUSAGE_SELF)
+        children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = ((self_after.ru_utime + self_after.ru_stime) - (self_before.ru_utime + self_before.ru_stime)
+               + (children_after.ru_utime + children_after.ru_stime)
+               - (children_before.ru_utime + children_before.ru_stime))
+        results[name] = {
+            "wall_sec": round(wall, 4),
+            "cpu_sec": round(cpu, 4),
+            "peak_rss_mb": round(peak["rss"] / 2**20, 1),
+            "peak_children_rss_mb": round(children_after.ru_maxrss / 1024, 1),
+            "peak_temp_disk_mb": round(peak["disk"] / 2**20, 2),
+        }
+
+
+def _prepare_session(video: Path):
+    from utils.helpers import create_session_dirs
+    video_dir, frame_dir = create_session_dirs()
+    video_path = Path(video_dir) / video.name
+    shutil.copyfile(video, video_path)
+    return video_path, Path(video_dir), Path(frame_dir)
+
+
+def bench_stages(video: Path, settings: dict) -> dict:
+    """각 파이프라인 단계를 따로 실행해 측정합니다."""
+    from processing.video_analyzer import extract_audio, extract_all_frames
+    from processing.face_analyzer import detect_face_blendshapes
+    from processing.blendshape_features import BlendshapeExtractor
+    from processing.audio_analyzer import transcribe_audio_with_timestamps, analyze_prosody_for_segments, get_audio_duration
+    from processing.data_combiner import align_data
+    from utils.helpers import cleanup_dirs
+
+    stages = {}
+    frame_rate = settings["frame_rate"]
+    video_path, video_dir, frame_dir = _prepare_session(video)
+    watch = (video_dir, frame_dir)
+    audio_path = frame_dir / "audio.wav"
+    try:
+        with measure(stages, "extract_audio", watch):
+            extract_audio(video_path, audio_path)
+        with measure(stages, "extract_all_frames", watch):
+            frame_paths = extract_all_frames(video_path, frame_dir, frame_rate)
+
+        # 단계 이름은 이전 결과와 비교할 수 있도록 그대로 둠 (검출 + 지표 계산)
+        with measure(stages, "analyze_image", watch):
+            extractor = BlendshapeExtractor(len(frame_paths))
+            for i, path in enumerate(frame_paths):
+                extractor.add(i / frame_rate, *detect_face_blendshapes(str(path)))
+            vision = extractor.results()
+
+        with measure(stages, "transcribe_audio_with_timestamps", watch):
+            segments, error = transcribe_audio_with_timestamps(str(audio_path), settings["whisper_model"])
+        if error:
+            print(f"   > ⚠️ 음성 인식 오류: {error}")
+            segments = []
+
+        if settings["prosody"]:
+            with measure(stages, "analyze_prosody_for_segments", watch):
+                segments = analyze_prosody_for_segments(audio_path, segments)
+
+        with measure(stages, "align_data", watch):
+            align_data(vision, segments)
+
+        audio_duration = get_audio_duration(audio_path)
+        face_wall = stages["analyze_image"]["wall_sec"]
+        return {
+            "stages": stages,
+            "frames": len(frame_paths),
+            "faces_detected": len([v for v in vision if "error" not in v]),
+            "segments": len(segments),
+            "audio_duration_sec": round(audio_duration, 2),
+            "face_fps": round(len(frame_paths) / face_wall, 2) if face_wall else None,
+            "asr_rtf": (round(stages["transcribe_audio_with_timestamps"]["wall_sec"] / audio_duration, 4)
+                        if audio_duration else None),
+        }
+    finally:
+        cleanup_dirs(video_dir, frame_dir)
+
+
+def bench_end_to_end(video: Path, analysis_profile: tuple, llm_latency: float) -> dict:
+    """OpenAI 채점만 스텁으로 바꾼 run_analysis_task 전체를 측정합니다."""
+    from processing import task_manager
+    from benchmarks.stubs import stub_openai_scoring
+
+    stub_openai_scoring(task_manager, llm_latency)
+    video_path, video_dir, frame_dir = _prepare_session(video)
+    job_id = f"bench-{uuid.uuid4()}"
+    task_manager.register_job(job_id)
+    measured = {}
+    with measure(measured, "run_analysis_task", (video_dir, frame_dir)):
+        task_manager.run_analysis_task(job_id, video_path, frame_dir, video_dir, [],
+                                       submitted_at=time.monotonic(), analysis_profile=analysis_profile)
+    status = task_manager.job_status.pop(job_id, {})
+    if status.get("status") != "Complete":
+        measured["error"] = status.get("message", "unknown")
+        return measured
+    measured["timings"] = status["result"]["analysis_summary"]["timings"]
+    return measured
+
+
+def bench_model_load(settings: dict) -> dict:
+    from processing.face_analyzer import setup_face_landmarker
+    from processing.audio_analyzer import load_local_whisper_model, DEFAULT_WHISPER_MODEL
+    results = {}
+    with measure(results, "setup_face_landmarker"):
+        setup_face_landmarker()
+    with measure(results, "load_local_whisper_model"):
+        load_local_whisper_model(DEFAULT_WHISPER_MODEL)
+        load_local_whisper_model(settings["whisper_model"])
+    return results
+
+
+def bench_server_startup(port: int, timeout: float) -> dict:
+    """
+    `uvicorn main:app` 을 새 프로세스로 띄워 첫 응답(/healthz)과 분석 준비 완료(/readyz 200)까지의 시간을 잽니다.
+    """
+    project_root = Path(__file__).resolve().parent.parent
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+                              cwd=project_root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    result = {"first_byte_sec": None, "ready_sec": None}
+    try:
+        while time.perf_counter() - started < timeout and server.poll() is None:
+            target = "healthz" if result["first_byte_sec"] is None else "readyz"
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/{target}", timeout=1) as response:
+                    response.read()
+                elapsed = round(time.perf_counter() - started, 3)
+                if target == "healthz":
+                    result["first_byte_sec"] = elapsed
+                    continue
+                result["ready_sec"] = elapsed
+                break
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.02)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return result
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare_results(current: dict, baseline_path: Path):
+    """두 실행 결과의 단계별 wall time을 비교해 출력합니다."""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    base_cases = {c["case"]: c for c in baseline.get("cases", [])}
+    print(f"\n=== 비교: {baseline_path} ({baseline['meta'].get('git')}) → 현재 ({current['meta'].get('git')}) ===")
+    for key in ("first_byte_sec", "ready_sec"):
+        now = (current.get("server_startup") or {}).get(key)
+        before = (baseline.get("server_startup") or {}).get(key)
+        if now is not None and before:
+            print(f"   server_startup.{key:<19} {before:>9.3f}s → {now:>9.3f}s  ({now / before:>5.2f}x)")
+    for case in current["cases"]:
+        base = base_cases.get(case["case"])
+        if not base:
+            print(f"[{case['case']}] 기준 결과 없음")
+            continue
+        print(f"[{case['case']}]")
+        rows = [(name, m["wall_sec"], base["stages"].get(name, {}).get("wall_sec"))
+                for name, m in case["stages"].items()]
+        rows.append(("end_to_end", case.get("end_to_end", {}).get("run_analysis_task", {}).get("wall_sec"),
+                     base.get("end_to_end", {}).get("run_analysis_task", {}).get("wall_sec")))
+        for name, now, before in rows:
+            if now is None or not before:
+                continue
+            print(f"   {name:<34} {before:>9.3f}s → {now:>9.3f}s  ({now / before:>5.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분석 파이프라인 벤치마크")
+    parser.add_argument("--lengths", default="30,120", help="합성 영상 길이(초), 쉼표 구분")
+    parser.add_argument("--resolutions", default="640x360,1280x720", help="합성 영상 해상도, 쉼표 구분")
+    parser.add_argument("--face-image", type=Path, default=os.getenv("BENCH_FACE_IMAGE"),
+                        help="영상에 합성할 정지 얼굴 이미지 (없으면 얼굴 미검출 상태로 측정)")
+    parser.add_argument("--speech-text", default=None, help="FFmpeg flite 필터가 있을 때 합성할 문장")
+    parser.add_argument("--profile", default="standard", help="분석 프로필 (fast/standard/thorough)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="스텁 OpenAI 응답 지연(초)")
+    parser.add_argument("--skip-stages", action="store_true", help="단계별 측정 생략 (전체 실행만)")
+    parser.add_argument("--skip-startup", action="store_true", help="서버 시작 시간 측정 생략")
+    parser.add_argument("--startup-port", type=int, default=8799, help="서버 시작 시간 측정에 사용할 포트")
+    parser.add_argument("--startup-timeout", type=float, default=300, help="서버 준비 완료 대기 최대 시간(초)")
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 경로")
+    parser.add_argument("--compare", type=Path, default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    from processing.analysis_profiles import resolve_analysis_profile
+    from utils.helpers import setup_temp_dirs
+
+    setup_temp_dirs()
+    analysis_profile = resolve_analysis_profile(args.profile)
+    settings = analysis_profile[1]
+
+    # 서버 시작 시간은 모델을 로드하기 전에 별도 프로세스로 측정
+    startup = None if args.skip_startup else bench_server_startup(args.startup_port, args.startup_timeout)
+    if startup:
+        print(f"   > [서버 시작] 첫 응답 {startup['first_byte_sec']}초, 준비 완료 {startup['ready_sec']}초")
+
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "analysis_profile": {"name": analysis_profile[0], **settings},
+            "face_image": str(args.face_image) if args.face_image else None,
+        },
+        "server_startup": startup,
+        "model_load": bench_model_load(settings),
+        "cases": [],
+    }
+
+    for length in [int(v) for v in args.lengths.split(",") if v]:
+        for resolution in [r for r in args.resolutions.split(",") if r]:
+            case_name = f"{length}s@{resolution}"
+            print(f"\n=== [벤치마크] {case_name} ===")
+            video = build_synthetic_video(length, resolution, args.face_image, args.speech_text)
+            case = {"case": case_name, "video": {"duration_sec": length, "resolution": resolution,
+                                                 "bytes": video.stat().st_size}}
+            if not args.skip_stages:
+                case.update(bench_stages(video, settings))
+            else:
+                case["stages"] = {}
+            case["end_to_end"] = bench_end_to_end(video, analysis_profile, args.llm_latency)
+            results["cases"].append(case)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or RESULTS_DIR / f"bench-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n✅ 벤치마크 결과 저장: {output}")
+
+    if args.compare:
+        compare_results(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# [신규 파일] benchmarks/stubs.py
+import time
+from types import SimpleNamespace
+
+# ⭐️ 벤치마크/부하 테스트에서 외부 API나 무거운 모델 단계를 일정 시간 대기로 대체하는 스텁
+# task_manager가 `from ... import` 로 가져온 이름을 교체하므로 원래 모듈은 건드리지 않습니다.
+
+
+def stub_openai_scoring(task_manager, latency_sec: float = 0.0):
+    """OpenAI 채점 단계를 고정 지연의 가짜 응답으로 대체합니다."""
+
+    def fake_get_ai_score(aligned_data, custom_criteria=None, prompt_chars=4000):
+        time.sleep(latency_sec)
+        criteria = custom_criteria or [{"name": "전달력", "score": 100}]
+        return {
+            "reviews": [{"name": c.get("name"), "score": 0, "feedback": "benchmark stub"} for c in criteria],
+            "overall_summary": "benchmark stub",
+            "video_summary": f"{len(aligned_data)} segments",
+        }
+
+    task_manager.get_ai_score = fake_get_ai_score
+    task_manager.is_openai_configured = lambda: True
+
+
+def stub_model_stages(task_manager, face_sec: float = 0.01, asr_rtf: float = 0.2, prosody_sec: float = 0.01):
+    """
+    MediaPipe/Whisper/Praat 단계를 지정한 시간만큼 대기하는 스텁으로 대체합니다.
+    (FFmpeg 추출은 실제로 실행하므로 디스크/디코딩 부하는 그대로 남습니다)
+    """
+    get_audio_duration = task_manager.get_audio_duration
+
+    fake_categories = [SimpleNamespace(category_name=name, score=score)
+                       for name, score in (("_neutral", 0.0), ("jawOpen", 0.1), ("mouthSmileLeft", 0.1), ("mouthSmileRight", 0.1))]
+
+    def fake_detect_face_blendshapes(image_path):
+        time.sleep(face_sec)
+        return fake_categories, None
+
+    def fake_transcribe(audio_path, model_size=None):
+        duration = get_audio_duration(audio_path)
+        time.sleep(duration * asr_rtf)
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(duration, start + 5.0)
+            segments.append({"start": start, "end": end, "text": "벤치마크용 가짜 문장입니다."})
+            start = end
+        return segments, None
+
+    def fake_prosody(audio_path, segments):
+        time.sleep(prosody_sec * len(segments))
+        for segment in segments:
+            segment["jitter"] = 1.0
+            segment["shimmer"] = 5.0
+        return segments
+
+    task_manager.detect_face_blendshapes = fake_detect_face_blendshapes
+    task_manager.transcribe_audio_with_timestamps = fake_transcribe
+    task_manager.analyze_prosody_for_segments = fake_prosody
@@ -1,8 +1,14 @@
 # app.py
+import io
+import json
 import os
+import time
+import zipfile
+from urllib.parse import quote
 from flask import Flask, request, jsonify, render_template, send_file # safe_join 제거
 from werkzeug.utils import safe_join # <--- werkzeug.utils에서 safe_join을 가져옴
-from report_generator import create_pdf, save_summary_excel
+from report_generator import create_pdf, save_summary_excel, create_pdfs_bulk
+from scoreboard_store import export_scoreboard
 
 app = Flask(__name__)
 
@@ -47,6 +53,77 @@ def generate_report():
         print(f"[ERROR] 보고서 생성 중 오류 발생: {e}")
         return jsonify({"error": f"보고서 생성 실패: {str(e)}"}), 500
 
+# 2-1. 대회 전체 팀 보고서 일괄 생성 API (POST 요청)
+# 요청: {"presentationTopic", "criteria", "teams": [{"teamName", "gradingResult"}, ...], "format": "zip" | "links"}
+def _valid_team_entry(team):
+    """일괄 생성 요청의 팀 항목: {"teamName": 비어 있지 않은 문자열, "gradingResult": [{...}, ...]}"""
+    if not isinstance(team, dict):
+        return False
+    team_name, grading_result = team.get("teamName"), team.get("gradingResult")
+    return (isinstance(team_name, str) and bool(team_name.strip())
+            and isinstance(grading_result, list) and bool(grading_result)
+            and all(isinstance(r, dict) for r in grading_result))
+
+@app.route("/generate_reports", methods=["POST"])
+def generate_reports():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "요청 본문은 JSON 객체여야 합니다."}), 400
+    presentation_topic = data.get("presentationTopic")
+    criteria = data.get("criteria")
+    teams = data.get("teams")
+    output_format = data.get("format", "links")
+
+    if not all([presentation_topic, criteria, teams]):
+        return jsonify({"error": "필수 데이터가 부족합니다."}), 400
+    # ⭐️ [수정] 팀 항목은 생성 전에 모두 검사 (잘못된 항목 하나 때문에 500이 나지 않도록)
+    if not isinstance(criteria, list) or not all(isinstance(c, dict) for c in criteria):
+        return jsonify({"error": "criteria는 기준 객체 배열이어야 합니다."}), 400
+    if not isinstance(teams, list):
+        return jsonify({"error": "teams는 배열이어야 합니다."}), 400
+    for index, team in enumerate(teams):
+        if not _valid_team_entry(team):
+            return jsonify({"error": f"teams[{index}]에 teamName과 gradingResult가 필요합니다."}), 400
+    if output_format not in ("zip", "links"):
+        return jsonify({"error": "format은 zip 또는 links 여야 합니다."}), 400
+
+    try:
+        started = time.perf_counter()
+        # PDF는 프로세스 풀에서 병렬 생성, Excel 요약은 같은 파일을 고치므로 순서대로 저장
+        reports = create_pdfs_bulk(criteria, teams)
+        for team in teams:
+            save_summary_excel(team["teamName"], presentation_topic, criteria, team["gradingResult"])
+        total_sec = round(time.perf_counter() - started, 3)
+        print(f"[INFO] 보고서 {len(reports)}개 일괄 생성 완료 ({total_sec}초)")
+
+        render_times = [{"teamName": r["teamName"], "fileId": r["fileId"], "render_sec": r["render_sec"],
+                         **({"error": r["error"]} if "error" in r else {})}
+                        for r in reports]
+
+        if output_format == "zip":
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+                for r in reports:
+                    if "path" in r:
+                        zf.write(r["path"], arcname=os.path.basename(r["path"]))
+                zf.writestr("render_times.json", json.dumps({"total_sec": total_sec, "reports": render_times},
+                                                            ensure_ascii=False, indent=2))
+            buffer.seek(0)
+            safe_topic = presentation_topic.replace(" ", "_").replace("/", "_").replace("\\", "_")
+            return send_file(buffer, as_attachment=True, download_name=f"{safe_topic}_reports.zip",
+                             mimetype="application/zip")
+
+        for r, times in zip(reports, render_times):
+            if "path" in r:
+                times["url"] = f"/download/pdf/{quote(r['fileId'])}"
+        return jsonify({"status": "success", "total_sec": total_sec, "reports": render_times})
+
+    except FileNotFoundError as e:
+        return jsonify({"error": f"파일 생성 실패 (폰트 오류): {str(e)}"}), 500
+    except Exception as e:
+        print(f"[ERROR] 보고서 일괄 생성 중 오류 발생: {e}")
+        return jsonify({"error": f"보고서 일괄 생성 실패: {str(e)}"}), 500
+
 # 3. 파일 다운로드 API (GET 요청)
 @app.route("/download/<file_type>/<file_id>", methods=["GET"])
 def download_file(file_type, file_id):
@@ -58,12 +135,22 @@ def download_file(file_type, file_id):
         directory = RESULTEXCEL_DIR
         filename = f"{file_id}.xlsx"
         mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    elif file_type == "csv":
+        directory = RESULTEXCEL_DIR
+        filename = f"{file_id}.csv"
+        mime_type = "text/csv"
     else:
         return jsonify({"error": "유효하지 않은 파일 타입입니다."}), 400
 
     file_path = safe_join(directory, filename)
+    if file_path and file_type in ("excel", "csv"):
+        # 점수표 저장소에서 (변경된 경우에만) 파일 생성, 저장소에 없는 예전 주제는 기존 파일 그대로 제공
+        try:
+            file_path = export_scoreboard(file_id, "xlsx" if file_type == "excel" else "csv") or file_path
+        except Exception as e:
+            return jsonify({"error": f"점수표 파일 생성 중 오류가 발생했습니다: {e}"}), 500
 
-    if not os.path.exists(file_path):
+    if not file_path or not os.path.exists(file_path):
         return jsonify({"error": f"파일을 찾을 수 없습니다: {filename}"}), 404
 
     try:
@@ -1,26 +1,51 @@
 # report_generator.py
 from fpdf import FPDF
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+try:
+    from .scoreboard_store import append_score_row, safe_topic_name, EXCEL_DIR  # main.py(FastAPI)에서 kyuchan 패키지로 임포트
+except ImportError:
+    from scoreboard_store import append_score_row, safe_topic_name, EXCEL_DIR  # kyuchan 폴더에서 Flask로 직접 실행
+import copy
 import os
 import time
 
-# Flask에서 호출될 함수 1: PDF 보고서 생성
-def create_pdf(team_name, criteria, grading_result):
-    pdf = FPDF()
+# 폰트/결과 경로 설정 (실행 위치와 무관하게 이 파일 기준)
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_PATH = os.path.join(CURRENT_DIR, "fonts", "malgun.ttf")
+PDF_DIR = os.path.join(CURRENT_DIR, "results", "pdf")
+
+# 일괄 생성 시 사용할 프로세스 수 (기본: CPU 수)
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "0")) or os.cpu_count()
+
+# ⭐️ 폰트를 등록해 둔 빈 FPDF (프로세스당 한 번만 만들고 보고서마다 복사해서 사용)
+_template_pdf = None
+_pool = None
+
+def _get_template_pdf():
+    global _template_pdf
+    if _template_pdf is None:
+        if not os.path.exists(FONT_PATH):
+            raise FileNotFoundError(f"❌ 폰트 파일을 찾을 수 없습니다: {FONT_PATH}. 1단계 3번을 확인하세요.")
+        pdf = FPDF()
+        pdf.add_font('malgun', '', FONT_PATH, uni=True)
+        pdf.add_font('malgun', 'B', FONT_PATH, uni=True)
+        _template_pdf = pdf
+    return _template_pdf
+
+def _new_pdf():
+    """템플릿을 복사해 새 FPDF를 만듭니다. 글자 폭 표(cw)는 읽기 전용이므로 복사하지 않고 공유합니다."""
+    template = _get_template_pdf()
+    shared = {id(font["cw"]): font["cw"] for font in template.fonts.values() if "cw" in font}
+    return copy.deepcopy(template, shared)
 
+# Flask에서 호출될 함수 1: PDF 보고서 생성
+# ⭐️ [수정] output_path 인자 추가 → 분석 작업 폴더(jobs/<job_id>/report.pdf)에 바로 저장할 때 사용
+def create_pdf(team_name, criteria, grading_result, output_path=None):
     # 🔧 폴더 존재하지 않으면 자동 생성
-    pdf_dir = os.path.join("results", "pdf")
-    os.makedirs(pdf_dir, exist_ok=True)
-    
-    # 폰트 경로 설정 (현재 프로젝트 구조에 맞게)
-    CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-    FONT_PATH = os.path.join(CURRENT_DIR, "fonts", "malgun.ttf")
-    if not os.path.exists(FONT_PATH):
-        raise FileNotFoundError(f"❌ 폰트 파일을 찾을 수 없습니다: {FONT_PATH}. 1단계 3번을 확인하세요.")
+    os.makedirs(PDF_DIR, exist_ok=True)
     
-    # 폰트 등록 및 설정
-    pdf.add_font('malgun', '', FONT_PATH, uni=True)
-    pdf.add_font('malgun', 'B', FONT_PATH, uni=True)
+    # 폰트가 등록된 템플릿 복사
+    pdf = _new_pdf()
     pdf.add_page()
 
     # 1. 제목: 팀명
@@ -72,21 +97,69 @@ def create_pdf(team_name, criteria, grading_result):
     pdf.cell(0, 10, f"총점 : {total_score}점", ln=True)
 
     # PDF 파일 저장 (팀명 기준)
-    pdf_path = os.path.join(pdf_dir, f"{team_name}.pdf")
+    pdf_path = output_path or os.path.join(PDF_DIR, f"{team_name}.pdf")
     pdf.output(pdf_path)
     return pdf_path
 
-# Flask에서 호출될 함수 2: Excel 요약 파일 저장/업데이트
+def _render_team_pdf(team_name, criteria, grading_result, file_id):
+    """일괄 생성용 작업 프로세스에서 실행: 보고서 하나를 만들고 걸린 시간을 함께 반환합니다."""
+    started = time.perf_counter()
+    result = {"teamName": team_name, "fileId": file_id}
+    try:
+        result["path"] = create_pdf(team_name, criteria, grading_result,
+                                    output_path=os.path.join(PDF_DIR, f"{file_id}.pdf"))
+    except Exception as e:
+        result["error"] = str(e)
+    result["render_sec"] = round(time.perf_counter() - started, 3)
+    return result
+
+def unique_file_ids(team_names):
+    """
+    팀명별 PDF 파일 이름(확장자 제외)을 만듭니다. 같은 팀명이 여러 번 나오면
+    두 번째부터 _2, _3 ... 을 붙여 서로 덮어쓰지 않도록 합니다.
+    """
+    used, file_ids = set(), []
+    for name in team_names:
+        file_id, index = name, 1
+        while file_id in used:
+            index += 1
+            file_id = f"{name}_{index}"
+        used.add(file_id)
+        file_ids.append(file_id)
+    return file_ids
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        # 작업 프로세스마다 시작할 때 템플릿(폰트)을 미리 만들어 둠
+        _pool = ProcessPoolExecutor(max_workers=REPORT_WORKERS, initializer=_get_template_pdf)
+    return _pool
+
+# Flask에서 호출될 함수 3: 여러 팀 PDF 보고서 일괄 생성
+def create_pdfs_bulk(criteria, teams):
+    """
+    teams: [{"teamName": ..., "gradingResult": [...]}, ...]
+    팀별 PDF를 프로세스 풀에서 병렬로 만들고, 팀별 결과(fileId, path 또는 error, render_sec)를 입력 순서대로 반환합니다.
+    """
+    _get_template_pdf()  # 폰트 파일이 없으면 작업을 나누기 전에 바로 오류
+    os.makedirs(PDF_DIR, exist_ok=True)
+    pool = _get_pool()
+    file_ids = unique_file_ids([team["teamName"] for team in teams])
+    futures = [pool.submit(_render_team_pdf, team["teamName"], criteria, team["gradingResult"], file_id)
+               for team, file_id in zip(teams, file_ids)]
+    return [future.result() for future in futures]
+
+# Flask에서 호출될 함수 2: Excel 요약 점수표에 팀 결과 추가
+# ⭐️ [수정] 매번 .xlsx 전체를 읽고 다시 쓰지 않고 scoreboard_store에 한 행만 추가 (반환 경로의 파일은 다운로드 시 생성)
 def save_summary_excel(team_name, presentation_topic, criteria, grading_result):
     # 📁 저장 경로 설정
-    summary_dir = "results/excel/"
+    summary_dir = EXCEL_DIR
     os.makedirs(summary_dir, exist_ok=True)
     
     # 🧱 열 구조 생성
     new_columns = ["팀명"] + [c["name"] for c in criteria] + ["총점"]
     # Excel 파일명은 주제명으로 생성 (띄어쓰기 등 파일명 불가 문자 치환)
-    safe_topic = presentation_topic.replace(" ", "_").replace("/", "_").replace("\\", "_")
-    path = os.path.join(summary_dir, f"{safe_topic}.xlsx")
+    path = os.path.join(summary_dir, f"{safe_topic_name(presentation_topic)}.xlsx")
 
     # 📊 점수 계산 및 데이터 행 생성
     total_score = sum(int(r["score"]) if str(r["score"]).isdigit() else 0 for r in grading_result)
@@ -96,24 +169,7 @@ def save_summary_excel(team_name, presentation_topic, criteria, grading_result):
         "총점": total_score
     }
 
-    # 📄 기존 파일 존재 여부 및 업데이트 로직
-    if os.path.exists(path):
-        existing = pd.read_excel(path)
-        existing_columns = list(existing.columns)
-
-        if existing_columns != new_columns:
-            # 기준 변경 시 기존 파일 백업
-            backup_path = os.path.join(summary_dir, f"summary_backup_{int(time.time())}.xlsx")
-            os.rename(path, backup_path)
-            # 새 기준으로 DataFrame 생성
-            df = pd.DataFrame([row], columns=new_columns)
-        else:
-            # 기존 데이터에 새 행 추가
-            df = pd.concat([existing, pd.DataFrame([row])], ignore_index=True)
-    else:
-        # 파일이 없으면 새 DataFrame 생성
-        df = pd.DataFrame([row], columns=new_columns)
-
-    # 💾 저장
-    df.to_excel(path, index=False)
-    return path
\ No newline at end of file
+    # 📄 점수표 저장소(SQLite)에 행 추가 (기준 변경 시 백업 포함)
+    # .xlsx 파일은 다운로드할 때 export_scoreboard가 만들고, 행이 그대로면 재사용
+    append_score_row(presentation_topic, new_columns, row)
+    return path
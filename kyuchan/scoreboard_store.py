@@ -0,0 +1,158 @@
+# scoreboard_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+# 📁 경로 설정 (report_generator와 같은 results 폴더 사용)
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+EXCEL_DIR = os.path.join(CURRENT_DIR, "results", "excel")
+DB_PATH = os.path.join(CURRENT_DIR, "results", "scoreboard.sqlite3")
+
+# 🗂 주제(topic)별 점수표 저장소
+# - 팀 결과는 SQLite에 한 행씩 추가만 함 (WAL 모드, 쓰기는 BEGIN IMMEDIATE로 직렬화 → 동시 요청에도 행 유실 없음)
+# - 채점 기준(열 구성)이 바뀌면 기존 점수표를 summary_backup_<시각>.xlsx 로 백업하고 버전을 올림
+# - .xlsx/.csv 파일은 다운로드할 때 만들고, 행이 바뀌지 않았으면 만들어 둔 파일을 그대로 사용
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS topics (
+    safe_topic TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    columns TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    revision INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS score_rows (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    safe_topic TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    row TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS score_rows_topic ON score_rows (safe_topic, version, id);
+CREATE TABLE IF NOT EXISTS exports (
+    safe_topic TEXT NOT NULL,
+    format TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    PRIMARY KEY (safe_topic, format)
+);
+"""
+
+_local = threading.local()
+
+
+def safe_topic_name(presentation_topic):
+    """파일명으로 쓸 수 있도록 띄어쓰기/경로 문자를 치환합니다. (기존 Excel 파일명 규칙과 동일)"""
+    return presentation_topic.replace(" ", "_").replace("/", "_").replace("\\", "_")
+
+
+def _connect():
+    """스레드마다 연결을 하나씩 재사용합니다. (Flask 요청 스레드)"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _read_rows(conn, safe_topic, version):
+    cursor = conn.execute("SELECT row FROM score_rows WHERE safe_topic = ? AND version = ? ORDER BY id",
+                          (safe_topic, version))
+    return [json.loads(r[0]) for r in cursor]
+
+
+def _import_legacy_excel(conn, safe_topic, columns):
+    """
+    저장소 도입 전에 만들어진 주제별 .xlsx가 있으면 처음 한 번 가져옵니다.
+    열 구성이 다르면 기존 규칙대로 백업 파일로 옮기기만 합니다.
+    """
+    path = os.path.join(EXCEL_DIR, f"{safe_topic}.xlsx")
+    if not os.path.exists(path):
+        return
+    existing = pd.read_excel(path)
+    if list(existing.columns) == columns:
+        now = time.time()
+        conn.executemany("INSERT INTO score_rows (safe_topic, version, row, created_at) VALUES (?, 1, ?, ?)",
+                         [(safe_topic, json.dumps(r, ensure_ascii=False, default=int), now)
+                          for r in existing.to_dict("records")])
+    else:
+        os.rename(path, os.path.join(EXCEL_DIR, f"summary_backup_{int(time.time())}.xlsx"))
+
+
+def append_score_row(presentation_topic, columns, row):
+    """
+    점수 행 하나를 추가합니다. 주제의 열 구성이 바뀌었으면 이전 점수표를 백업한 뒤 새 버전으로 시작합니다.
+    반환값: 추가 후 주제의 revision (행이 바뀔 때마다 1씩 증가)
+    """
+    safe_topic = safe_topic_name(presentation_topic)
+    conn = _connect()
+    backup = None
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = conn.execute("SELECT columns, version, revision FROM topics WHERE safe_topic = ?",
+                               (safe_topic,)).fetchone()
+        if current is None:
+            version, revision = 1, 0
+            conn.execute("INSERT INTO topics (safe_topic, topic, columns, version, revision) VALUES (?, ?, ?, 1, 0)",
+                         (safe_topic, presentation_topic, json.dumps(columns, ensure_ascii=False)))
+            _import_legacy_excel(conn, safe_topic, columns)
+        else:
+            old_columns, version, revision = json.loads(current[0]), current[1], current[2]
+            if old_columns != columns:
+                # 기준 변경 시 기존 점수표 백업 후 새 버전 시작
+                backup = (old_columns, _read_rows(conn, safe_topic, version))
+                version += 1
+                conn.execute("UPDATE topics SET columns = ?, version = ? WHERE safe_topic = ?",
+                             (json.dumps(columns, ensure_ascii=False), version, safe_topic))
+
+        conn.execute("INSERT INTO score_rows (safe_topic, version, row, created_at) VALUES (?, ?, ?, ?)",
+                     (safe_topic, version, json.dumps(row, ensure_ascii=False), time.time()))
+        revision += 1
+        conn.execute("UPDATE topics SET revision = ? WHERE safe_topic = ?", (revision, safe_topic))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    if backup and backup[1]:
+        os.makedirs(EXCEL_DIR, exist_ok=True)
+        backup_path = os.path.join(EXCEL_DIR, f"summary_backup_{int(time.time())}.xlsx")
+        pd.DataFrame(backup[1], columns=backup[0]).to_excel(backup_path, index=False)
+    return revision
+
+
+def export_scoreboard(safe_topic, file_format="xlsx"):
+    """
+    주제의 현재 점수표를 .xlsx 또는 .csv 파일로 만들어 경로를 반환합니다. (저장소에 없는 주제면 None)
+    마지막으로 만든 뒤 행이 바뀌지 않았으면 기존 파일을 그대로 반환합니다.
+    """
+    conn = _connect()
+    current = conn.execute("SELECT columns, version, revision FROM topics WHERE safe_topic = ?",
+                           (safe_topic,)).fetchone()
+    if current is None:
+        return None
+    columns, version, revision = json.loads(current[0]), current[1], current[2]
+    path = os.path.join(EXCEL_DIR, f"{safe_topic}.{file_format}")
+
+    exported = conn.execute("SELECT revision FROM exports WHERE safe_topic = ? AND format = ?",
+                            (safe_topic, file_format)).fetchone()
+    if exported and exported[0] == revision and os.path.exists(path):
+        return path
+
+    os.makedirs(EXCEL_DIR, exist_ok=True)
+    df = pd.DataFrame(_read_rows(conn, safe_topic, version), columns=columns)
+    tmp_path = os.path.join(EXCEL_DIR, f".{safe_topic}.{os.getpid()}.{threading.get_ident()}.{file_format}")
+    if file_format == "csv":
+        df.to_csv(tmp_path, index=False, encoding="utf-8-sig")  # Excel에서 한글이 깨지지 않도록 BOM 포함
+    else:
+        df.to_excel(tmp_path, index=False, engine="openpyxl")
+    os.replace(tmp_path, path)
+    conn.execute("INSERT OR REPLACE INTO exports (safe_topic, format, revision) VALUES (?, ?, ?)",
+                 (safe_topic, file_format, revision))
+    return path
@@ -1,26 +1,49 @@
 import os
 import json
+import hmac
 import uvicorn
 import uuid 
+import time
 from pathlib import Path
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, UploadFile, File, HTTPException, status, BackgroundTasks, Form, Request
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import (
+    FastAPI, UploadFile, File, HTTPException, status, Form, Request, WebSocket, WebSocketDisconnect
+)
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, Response
 from fastapi.middleware.cors import CORSMiddleware 
+from fastapi.concurrency import run_in_threadpool
 
 # 유틸리티 및 모델 로더 임포트
-from utils.helpers import setup_temp_dirs, create_session_dirs, save_upload_file, BASE_DIR 
-from utils.json_helpers import setup_json_dirs, save_criteria_json 
-from processing.face_analyzer import setup_face_landmarker
-from processing.audio_analyzer import load_local_whisper_model
+from utils.helpers import setup_temp_dirs, create_session_dirs, save_upload_file, cleanup_dirs, BASE_DIR 
+from utils.json_helpers import setup_json_dirs 
+from utils.criteria_registry import register_criteria, normalize_criteria, get_criteria, list_competitions, competitions_using
+from utils.job_store import get_job_artifact
+from utils.scratch import ScratchSpaceError, start_scratch_janitor, stop_scratch_janitor
+from processing.warmup import start_model_warmup, warmup_state, is_ready
+from processing.worker_pool import (
+    is_worker_pool_supported, is_worker_pool_running, start_worker_pool, stop_worker_pool,
+    submit_to_worker_pool, get_worker_stats
+)
 from processing.ai_scorer import is_openai_configured 
-from processing.task_manager import run_analysis_task, job_status
+from processing.task_manager import (
+    submit_analysis_task, job_status, register_job, get_queue_stats, load_partial_results
+)
+from processing.analysis_profiles import resolve_analysis_profile
+from processing.live_session import LiveSession, try_acquire_live_slot, release_live_slot
+from processing.batch_scorer import prepare_batch, submit_batch_scoring, get_batch_queue_stats
+from processing.team_analyzer import resolve_team_size
+from utils.metrics import render_metrics, inc_counter, observe
+from utils.profiler import (
+    PROFILE_ARTIFACTS, should_profile_job, request_profiling_for_next_jobs, get_profile_artifact
+)
 
 # ⭐️ 지피티 챗봇 기능용 임포트
 
 from processing.chat_manager import ask_gpt
 
 BASE_DIR = Path(__file__).resolve().parent
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+PROFILING_MAX_NEXT_JOBS = int(os.getenv("PROFILING_MAX_NEXT_JOBS", "10"))
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,18 +55,22 @@ async def lifespan(app: FastAPI):
     print("="*50)
     setup_temp_dirs()
     setup_json_dirs() # ⭐️ JSON 폴더 설정
+    start_scratch_janitor() # ⭐️ 비정상 종료로 남은 임시 폴더 정리 (시작 시 1회 + 주기적으로)
     
-    try:
-        setup_face_landmarker()
-        load_local_whisper_model()
+    # ⭐️ 모델 로드는 백그라운드에서 진행 (/readyz 로 완료 여부 확인, 그 사이 접수된 작업은 대기)
+    # ANALYSIS_WORKERS > 0 이면 모델을 한 번 로드한 호스트 프로세스가 분석 워커들을 fork
+    if is_worker_pool_supported():
+        start_worker_pool()
+    else:
+        start_model_warmup()
         
-        if not is_openai_configured(): 
-            print("="*50)
-            print("⚠️  경고: OPENAI_API_KEY가 없습니다. (AI 채점 기능은 비활성화됩니다)") 
-            print("="*50)
-    except Exception as e:
-        print(f"❌ 치명적 오류: AI 모델 로드 실패! {e}")
+    if not is_openai_configured(): 
+        print("="*50)
+        print("⚠️  경고: OPENAI_API_KEY가 없습니다. (AI 채점 기능은 비활성화됩니다)") 
+        print("="*50)
     yield
+    stop_worker_pool()
+    stop_scratch_janitor()
     print("="*50)
     print("서버가 종료됩니다.")
     print("="*50)
@@ -73,21 +100,75 @@ async def read_chat():
         raise HTTPException(status_code=404, detail="chat.html 파일을 찾을 수 없습니다.")
     return FileResponse(html_file_path)
 
+# ⭐️ 프로세스 생존 확인 (모델 로드 여부와 무관)
+@app.get("/healthz", include_in_schema=False)
+def healthz():
+    return {"status": "ok"}
+
+# ⭐️ 분석 준비 완료 확인 (AI 모델 로드 완료 시 200, 그 전에는 503)
+@app.get("/readyz", include_in_schema=False)
+def readyz():
+    if not is_ready():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=warmup_state)
+    return warmup_state
+
 @app.post("/analyze")
 def upload_and_analyze_video(
-    background_tasks: BackgroundTasks, 
     # 1. 안드로이드 Retrofit의 'file' 파트와 이름 일치
     file: UploadFile = File(...),
     
     # 2. 안드로이드 Retrofit의 'criteria' 파트와 이름 일치
-    criteria: str = Form(...),
+    # ⭐️ [수정] 등록된 기준을 쓸 때는 criteria 대신 criteriaId(버전 ID 또는 대회명)만 보내도 됨
+    criteria: str = Form(None),
+    criteriaId: str = Form(None),
     
     # 3. 안드로이드에서 보내지 않는 값들은 None으로 처리 (에러 방지)
     competitionName: str = Form(None), 
-    teamName: str = Form(None)
+    teamName: str = Form(None),
+
+    # 4. ⭐️ 작업별 프로파일링 (느린 영상 원인 분석용, 기본 꺼짐)
+    enableProfiling: bool = Form(False),
+
+    # 5. ⭐️ 분석 품질 프로필: fast / standard / thorough / auto (미지정 시 서버 기본값)
+    analysisProfile: str = Form(None),
+
+    # 6. ⭐️ 팀 발표 모드: 발표자 여러 명의 얼굴 추적 + 문장별 화자 구분 (teamSize: 화면에 나오는 발표자 수)
+    teamMode: bool = Form(False),
+    teamSize: int = Form(None)
 ):
+    try:
+        analysis_profile = resolve_analysis_profile(analysisProfile, get_queue_stats())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # ⭐️ [수정] 채점 기준 확정 (업로드 파일을 저장하기 전에 검증)
+    if criteriaId:
+        found = get_criteria(criteriaId)
+        if not found:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="등록되지 않은 채점 기준입니다.")
+        criteria_id, custom_criteria = found
+    else:
+        try:
+            custom_criteria = json.loads(criteria if criteria else "[]")
+        except json.JSONDecodeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="잘못된 JSON 형식의 채점 기준이 전달되었습니다."
+            )
+        if not isinstance(custom_criteria, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="채점 기준은 JSON 배열이어야 합니다.")
+        if custom_criteria:
+            # 대회명이 있으면 대회 기준 파일도 갱신 (내용이 같으면 다시 쓰지 않음)
+            criteria_id, custom_criteria = register_criteria(custom_criteria, competitionName)
+        else:
+            criteria_id, custom_criteria = None, normalize_criteria(custom_criteria)
+
     # 1. 임시 폴더 생성
-    video_dir, frame_dir = create_session_dirs()
+    # ⭐️ [수정] 업로드 크기(요청 본문은 이미 임시 파일로 받아 둔 상태)로 임시 저장소 선택 및 여유 공간 확인
+    try:
+        video_dir, frame_dir = create_session_dirs(file.size)
+    except ScratchSpaceError as e:
+        raise HTTPException(status_code=status.HTTP_507_INSUFFICIENT_STORAGE, detail=str(e))
 
     # 2. 파일 경로 설정
     safe_filename = file.filename or "uploaded_video.mp4"
@@ -96,34 +177,84 @@ def upload_and_analyze_video(
     try:
         # 파일을 실제로 저장
         save_upload_file(file, video_path)
-
-        custom_criteria = json.loads(criteria if criteria else "[]")
-        if custom_criteria and competitionName: 
-            save_criteria_json(custom_criteria, competitionName)
+        upload_size = video_path.stat().st_size
+        inc_counter("upload_bytes_total", upload_size)
+        observe("upload_size_bytes", upload_size)
 
         print(f"\n[작업 접수] 파일: {file.filename}")
         print(f"   > 저장 경로: {video_path}") # 경로 확인용 로그
         
         job_id = str(uuid.uuid4())
-        job_status[job_id] = {"status": "Pending", "message": "0/6: 작업 대기 중..."} 
+        register_job(job_id)
         
-        background_tasks.add_task(run_analysis_task, job_id, video_path, frame_dir, video_dir, custom_criteria)
+        profile = should_profile_job(enableProfiling)
+        task_args = (job_id, video_path, frame_dir, video_dir, custom_criteria)
+        task_kwargs = {"submitted_at": time.monotonic(), "profile": profile, "analysis_profile": analysis_profile,
+                       "report_meta": {"team_name": teamName, "competition_name": competitionName},
+                       "team_size": resolve_team_size(teamSize) if teamMode else None}
+        if is_worker_pool_running():
+            submit_to_worker_pool(*task_args, **task_kwargs)
+        else:
+            submit_analysis_task(*task_args, **task_kwargs)
         
-        print(f"   > Job ID 발급: {job_id}")
-        return {"job_id": job_id}
+        print(f"   > Job ID 발급: {job_id} (분석 프로필: {analysis_profile[0]})")
+        return {"job_id": job_id, "analysis_profile": analysis_profile[0], "criteria_id": criteria_id,
+                "team_size": task_kwargs["team_size"]}
 
-    except json.JSONDecodeError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="잘못된 JSON 형식의 채점 기준이 전달되었습니다."
-        )
     except Exception as e:
         print(f"❌❌❌ [업로드 실패] 오류: {e}")
+        cleanup_dirs(video_dir, frame_dir)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"파일 업로드 중 오류 발생: {str(e)}"
         )
 
+@app.get("/criteria", summary="등록된 대회별 채점 기준 목록")
+def list_criteria():
+    return {"competitions": list_competitions()}
+
+@app.get("/criteria/{criteria_id}", summary="채점 기준 조회 (버전 ID 또는 대회명)")
+def get_criteria_detail(criteria_id: str):
+    found = get_criteria(criteria_id)
+    if not found:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="등록되지 않은 채점 기준입니다.")
+    version_id, criteria = found
+    return {"criteria_id": version_id, "competitions": competitions_using(version_id), "criteria": criteria}
+
+# ⭐️ 배치 채점: 완료된 여러 작업을 기준 하나로, 또는 한 작업을 여러 기준으로 한 번에 (재)채점
+# 요청: {"job_ids": [...], "criteria_id": "..."} 또는 {"job_id": "...", "criteria_sets": [ID/대회명 또는 기준 배열, ...]}
+# 진행 상태는 /status/<job_id>, 결과는 /jobs/<job_id>/result
+@app.post("/score/batch", summary="완료된 작업 배치 채점")
+async def score_batch(request: Request):
+    try:
+        data = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="요청 본문이 올바른 JSON이 아닙니다.")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="요청 본문은 JSON 객체여야 합니다.")
+    job_ids = data.get("job_ids") or ([data["job_id"]] if data.get("job_id") else [])
+    criteria_refs = data.get("criteria_sets") or [data.get("criteria_id") or data.get("criteria")]
+    criteria_refs = [ref for ref in criteria_refs if ref] if isinstance(criteria_refs, list) else criteria_refs
+    try:
+        # 결과 파일 읽기/요약과 기준 색인 갱신은 디스크 작업이므로 이벤트 루프 밖에서 실행
+        prepared = await run_in_threadpool(prepare_batch, job_ids, criteria_refs)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    batch_id = str(uuid.uuid4())
+    job_status[batch_id] = {"status": "Pending", "message": f"배치 채점 대기 중... (항목 {len(prepared['items'])}개)"}
+    submit_batch_scoring(batch_id, prepared)
+    print(f"\n[배치 채점 접수] 작업 {len(prepared['summaries'])}개 × 기준 {len(prepared['criteria_sets'])}개 (Job: {batch_id})")
+    return {"job_id": batch_id, "items": prepared["items"]}
+
+@app.get("/queue", summary="분석 대기열 상태 확인")
+def get_queue():
+    return {**get_queue_stats(), "batch_scoring": get_batch_queue_stats()}
+
+@app.get("/workers", summary="분석 워커 프로세스 상태 및 메모리")
+def get_workers():
+    return get_worker_stats()
+
 @app.get("/status/{job_id}", summary="작업 진행 상태 확인")
 def get_status(job_id: str):
     status = job_status.get(job_id)
@@ -136,6 +267,136 @@ def get_status(job_id: str):
         
     return status
 
+# ⭐️ 긴 영상(구간 단위 처리) 작업의 중간 결과: 지금까지 끝난 구간의 정렬 데이터
+@app.get("/jobs/{job_id}/partial", summary="구간 단위 분석 중간 결과 확인")
+def get_partial_result(job_id: str):
+    partial = load_partial_results(job_id)
+    if partial is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="중간 결과를 찾을 수 없습니다. (/status 로 확인하세요)")
+    return {"job_id": job_id, **partial}
+
+# ⭐️ 완료된 작업의 결과/보고서 (jobs/<job_id>/ 에 저장, /status 조회 후에도 다시 받을 수 있음)
+def _artifact_response(request: Request, job_id: str, name: str, media_type: str):
+    path = get_job_artifact(job_id, name)
+    if not path:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="작업 결과 파일을 찾을 수 없습니다.")
+    stat = path.stat()
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    # 작업 산출물은 만든 뒤 바뀌지 않으므로 브라우저가 오래 캐시해도 됨 (ETag로 재검증)
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=86400"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+@app.get("/jobs/{job_id}/result", summary="완료된 작업의 분석 결과")
+def get_job_result(request: Request, job_id: str):
+    return _artifact_response(request, job_id, "result.json", "application/json")
+
+@app.get("/jobs/{job_id}/report.pdf", summary="완료된 작업의 PDF 보고서")
+def get_job_report(request: Request, job_id: str):
+    return _artifact_response(request, job_id, "report.pdf", "application/pdf")
+
+# ⭐️ 운영 모니터링용 메트릭 (Prometheus 텍스트 포맷)
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+def _check_admin(request: Request):
+    """
+    X-Admin-Token 헤더를 검사합니다.
+    ADMIN_TOKEN 환경 변수가 없으면 관리자 API는 모두 거부합니다. (기본 차단)
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail="ADMIN_TOKEN이 설정되지 않아 관리자 API를 사용할 수 없습니다.")
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 토큰이 올바르지 않습니다.")
+
+# ⭐️ 관리자 API: 다음 N개 작업 프로파일링 예약 (0이면 예약 취소, 최대 PROFILING_MAX_NEXT_JOBS)
+@app.post("/admin/profiling", summary="다음 N개 작업 프로파일링 예약")
+async def schedule_profiling(request: Request):
+    _check_admin(request)
+    try:
+        data = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="요청 본문이 올바른 JSON이 아닙니다.")
+    next_jobs = data.get("next_jobs", 1) if isinstance(data, dict) else None
+    if isinstance(next_jobs, bool) or not isinstance(next_jobs, int) or next_jobs < 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="next_jobs는 0 이상의 정수여야 합니다.")
+    remaining = request_profiling_for_next_jobs(min(next_jobs, PROFILING_MAX_NEXT_JOBS))
+    return {"profiling_next_jobs": remaining}
+
+# 프로파일 산출물에는 코드 경로/파일명이 들어 있으므로 관리자만 조회
+@app.get("/jobs/{job_id}/profile", summary="작업 프로파일 산출물 목록")
+def list_profile_artifacts(request: Request, job_id: str):
+    _check_admin(request)
+    available = [name for name in PROFILE_ARTIFACTS if get_profile_artifact(job_id, name)]
+    if not available:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="프로파일 결과를 찾을 수 없습니다.")
+    return {"job_id": job_id, "artifacts": {name: f"/jobs/{job_id}/profile/{name}" for name in available}}
+
+@app.get("/jobs/{job_id}/profile/{artifact}", summary="작업 프로파일 산출물 다운로드")
+def download_profile_artifact(request: Request, job_id: str, artifact: str):
+    _check_admin(request)
+    path = get_profile_artifact(job_id, artifact)
+    if not path:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="프로파일 결과를 찾을 수 없습니다.")
+    return FileResponse(path, media_type=PROFILE_ARTIFACTS[artifact], filename=f"{job_id}-{artifact}")
+
+# ⭐️ 실시간 리허설 모드 (카메라 프레임/마이크 오디오 스트리밍 → 실시간 지표, 종료 시 최종 결과)
+# 메시지 형식은 processing/live_session.py 상단 주석 참고
+@app.websocket("/ws/live")
+async def live_rehearsal(websocket: WebSocket):
+    await websocket.accept()
+    if not is_ready():
+        await websocket.close(code=1013, reason="AI 모델 로딩 중입니다. 잠시 후 다시 시도하세요.")
+        return
+    if not try_acquire_live_slot():
+        await websocket.close(code=1013, reason="실시간 리허설 동시 접속 수를 초과했습니다.")
+        return
+
+    session = None
+    try:
+        start = await websocket.receive_json()
+        try:
+            _, settings = resolve_analysis_profile(start.get("analysisProfile"), get_queue_stats())
+        except ValueError as e:
+            await websocket.send_json({"type": "error", "message": str(e)})
+            await websocket.close(code=1008)
+            return
+
+        session = LiveSession(websocket.send_json, start.get("criteria") or [], settings)
+        await session.start()
+        await websocket.send_json({"type": "ready"})
+        print("\n[실시간 리허설] 세션 시작")
+
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                session.feed(message["bytes"])
+            elif message.get("text") and json.loads(message["text"]).get("type") == "stop":
+                result = await session.finish()
+                await websocket.send_json({"type": "result", "result": result})
+                await websocket.close()
+                print(f"[실시간 리허설] 세션 종료 ({result['analysis_summary']['live']})")
+                break
+
+    except WebSocketDisconnect:
+        print("[실시간 리허설] 클라이언트 연결 끊김")
+    except Exception as e:
+        print(f"❌ [실시간 리허설] 오류: {e}")
+        try:
+            await websocket.send_json({"type": "error", "message": str(e)})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        if session:
+            await session.close()
+        release_live_slot()
+
 # ⭐️ 지피티 챗봇 기능 API
 @app.post("/chat")
 async def chat(request: Request):
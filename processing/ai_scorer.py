@@ -1,7 +1,14 @@
 from openai import OpenAI
 import os
+import time
 from dotenv import load_dotenv
 import json
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from utils.metrics import observe, inc_counter
+from utils.criteria_registry import normalize_criteria, criteria_version_id
 
 # .env 파일에서 환경 변수(API 키) 로드
 load_dotenv()
@@ -16,13 +23,49 @@ if api_key and api_key.startswith("sk-"):
         print(f"OpenAI 클라이언트 초기화 실패: {e}")
         client = None
 
+# ⭐️ 채점 결과 캐시: (기준 버전 ID, 프롬프트에 들어간 분석 데이터 해시) -> 결과
+# 같은 영상을 같은 기준으로 다시 채점하는 경우(재업로드, 재채점) API를 다시 호출하지 않습니다.
+SCORING_MODEL = "gpt-4o-mini"
+SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", "128"))
+_score_cache = OrderedDict()
+_score_cache_lock = threading.Lock()
+
+def scoring_cache_key(criteria_id: str, data_text: str) -> tuple:
+    return (criteria_id, hashlib.sha256(data_text.encode("utf-8")).hexdigest(), SCORING_MODEL)
+
+def get_cached_score(key: tuple):
+    with _score_cache_lock:
+        result = _score_cache.get(key)
+        if result is not None:
+            _score_cache.move_to_end(key)
+    inc_counter("llm_score_cache_total", result="hit" if result is not None else "miss")
+    return copy.deepcopy(result) if result is not None else None
+
+def put_cached_score(key: tuple, result: dict):
+    if SCORE_CACHE_SIZE <= 0:
+        return
+    with _score_cache_lock:
+        _score_cache[key] = copy.deepcopy(result)
+        _score_cache.move_to_end(key)
+        while len(_score_cache) > SCORE_CACHE_SIZE:
+            _score_cache.popitem(last=False)
+
 def is_openai_configured():
     """OpenAI API 키가 올바르게 설정되었는지 확인합니다."""
     return client is not None
 
-def get_ai_score(aligned_data: list, custom_criteria: list = None): 
+def record_llm_usage(response, started: float, caller: str):
+    """OpenAI 응답의 지연 시간과 토큰 사용량을 메트릭에 기록합니다."""
+    observe("llm_request_seconds", time.perf_counter() - started, caller=caller)
+    usage = getattr(response, "usage", None)
+    if usage:
+        inc_counter("llm_tokens_total", usage.prompt_tokens or 0, caller=caller, kind="prompt")
+        inc_counter("llm_tokens_total", usage.completion_tokens or 0, caller=caller, kind="completion")
+
+def get_ai_score(aligned_data: list, custom_criteria: list = None, prompt_chars: int = 4000): 
     """
     정렬된 데이터를 OpenAI API로 보내 JSON 형식의 채점 결과를 받습니다.
+    prompt_chars: 프롬프트에 포함할 분석 데이터 최대 글자 수 (분석 프로필별 예산)
     """
     if not is_openai_configured():
         return {"error": "OpenAI API 키가 설정되지 않아 AI 채점을 수행할 수 없습니다."}
@@ -30,9 +73,9 @@ def get_ai_score(aligned_data: list, custom_criteria: list = None):
     if not aligned_data:
         return {"error": "분석 데이터가 없어 AI 채점을 할 수 없습니다."}
 
-    print("   > [6/6] OpenAI API 호출 중... (JSON 모드)")
-
     # 1. 기준이 없으면 기본값 설정
+    # ⭐️ [수정] 기준은 레지스트리와 같은 방식으로 정규화 (중복 항목 제거, 버전 ID를 캐시 키로 사용)
+    custom_criteria = normalize_criteria(custom_criteria)
     if not custom_criteria:
         custom_criteria = [
             {"name": "전달력", "score": 100, "description": "발표 태도 및 명확성 평가"}
@@ -46,6 +89,15 @@ def get_ai_score(aligned_data: list, custom_criteria: list = None):
         desc = item.get('description', '')
         criteria_text += f"- {name} (만점: {score}점): {desc}\n"
 
+    data_text = str(aligned_data)[:prompt_chars]
+    cache_key = scoring_cache_key(criteria_version_id(custom_criteria), data_text)
+    cached = get_cached_score(cache_key)
+    if cached is not None:
+        print(f"   > [6/6] ✅ 채점 캐시 사용 (기준 버전 {cache_key[0]})")
+        return cached
+
+    print("   > [6/6] OpenAI API 호출 중... (JSON 모드)")
+
     # 3. JSON 강제 출력을 위한 프롬프트 구성
     prompt = f"""
     당신은 10년차 전문 발표 코칭 AI입니다. 
@@ -56,7 +108,7 @@ def get_ai_score(aligned_data: list, custom_criteria: list = None):
     {criteria_text}
 
     [분석 데이터 요약]
-    {str(aligned_data)[:4000]}...
+    {data_text}...
 
     [필수 응답 JSON 포맷]
     {{
@@ -73,18 +125,22 @@ def get_ai_score(aligned_data: list, custom_criteria: list = None):
     """
     
     try:
+        started = time.perf_counter()
         response = client.chat.completions.create(
-            model="gpt-4o-mini", # 또는 gpt-3.5-turbo-1106 (JSON 모드를 지원하는 모델 권장)
+            model=SCORING_MODEL, # 또는 gpt-3.5-turbo-1106 (JSON 모드를 지원하는 모델 권장)
             messages=[{"role": "user", "content": prompt}],
             temperature=0.5,
             response_format={"type": "json_object"} # ⭐️ 핵심: JSON 응답 강제
         )
+        record_llm_usage(response, started, caller="scoring")
         
         content = response.choices[0].message.content
         print("   > [6/6] ✅ OpenAI 채점 완료 (JSON).")
         
         # JSON 문자열을 파이썬 딕셔너리로 변환하여 반환
-        return json.loads(content)
+        result = json.loads(content)
+        put_cached_score(cache_key, result)
+        return result
         
     except json.JSONDecodeError:
         print("❌ AI 응답이 올바른 JSON 형식이 아닙니다.")
@@ -0,0 +1,60 @@
+# [신규 파일] processing/analysis_profiles.py
+import os
+from utils.metrics import inc_counter
+
+# ⭐️ 분석 품질 단계(프로필) 정의
+# - frame_rate: 얼굴 분석용 초당 추출 프레임 수
+# - whisper_model: 로컬 Whisper 모델 크기
+# - prosody: Praat 음성 운율(jitter/shimmer) 분석 실행 여부
+# - prompt_chars: AI 채점 프롬프트에 넣을 분석 데이터 최대 글자 수
+ANALYSIS_PROFILES = {
+    "fast": {
+        "frame_rate": 2,
+        "whisper_model": "base",
+        "prosody": False,
+        "prompt_chars": 2000,
+    },
+    "standard": {
+        "frame_rate": 5,
+        "whisper_model": "small",
+        "prosody": True,
+        "prompt_chars": 4000,
+    },
+    "thorough": {
+        "frame_rate": 10,
+        "whisper_model": "medium",
+        "prosody": True,
+        "prompt_chars": 12000,
+    },
+}
+
+DEFAULT_PROFILE = os.getenv("ANALYSIS_PROFILE", "standard")
+AUTO_PROFILE = "auto"
+
+# ⭐️ auto 정책 기준: 예상 대기 시간이나 대기열 길이가 목표를 넘으면 fast로 낮춥니다.
+AUTO_TARGET_WAIT_SEC = float(os.getenv("AUTO_TARGET_WAIT_SEC", "120"))
+AUTO_MAX_QUEUE_DEPTH = int(os.getenv("AUTO_MAX_QUEUE_DEPTH", "4"))
+
+
+def select_auto_profile(queue_stats: dict) -> str:
+    """현재 대기열 상태(task_manager.get_queue_stats)를 보고 프로필 이름을 고릅니다."""
+    if queue_stats["estimated_wait_sec"] > AUTO_TARGET_WAIT_SEC or queue_stats["waiting"] >= AUTO_MAX_QUEUE_DEPTH:
+        return "fast"
+    return "standard"
+
+
+def resolve_analysis_profile(requested: str = None, queue_stats: dict = None) -> tuple[str, dict]:
+    """
+    요청된 프로필 이름을 (이름, 설정) 튜플로 변환합니다.
+    'auto'이면 queue_stats를 기준으로 고르며, 알 수 없는 이름이면 ValueError를 발생시킵니다.
+    """
+    name = (requested or DEFAULT_PROFILE).strip().lower()
+    # 메트릭 라벨에는 사용자 입력을 그대로 넣지 않고 고정된 값(auto/explicit/default)만 사용
+    source = "default" if not requested else ("auto" if name == AUTO_PROFILE else "explicit")
+    if name == AUTO_PROFILE:
+        name = select_auto_profile(queue_stats) if queue_stats else "standard"
+    if name not in ANALYSIS_PROFILES:
+        raise ValueError(f"알 수 없는 분석 프로필입니다: {requested} (가능한 값: {', '.join(ANALYSIS_PROFILES)}, auto)")
+
+    inc_counter("analysis_profile_selected_total", profile=name, requested=source)
+    return name, dict(ANALYSIS_PROFILES[name])
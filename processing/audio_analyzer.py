@@ -1,42 +1,70 @@
-import whisper
-import parselmouth 
 import os
+import time
+import wave
 from dotenv import load_dotenv
 from pathlib import Path
 import numpy as np
+from utils.metrics import observe, inc_counter
 
 # ❗️ 로컬 모델을 전역 변수로 관리하여 한번만 로드
 model = None
+DEFAULT_WHISPER_MODEL = "small"
+SAMPLE_RATE = 16000  # Whisper 입력 형식 (16kHz mono)
+# ⭐️ 분석 프로필별 다른 크기의 모델 (크기 이름 -> 모델), 처음 사용할 때 로드
+_models_by_size = {}
 
-def load_local_whisper_model():
+def load_local_whisper_model(size: str = DEFAULT_WHISPER_MODEL):
     """
-    서버 시작 시 로컬 Whisper 모델을 로드합니다.
+    로컬 Whisper 모델을 로드합니다. (기본 'small' 모델은 서버 시작 시 로드)
     """
     global model
-    if model:
-        return model
+    if size in _models_by_size:
+        return _models_by_size[size]
     
-    print("   > [AI 1/3] ❗️ 로컬 음성인식 AI(Whisper 'small' 모델) 로드 중...")
+    print(f"   > [AI 1/3] ❗️ 로컬 음성인식 AI(Whisper '{size}' 모델) 로드 중...")
     try:
-        model = whisper.load_model("small") 
-        print("   > [AI 1/3] ✅ 로컬 Whisper 모델 로드 완료.")
-        return model
+        import whisper  # ⭐️ torch까지 함께 로드되므로 처음 사용할 때 임포트
+        loaded = whisper.load_model(size) 
+        _models_by_size[size] = loaded
+        if size == DEFAULT_WHISPER_MODEL:
+            model = loaded
+        print(f"   > [AI 1/3] ✅ 로컬 Whisper '{size}' 모델 로드 완료.")
+        return loaded
     except Exception as e:
         print(f"❌ 로컬 Whisper 모델 로드 중 심각한 오류 발생: {e}")
         raise
 
-def transcribe_audio_with_timestamps(audio_path: str):
+def get_audio_duration(audio_path) -> float:
+    """WAV 파일의 재생 길이(초)를 반환합니다. 읽을 수 없으면 0을 반환합니다."""
+    try:
+        with wave.open(str(audio_path), "rb") as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    except Exception:
+        return 0.0
+
+def transcribe_audio_with_timestamps(audio_path: str, model_size: str = DEFAULT_WHISPER_MODEL):
     """
     로컬 Whisper 모델을 사용하여 타임스탬프가 찍힌 텍스트(대본)를 반환합니다.
+    model_size가 기본 모델과 다르면 해당 크기의 모델을 (필요 시 로드하여) 사용합니다.
     """
-    global model
     if not model:
         return [], "Whisper 모델이 서버에 로드되지 않았습니다. 서버 로그를 확인하세요."
 
+    try:
+        asr_model = load_local_whisper_model(model_size)
+    except Exception as e:
+        print(f"   > [4/6] ⚠️ Whisper '{model_size}' 모델 로드 실패, 기본 모델 사용: {e}")
+        asr_model = model
+
     print(f"   > [4/6] ❗️ 로컬 음성 인식(Whisper) 실행 중... (시간 소요)")
     
     try:
-        result = model.transcribe(audio_path, language="ko", fp16=False) 
+        started = time.perf_counter()
+        result = asr_model.transcribe(audio_path, language="ko", fp16=False) 
+        duration = get_audio_duration(audio_path)
+        if duration > 0:
+            observe("asr_real_time_factor", (time.perf_counter() - started) / duration)
+            inc_counter("asr_audio_seconds_total", duration)
         print("   > [4/6] ✅ 음성 인식 완료.")
         return result["segments"], None 
         
@@ -44,15 +72,43 @@ def transcribe_audio_with_timestamps(audio_path: str):
         print(f"❌ 로컬 Whisper 실행 오류: {e}")
         return [], str(e) 
 
+def transcribe_samples(samples: np.ndarray, model_size: str = DEFAULT_WHISPER_MODEL):
+    """
+    16kHz mono float32 샘플 배열을 바로 인식합니다. (실시간 리허설 모드: 임시 WAV 파일 없이 짧은 구간 반복 인식)
+    transcribe_audio_with_timestamps 와 같은 (segments, error) 형식을 반환합니다.
+    """
+    try:
+        asr_model = load_local_whisper_model(model_size)
+    except Exception as e:
+        return [], str(e)
+
+    try:
+        started = time.perf_counter()
+        result = asr_model.transcribe(samples, language="ko", fp16=False)
+        duration = len(samples) / SAMPLE_RATE
+        if duration > 0:
+            observe("asr_real_time_factor", (time.perf_counter() - started) / duration)
+            inc_counter("asr_audio_seconds_total", duration)
+        return result["segments"], None
+    except Exception as e:
+        print(f"❌ 로컬 Whisper 실행 오류: {e}")
+        return [], str(e)
+
 # ⭐️ [수정] 음성 운율(목소리 떨림) 분석 함수 로직 수정
-def analyze_prosody_for_segments(audio_path: Path, segments: list) -> list:
+# ⭐️ [수정] audio_path 자리에 16kHz 샘플 배열도 받음 (실시간 리허설 모드), verbose=False면 로그 생략
+def analyze_prosody_for_segments(audio_path: Path, segments: list, verbose: bool = True) -> list:
     """
     Whisper가 나눠놓은 'segments' 시간대별로 Jitter와 Shimmer를 계산합니다.
     (segments 리스트를 직접 수정하여 반환합니다)
     """
-    print(f"   > [5/6] ❗️ 음성 운율(목소리 떨림) 분석 중... (Praat)")
+    if verbose:
+        print(f"   > [5/6] ❗️ 음성 운율(목소리 떨림) 분석 중... (Praat)")
     try:
-        snd = parselmouth.Sound(str(audio_path))
+        import parselmouth  # ⭐️ 처음 사용할 때 임포트
+        if isinstance(audio_path, np.ndarray):
+            snd = parselmouth.Sound(audio_path.astype(np.float64), sampling_frequency=SAMPLE_RATE)
+        else:
+            snd = parselmouth.Sound(str(audio_path))
         
         for segment in segments:
             start_time = segment['start']
@@ -74,11 +130,13 @@ def analyze_prosody_for_segments(audio_path: Path, segments: list) -> list:
             if np.isnan(segment['jitter']): segment['jitter'] = 0
             if np.isnan(segment['shimmer']): segment['shimmer'] = 0
 
-        print(f"   > [5/6] ✅ 음성 운율 분석 완료.")
+        if verbose:
+            print(f"   > [5/6] ✅ 음성 운율 분석 완료.")
         return segments 
         
     except Exception as e:
-        print(f"   > [5/6] ⚠️  음성 운율 분석 경고: {e}")
+        if verbose:
+            print(f"   > [5/6] ⚠️  음성 운율 분석 경고: {e}")
         for segment in segments:
             if 'jitter' not in segment:
                 segment['jitter'] = 0
@@ -0,0 +1,354 @@
+# [신규 파일] processing/batch_scorer.py
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from processing import ai_scorer, task_manager
+from processing.ai_scorer import record_llm_usage, is_openai_configured, scoring_cache_key, SCORING_MODEL
+from utils.criteria_registry import normalize_criteria, criteria_version_id, get_criteria
+from utils.job_store import get_job_artifact, save_job_result
+
+# ⭐️ 배치 채점: 완료된 여러 작업(또는 한 작업 × 여러 기준)을 적은 수의 LLM 호출로 채점
+# - 작업별 분석 결과를 짧은 요약문으로 줄이고, 같은 요약/기준은 한 호출 안에서 한 번만 보냄
+# - 프롬프트/응답 토큰 예산 안에서 항목을 최대한 묶고, 묶음들은 동시에 BATCH_MAX_CONCURRENCY개까지 호출
+# - 항목별 reviews 를 기준 이름/배점과 대조해서, 형식이 틀린 항목만 다시 요청 (최대 BATCH_MAX_RETRIES회)
+BATCH_PROMPT_TOKEN_BUDGET = int(os.getenv("BATCH_PROMPT_TOKEN_BUDGET", "12000"))
+BATCH_OUTPUT_TOKEN_BUDGET = int(os.getenv("BATCH_OUTPUT_TOKEN_BUDGET", "8000"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+BATCH_MAX_RETRIES = int(os.getenv("BATCH_MAX_RETRIES", "2"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "200"))
+SUMMARY_CHARS = int(os.getenv("BATCH_SUMMARY_CHARS", "2500"))  # 작업당 요약문 최대 글자 수
+# 동시에 실행할 배치 수 (나머지는 대기). 배치는 재시도 포함 수 분씩 걸리므로 FastAPI 공용 스레드 풀이 아니라
+# 전용 실행 스레드에서 처리합니다. (task_manager 의 분석 작업 실행 스레드와 같은 이유)
+BATCH_MAX_RUNNING = int(os.getenv("BATCH_MAX_RUNNING", "1"))
+
+_batch_runner = ThreadPoolExecutor(max_workers=max(1, BATCH_MAX_RUNNING), thread_name_prefix="batch-runner")
+_batch_lock = threading.Lock()
+_batch_counts = {"waiting": 0, "running": 0}
+
+# 응답 토큰 추정치: 항목 머리(총평/요약) + 기준당 피드백 한 개
+OUTPUT_TOKENS_PER_ITEM = 250
+OUTPUT_TOKENS_PER_CRITERION = 120
+
+INSTRUCTIONS = """당신은 10년차 전문 발표 코칭 AI입니다.
+아래 [분석 데이터]는 발표별 요약이고, [채점 기준]은 기준 묶음입니다.
+[채점 항목]마다 지정된 분석 데이터를 지정된 채점 기준으로 각각 독립적으로 평가하세요.
+반드시 아래 JSON 형식으로만 응답하고, Markdown이나 다른 설명은 포함하지 마세요.
+{"results": {"<항목 ID>": {"reviews": [{"name": "기준이름(띄어쓰기까지 정확히 일치)", "score": 획득점수(정수, 0~만점), "feedback": "구체적인 피드백(한글)"}], "overall_summary": "총평(3문장 내외)", "video_summary": "발표 내용 요약(2문장 내외)"}}}
+모든 항목 ID에 대해, 해당 기준의 모든 항목을 빠짐없이 한 번씩 평가해야 합니다."""
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 쓰는 보수적인 추정치 (한글 1글자 ≈ 1토큰, 영문 3글자 ≈ 1토큰)"""
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def summarize_job_result(result: dict, max_chars: int = SUMMARY_CHARS) -> str:
+    """
+    저장된 분석 결과(result.json)를 채점용 요약문으로 줄입니다.
+    전체 평균 한 줄 + 문장별 한 줄. 길면 발표 전체에서 고르게 문장을 골라 max_chars 안에 맞춥니다.
+    """
+    segments = result.get("aligned_transcript_data") or []
+    visible = [s["vision_avg"] for s in segments if "error" not in s.get("vision_avg", {})]
+
+    def mean(values):
+        values = list(values)
+        return round(sum(values) / len(values), 3) if values else 0
+
+    header = (f"문장 {len(segments)}개, 발표 {segments[-1]['end'] if segments else 0:.0f}초, "
+              f"평균 말속도 {mean(s.get('speech_rate_cps', 0) for s in segments)}자/초, "
+              f"얼굴 검출 문장 비율 {len(visible) / len(segments) if segments else 0:.2f}, "
+              f"평균 미소 {mean(v['smile'] for v in visible)}, 평균 시선(좌우/상하) "
+              f"{mean(v['gaze_h'] for v in visible)}/{mean(v['gaze_v'] for v in visible)}, "
+              f"평균 떨림(jitter) {mean(s.get('prosody', {}).get('jitter', 0) for s in segments)}")
+
+    lines = []
+    for s in segments:
+        vision = s.get("vision_avg", {})
+        face = ("얼굴 미검출" if "error" in vision else
+                f"미소 {vision['smile']}, 시선 {vision['gaze_h']}/{vision['gaze_v']}, 입 {vision['mouth_open']}")
+        lines.append(f"{s['start']:.0f}-{s['end']:.0f}초 \"{s['text'].strip()}\" "
+                     f"(속도 {s.get('speech_rate_cps', 0)}, {face}, 떨림 {s.get('prosody', {}).get('jitter', 0)})")
+
+    budget = max_chars - len(header)
+    total = sum(len(line) + 1 for line in lines)
+    if total > budget and lines:
+        # 앞부분만 자르면 발표 후반부가 빠지므로 고르게 건너뛰며 고름
+        keep = max(1, int(len(lines) * budget / total))
+        step = len(lines) / keep
+        lines = [lines[int(i * step)] for i in range(keep)]
+    return "\n".join([header] + lines)[:max_chars]
+
+
+def _criteria_text(criteria: list) -> str:
+    return "\n".join(f"- {c['name']} (만점: {c['score']}점): {c['description']}" for c in criteria)
+
+
+def prepare_batch(job_ids: list, criteria_refs: list) -> dict:
+    """
+    채점 항목 목록을 만듭니다. 작업 × 기준의 모든 조합을 채점합니다.
+    criteria_refs: 기준 버전 ID/대회명 문자열 또는 기준 목록(JSON 배열). 잘못된 입력이면 ValueError.
+    """
+    if not isinstance(job_ids, list) or not all(isinstance(job_id, str) for job_id in job_ids):
+        raise ValueError("job_ids는 작업 ID 문자열 배열이어야 합니다.")
+    if not isinstance(criteria_refs, list):
+        raise ValueError("criteria_sets는 배열이어야 합니다.")
+    if not job_ids or not criteria_refs:
+        raise ValueError("job_ids 와 채점 기준이 각각 하나 이상 필요합니다.")
+    if len(job_ids) * len(criteria_refs) > BATCH_MAX_ITEMS:
+        raise ValueError(f"한 번에 채점할 수 있는 항목은 최대 {BATCH_MAX_ITEMS}개입니다.")
+
+    criteria_sets = {}
+    for ref in criteria_refs:
+        if isinstance(ref, str):
+            found = get_criteria(ref)
+            if not found:
+                raise ValueError(f"등록되지 않은 채점 기준입니다: {ref}")
+            criteria_id, criteria = found
+        else:
+            criteria = normalize_criteria(ref)
+            criteria_id = criteria_version_id(criteria)
+        if not criteria:
+            raise ValueError("비어 있는 채점 기준이 있습니다.")
+        criteria_sets[criteria_id] = criteria
+
+    summaries = {}
+    for job_id in dict.fromkeys(job_ids):
+        path = get_job_artifact(job_id, "result.json")
+        if not path:
+            raise ValueError(f"완료된 작업 결과를 찾을 수 없습니다: {job_id}")
+        with path.open(encoding="utf-8") as f:
+            result = json.load(f)
+        # 배치 채점 결과나 대본이 없는 분석 결과는 채점할 내용이 없음 (빈 요약으로 LLM을 호출하지 않도록)
+        segments = result.get("aligned_transcript_data") if isinstance(result, dict) else None
+        if not isinstance(segments, list) or not segments:
+            raise ValueError(f"채점할 대본(문장) 데이터가 없는 작업입니다: {job_id}")
+        summaries[job_id] = summarize_job_result(result)
+
+    items = [{"item_id": f"i{n}", "job_id": job_id, "criteria_id": criteria_id}
+             for n, (job_id, criteria_id) in enumerate((j, c) for j in summaries for c in criteria_sets)]
+    return {"items": items, "summaries": summaries, "criteria_sets": criteria_sets}
+
+
+def pack_batches(items: list, summaries: dict, criteria_sets: dict) -> list:
+    """
+    항목들을 토큰 예산 안에서 묶습니다. (순서대로 채우는 greedy 방식)
+    같은 요약/기준을 쓰는 항목이 이미 묶음에 있으면 그 블록 비용은 다시 세지 않습니다.
+    """
+    base_tokens = estimate_tokens(INSTRUCTIONS)
+    batches, current = [], None
+    for item in items:
+        criteria = criteria_sets[item["criteria_id"]]
+        output_cost = OUTPUT_TOKENS_PER_ITEM + OUTPUT_TOKENS_PER_CRITERION * len(criteria)
+        for _ in range(2):
+            if current is None:
+                current = {"items": [], "jobs": set(), "criteria": set(), "prompt_tokens": base_tokens, "output_tokens": 0}
+            prompt_cost = 20
+            if item["job_id"] not in current["jobs"]:
+                prompt_cost += estimate_tokens(summaries[item["job_id"]])
+            if item["criteria_id"] not in current["criteria"]:
+                prompt_cost += estimate_tokens(_criteria_text(criteria))
+            fits = (current["prompt_tokens"] + prompt_cost <= BATCH_PROMPT_TOKEN_BUDGET
+                    and current["output_tokens"] + output_cost <= BATCH_OUTPUT_TOKEN_BUDGET)
+            if fits or not current["items"]:
+                # 빈 묶음이면 예산을 넘더라도 혼자 보냄 (요약문 길이가 SUMMARY_CHARS로 제한되어 있음)
+                current["items"].append(item)
+                current["jobs"].add(item["job_id"])
+                current["criteria"].add(item["criteria_id"])
+                current["prompt_tokens"] += prompt_cost
+                current["output_tokens"] += output_cost
+                break
+            batches.append(current)
+            current = None
+    if current and current["items"]:
+        batches.append(current)
+    return batches
+
+
+def _build_prompt(batch: dict, summaries: dict, criteria_sets: dict, retry_notes: dict = None) -> str:
+    job_keys = {job_id: f"D{n + 1}" for n, job_id in enumerate(sorted(batch["jobs"]))}
+    criteria_keys = {criteria_id: f"C{n + 1}" for n, criteria_id in enumerate(sorted(batch["criteria"]))}
+    parts = [INSTRUCTIONS, "\n[분석 데이터]"]
+    parts += [f"<{key}>\n{summaries[job_id]}\n</{key}>" for job_id, key in job_keys.items()]
+    parts.append("\n[채점 기준]")
+    parts += [f"<{key}>\n{_criteria_text(criteria_sets[criteria_id])}\n</{key}>" for criteria_id, key in criteria_keys.items()]
+    parts.append("\n[채점 항목]")
+    for item in batch["items"]:
+        line = f"- {item['item_id']}: 분석 데이터 {job_keys[item['job_id']]}, 채점 기준 {criteria_keys[item['criteria_id']]}"
+        if retry_notes and item["item_id"] in retry_notes:
+            line += f" (이전 응답 오류: {retry_notes[item['item_id']]})"
+        parts.append(line)
+    return "\n".join(parts)
+
+
+def validate_reviews(entry, criteria: list):
+    """
+    항목 하나의 응답을 기준 목록과 대조합니다. 반환값: (정리된 결과, None) 또는 (None, 오류 설명)
+    이름은 띄어쓰기 차이만 허용하고 기준의 이름으로 바꿔 돌려줍니다. 점수는 0~만점 정수여야 합니다.
+    """
+    if not isinstance(entry, dict) or not isinstance(entry.get("reviews"), list):
+        return None, "reviews 목록이 없음"
+    by_name = {c["name"].replace(" ", ""): c for c in criteria}
+    reviews = {}
+    for review in entry["reviews"]:
+        if not isinstance(review, dict):
+            return None, "reviews 항목 형식 오류"
+        criterion = by_name.get(str(review.get("name", "")).replace(" ", ""))
+        if criterion is None:
+            return None, f"알 수 없는 기준 이름 '{review.get('name')}'"
+        if criterion["name"] in reviews:
+            return None, f"기준 '{criterion['name']}' 중복"
+        try:
+            score = int(review.get("score"))
+        except (TypeError, ValueError):
+            return None, f"기준 '{criterion['name']}' 점수가 정수가 아님"
+        if not 0 <= score <= criterion["score"]:
+            return None, f"기준 '{criterion['name']}' 점수 범위(0~{criterion['score']}) 벗어남"
+        reviews[criterion["name"]] = {"name": criterion["name"], "score": score,
+                                      "feedback": str(review.get("feedback", ""))}
+    missing = [c["name"] for c in criteria if c["name"] not in reviews]
+    if missing:
+        return None, f"누락된 기준 {missing}"
+    return {
+        "reviews": [reviews[c["name"]] for c in criteria],
+        "overall_summary": str(entry.get("overall_summary", "")),
+        "video_summary": str(entry.get("video_summary", "")),
+    }, None
+
+
+def _call_llm(prompt: str, max_tokens: int) -> dict:
+    started = time.perf_counter()
+    response = ai_scorer.client.chat.completions.create(
+        model=SCORING_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.5,
+        max_tokens=max_tokens,
+        response_format={"type": "json_object"},
+    )
+    record_llm_usage(response, started, caller="batch_scoring")
+    return json.loads(response.choices[0].message.content)
+
+
+def _score_batch(batch: dict, summaries: dict, criteria_sets: dict, retry_notes: dict) -> dict:
+    """묶음 하나를 호출하고 항목별로 (결과, 오류) 를 반환합니다."""
+    prompt = _build_prompt(batch, summaries, criteria_sets, retry_notes)
+    # 추정치보다 길게 답하는 경우를 대비해 여유를 둠 (gpt-4o-mini 최대 출력 16k)
+    max_tokens = min(16000, int(batch["output_tokens"] * 1.5))
+    try:
+        results = _call_llm(prompt, max_tokens).get("results")
+    except Exception as e:
+        print(f"   > [Batch Scoring] ⚠️ 호출 실패 (항목 {len(batch['items'])}개): {e}")
+        return {item["item_id"]: (None, f"호출 실패: {e}") for item in batch["items"]}
+    results = results if isinstance(results, dict) else {}
+    return {item["item_id"]: validate_reviews(results.get(item["item_id"]), criteria_sets[item["criteria_id"]])
+            for item in batch["items"]}
+
+
+def score_items(prepared: dict, progress=None) -> dict:
+    """
+    항목을 묶어 동시에 채점하고, 형식이 틀린 항목만 모아 다시 요청합니다.
+    반환값: {item_id: 결과 또는 {"error": ...}}, 통계
+    """
+    items, summaries, criteria_sets = prepared["items"], prepared["summaries"], prepared["criteria_sets"]
+    results = {}
+    stats = {"items": len(items), "llm_calls": 0, "cache_hits": 0, "retried_items": 0}
+
+    # 같은 요약 × 같은 기준 버전은 이전 배치 채점 결과를 재사용 (ai_scorer 캐시 공유)
+    cache_keys = {item["item_id"]: scoring_cache_key(item["criteria_id"], "batch:" + summaries[item["job_id"]])
+                  for item in items}
+    pending = []
+    for item in items:
+        cached = ai_scorer.get_cached_score(cache_keys[item["item_id"]])
+        if cached is not None:
+            results[item["item_id"]] = cached
+            stats["cache_hits"] += 1
+        else:
+            pending.append(item)
+
+    retry_notes = {}
+    with ThreadPoolExecutor(max_workers=max(1, BATCH_MAX_CONCURRENCY)) as executor:
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            if not pending:
+                break
+            batches = pack_batches(pending, summaries, criteria_sets)
+            stats["llm_calls"] += len(batches)
+            if attempt:
+                stats["retried_items"] += len(pending)
+            if progress:
+                progress(attempt, len(batches), len(pending))
+            outcomes = {}
+            for batch_outcome in executor.map(lambda b: _score_batch(b, summaries, criteria_sets, retry_notes), batches):
+                outcomes.update(batch_outcome)
+
+            failed = []
+            for item in pending:
+                result, problem = outcomes[item["item_id"]]
+                if result is not None:
+                    results[item["item_id"]] = result
+                    ai_scorer.put_cached_score(cache_keys[item["item_id"]], result)
+                else:
+                    retry_notes[item["item_id"]] = problem
+                    failed.append(item)
+            pending = failed
+
+    for item in pending:
+        results[item["item_id"]] = {"error": f"AI 응답 형식 오류: {retry_notes.get(item['item_id'])}"}
+    return results, stats
+
+
+def submit_batch_scoring(batch_id: str, prepared: dict):
+    """배치 채점을 전용 실행 스레드 대기열에 넣고 바로 반환합니다."""
+    with _batch_lock:
+        _batch_counts["waiting"] += 1
+    _batch_runner.submit(_run_queued_batch, batch_id, prepared)
+
+
+def _run_queued_batch(batch_id: str, prepared: dict):
+    with _batch_lock:
+        _batch_counts["waiting"] -= 1
+        _batch_counts["running"] += 1
+    try:
+        run_batch_scoring(batch_id, prepared)
+    finally:
+        with _batch_lock:
+            _batch_counts["running"] -= 1
+
+
+def get_batch_queue_stats() -> dict:
+    """대기 중/실행 중 배치 채점 수"""
+    with _batch_lock:
+        return {**_batch_counts, "max_concurrent": max(1, BATCH_MAX_RUNNING)}
+
+
+def run_batch_scoring(batch_id: str, prepared: dict):
+    """
+    (백그라운드) 배치 채점 작업. 진행 상태는 task_manager.job_status 로 (/status/<batch_id>),
+    결과는 jobs/<batch_id>/result.json 으로 저장합니다.
+    """
+    job_status = task_manager.job_status
+    try:
+        if not is_openai_configured():
+            raise RuntimeError("OpenAI API 키가 설정되지 않아 AI 채점을 수행할 수 없습니다.")
+
+        def progress(attempt, call_count, item_count):
+            step = "재요청" if attempt else "채점"
+            job_status[batch_id] = {"status": "Analyzing",
+                                    "message": f"배치 {step} 중... (항목 {item_count}개, 호출 {call_count}회)"}
+
+        started = time.perf_counter()
+        results, stats = score_items(prepared, progress)
+        stats["elapsed_sec"] = round(time.perf_counter() - started, 2)
+
+        final_result = {
+            "items": [{**item, "ai_assessment": results[item["item_id"]]} for item in prepared["items"]],
+            "criteria": prepared["criteria_sets"],
+            "stats": stats,
+        }
+        save_job_result(batch_id, final_result)
+        job_status[batch_id] = {"status": "Complete", "result": final_result}
+        print(f"   > [Batch Scoring] ✅ 완료: 항목 {stats['items']}개, 호출 {stats['llm_calls']}회 (Job: {batch_id})")
+    except Exception as e:
+        print(f"   > [Batch Scoring] ❌ 실패 (Job: {batch_id}): {e}")
+        job_status[batch_id] = {"status": "Error", "message": str(e)}
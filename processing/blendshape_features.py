@@ -0,0 +1,209 @@
+# [신규 파일] processing/blendshape_features.py
+import numpy as np
+
+# ⭐️ 블렌드셰이프 → 표정/시선 지표 계산
+# - MediaPipe FaceLandmarker의 블렌드셰이프 52개는 항상 같은 순서(카테고리 index)로 나오므로,
+#   이름 → 열 번호는 첫 프레임에서 한 번만 확인하고, 모든 프레임의 점수를 한 번에 행렬로 옮깁니다.
+# - 파생 지표(gaze_h, smile ...)는 모든 프레임을 모은 뒤 한 번에 계산합니다. (선형 지표는 행렬 곱 한 번)
+# - 새 지표는 register_derived_metric() 으로 선언만 하면 됩니다. (프레임 루프는 수정할 필요 없음)
+# - 프레임 하나만 계산하는 경로(실시간 리허설, analyze_image)는 compute_frame_metrics() 로
+#   (블렌드셰이프 이름, 가중치) 목록을 바로 더합니다. (행렬을 만들면 프레임 하나에는 오히려 느림)
+
+BLENDSHAPE_NAMES = (
+    "_neutral", "browDownLeft", "browDownRight", "browInnerUp", "browOuterUpLeft", "browOuterUpRight",
+    "cheekPuff", "cheekSquintLeft", "cheekSquintRight", "eyeBlinkLeft", "eyeBlinkRight",
+    "eyeLookDownLeft", "eyeLookDownRight", "eyeLookInLeft", "eyeLookInRight", "eyeLookOutLeft",
+    "eyeLookOutRight", "eyeLookUpLeft", "eyeLookUpRight", "eyeSquintLeft", "eyeSquintRight",
+    "eyeWideLeft", "eyeWideRight", "jawForward", "jawLeft", "jawOpen", "jawRight", "mouthClose",
+    "mouthDimpleLeft", "mouthDimpleRight", "mouthFrownLeft", "mouthFrownRight", "mouthFunnel", "mouthLeft",
+    "mouthLowerDownLeft", "mouthLowerDownRight", "mouthPressLeft", "mouthPressRight", "mouthPucker",
+    "mouthRight", "mouthRollLower", "mouthRollUpper", "mouthShrugLower", "mouthShrugUpper",
+    "mouthSmileLeft", "mouthSmileRight", "mouthStretchLeft", "mouthStretchRight", "mouthUpperUpLeft",
+    "mouthUpperUpRight", "noseSneerLeft", "noseSneerRight",
+)
+COLUMN = {name: i for i, name in enumerate(BLENDSHAPE_NAMES)}
+_UNKNOWN_COLUMN = len(BLENDSHAPE_NAMES)  # 목록에 없는 카테고리는 버리는 열에 씀
+
+# 파생 지표 이름 -> {블렌드셰이프 이름: 가중치} (선형) 또는 함수(scores, COLUMN) -> 프레임별 값 배열
+# 등록 순서가 결과 dict의 키 순서가 됩니다. (직접 수정하지 말고 register_derived_metric() 사용)
+DERIVED_METRICS = {}
+_compiled = {"key": None}
+
+
+def register_derived_metric(name: str, definition):
+    """
+    파생 지표를 등록합니다.
+    definition: {"mouthSmileLeft": 0.5, ...} 처럼 블렌드셰이프 가중합, 또는
+                scores(프레임 수 × 52 float64 행렬)와 COLUMN을 받아 프레임별 값을 돌려주는 함수
+    블렌드셰이프 목록에 없는 이름은 0으로 계산합니다. (기존 pick() 동작과 동일)
+    """
+    if not callable(definition) and not isinstance(definition, dict):
+        raise TypeError("definition은 {이름: 가중치} dict 또는 함수여야 합니다.")
+    DERIVED_METRICS[name] = definition
+    _compiled["key"] = None
+
+
+register_derived_metric("gaze_h", {"eyeLookOutLeft": 0.5, "eyeLookInLeft": -0.5,
+                                   "eyeLookInRight": 0.5, "eyeLookOutRight": -0.5})
+register_derived_metric("gaze_v", {"eyeLookUpLeft": 0.5, "eyeLookDownLeft": -0.5,
+                                   "eyeLookUpRight": 0.5, "eyeLookDownRight": -0.5})
+register_derived_metric("smile", {"mouthSmileLeft": 0.5, "mouthSmileRight": 0.5})
+register_derived_metric("frown", {"mouthFrownLeft": 0.5, "mouthFrownRight": 0.5})
+register_derived_metric("brow_down", {"browDownLeft": 0.5, "browDownRight": 0.5})
+register_derived_metric("jaw_open", {"jawOpen": 1.0})
+register_derived_metric("brow_up", {"browInnerUp": 1 / 3, "browOuterUpLeft": 1 / 3, "browOuterUpRight": 1 / 3})
+# MediaPipe에는 mouthOpen 카테고리가 없어 기존에도 항상 0이었음 (출력 형식 유지를 위해 그대로 둠)
+register_derived_metric("mouth_open", {"mouthOpen": 1.0})
+register_derived_metric("squint", {"eyeSquintLeft": 0.5, "eyeSquintRight": 0.5})
+
+
+def _compile_metrics():
+    """
+    선형 지표를 가중치 행렬 하나(여러 프레임용)와 지표별 (이름, 가중치) 목록(프레임 하나용)으로 바꿉니다.
+    (register_derived_metric() 호출 뒤 처음 사용할 때만 다시 만듦)
+    """
+    if _compiled["key"] is None:
+        linear = [name for name, definition in DERIVED_METRICS.items() if isinstance(definition, dict)]
+        weights = np.zeros((len(BLENDSHAPE_NAMES), len(linear)))
+        for j, name in enumerate(linear):
+            for blendshape, weight in DERIVED_METRICS[name].items():
+                if blendshape in COLUMN:
+                    weights[COLUMN[blendshape], j] = weight
+        pairs = tuple((name, tuple(DERIVED_METRICS[name].items())) for name in linear)
+        functions = tuple((name, definition) for name, definition in DERIVED_METRICS.items() if callable(definition))
+        _compiled.update(key=tuple(DERIVED_METRICS), linear=linear, weights=weights, pairs=pairs, functions=functions)
+    return _compiled
+
+
+def compute_derived_metrics(scores: np.ndarray) -> dict:
+    """scores(프레임 수 × 52)로 모든 파생 지표를 계산합니다. 반환값: {지표 이름: 프레임별 값 배열}"""
+    compiled = _compile_metrics()
+    scores = scores.astype(np.float64, copy=False)
+    linear_values = scores @ compiled["weights"]
+    values = {name: linear_values[:, j] for j, name in enumerate(compiled["linear"])}
+    for name, definition in DERIVED_METRICS.items():
+        if callable(definition):
+            values[name] = np.asarray(definition(scores, COLUMN), dtype=np.float64)
+    return {name: values[name] for name in DERIVED_METRICS}
+
+
+def compute_frame_metrics(scores: dict) -> dict:
+    """프레임 하나의 {블렌드셰이프 이름: 점수}로 모든 파생 지표를 계산합니다. 반환값: {지표 이름: 값}"""
+    compiled = _compile_metrics()
+    pick = scores.get
+    values = {}
+    for name, pairs in compiled["pairs"]:
+        total = 0.0
+        for blendshape, weight in pairs:
+            total += weight * pick(blendshape, 0)
+        values[name] = total
+    if compiled["functions"]:
+        row = np.zeros((1, len(BLENDSHAPE_NAMES)))
+        for blendshape, score in scores.items():
+            if blendshape in COLUMN:
+                row[0, COLUMN[blendshape]] = score
+        for name, definition in compiled["functions"]:
+            values[name] = float(np.asarray(definition(row, COLUMN), dtype=np.float64)[0])
+        return {name: values[name] for name in DERIVED_METRICS}
+    return values
+
+
+class BlendshapeExtractor:
+    """
+    프레임별 블렌드셰이프 점수를 모아 두었다가 파생 지표와 함께 기존 형식의 결과 목록으로 만듭니다.
+
+        extractor = BlendshapeExtractor(len(frame_paths))
+        for i, path in enumerate(frame_paths):
+            extractor.add(i / frame_rate, *detect_face_blendshapes(path))
+        results = extractor.results()   # analyze_image 결과 + "time" 과 같은 형식
+
+    프레임마다 점수를 미리 할당한 (capacity × 52) 배열의 한 행에 쓰기만 하고 (넘치면 두 배로 늘림),
+    파생 지표와 결과의 all_blendshapes dict는 results()에서 한 번에 만듭니다.
+    """
+
+    def __init__(self, capacity: int = 0):
+        self._scores = np.zeros((max(capacity, 16), len(BLENDSHAPE_NAMES)))
+        self._count = 0           # 점수가 기록된(얼굴이 검출된) 프레임 수
+        self._frames = []         # 프레임별 (시간, 점수 행 번호 또는 None, 오류 메시지)
+        self._layout_ids = []     # 검출된 프레임별 카테고리 배치 번호
+        self._layouts = []        # (열 번호 배열 또는 slice, 카테고리 이름 목록)
+        self._extra_names = []    # BLENDSHAPE_NAMES 에 없는 카테고리 (52번 열부터 차례로 배정)
+
+    def _layout_id(self, categories: list) -> int:
+        # 모델 출력 순서는 고정이므로 개수와 첫 카테고리 이름만 확인하고 직전 배치를 재사용
+        if self._layouts:
+            columns, names = self._layouts[-1]
+            if len(names) == len(categories) and names[0] == categories[0].category_name:
+                return len(self._layouts) - 1
+        names = [c.category_name for c in categories]
+        for name in names:
+            if name not in COLUMN and name not in self._extra_names:
+                self._extra_names.append(name)
+        width = len(BLENDSHAPE_NAMES) + len(self._extra_names)
+        if self._scores.shape[1] < width:
+            self._scores = np.pad(self._scores, ((0, 0), (0, width - self._scores.shape[1])))
+        columns = np.array([COLUMN[name] if name in COLUMN else len(BLENDSHAPE_NAMES) + self._extra_names.index(name)
+                            for name in names], dtype=np.intp)
+        if np.array_equal(columns, np.arange(len(columns))):
+            columns = slice(0, len(columns))  # MediaPipe 기본 순서: 행 앞부분에 그대로 씀 (fancy index보다 빠름)
+        self._layouts.append((columns, names))
+        return len(self._layouts) - 1
+
+    def add(self, time: float, categories: list = None, error: str = None):
+        """프레임 하나를 추가합니다. categories는 MediaPipe의 face_blendshapes[0] (없으면 error 기록)"""
+        if not categories:
+            self._frames.append((time, None, error or "얼굴 미검출"))
+            return
+        layout_id = self._layout_id(categories)
+        if self._count == len(self._scores):
+            self._scores = np.concatenate([self._scores, np.zeros_like(self._scores)])
+        self._scores[self._count, self._layouts[layout_id][0]] = [c.score for c in categories]
+        self._layout_ids.append(layout_id)
+        self._frames.append((time, self._count, None))
+        self._count += 1
+
+    def frame_counts(self) -> tuple:
+        """(얼굴 검출 프레임 수, 미검출 프레임 수)"""
+        return self._count, len(self._frames) - self._count
+
+    def score_matrix(self) -> np.ndarray:
+        """검출된 프레임 수 × 52 점수 행렬 (없는 카테고리는 0)"""
+        return self._scores[:self._count, :len(BLENDSHAPE_NAMES)]
+
+    def _blendshape_dicts(self) -> list:
+        """검출된 프레임별 {카테고리 이름: 점수} (모델 출력 순서, 기존 all_blendshapes 형식)"""
+        dicts = [None] * self._count
+        layout_ids = np.asarray(self._layout_ids, dtype=np.intp)
+        for layout_id, (columns, names) in enumerate(self._layouts):
+            if len(self._layouts) == 1:
+                rows, block = range(self._count), self._scores[:self._count, columns]
+            else:
+                rows = np.flatnonzero(layout_ids == layout_id)
+                block = self._scores[rows][:, columns]
+            for row, values in zip(rows, block.tolist()):
+                dicts[row] = dict(zip(names, values))
+        return dicts
+
+    def results(self) -> list:
+        """
+        프레임별 결과 목록: 검출된 프레임은 {파생 지표..., "all_blendshapes": {이름: 점수}, "time"},
+        검출되지 않은 프레임은 {"error": ..., "time"}
+        """
+        metric_names = list(DERIVED_METRICS)
+        metric_rows = []
+        blendshapes = []
+        if self._count:
+            derived = compute_derived_metrics(self.score_matrix())
+            metric_rows = np.column_stack([derived[name] for name in metric_names]).tolist()
+            blendshapes = self._blendshape_dicts()
+
+        results = []
+        for time, row, error in self._frames:
+            if row is None:
+                results.append({"error": error, "time": time})
+                continue
+            data = dict(zip(metric_names, metric_rows[row]))
+            data["all_blendshapes"] = blendshapes[row]
+            data["time"] = time
+            results.append(data)
+        return results
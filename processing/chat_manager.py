@@ -1,7 +1,9 @@
 # chat_manager.py
 import os
+import time
 from openai import OpenAI
 from dotenv import load_dotenv
+from processing.ai_scorer import record_llm_usage
 
 load_dotenv()
 apikey = os.getenv("OPENAI_API_KEY")
@@ -17,10 +19,12 @@ def ask_gpt(prompt):
     if not client:
         return "OpenAI API Key가 설정되지 않았습니다."
     try:
+        started = time.perf_counter()
         response = client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": prompt}],
         )
+        record_llm_usage(response, started, caller="chat")
         return response.choices[0].message.content.strip()
     except Exception as e:
         return f"Error: {e}"
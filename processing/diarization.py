@@ -0,0 +1,147 @@
+# [신규 파일] processing/diarization.py
+import wave
+import numpy as np
+
+# ⭐️ 가벼운 화자 구분 (팀 발표 모드)
+# Whisper 문장(segment)마다 목소리 특징을 뽑아 k-means로 묶습니다. 별도의 화자 임베딩 모델은 쓰지 않습니다.
+# - 음높이(F0) 중앙값/변동 폭, 평균 세기(dB): Praat(parselmouth)로 파일 전체를 한 번만 계산하고 문장별로 잘라 사용
+# - 장기 평균 스펙트럼(LTAS) 대역 에너지: numpy FFT (음색 차이, 음높이 계산이 실패해도 사용 가능)
+# 목소리가 비슷한 발표자끼리는 섞일 수 있으므로, 팀 모드에서는 얼굴의 입 움직임과 함께 사용합니다. (team_analyzer.py)
+
+LTAS_BANDS = 8
+LTAS_MIN_HZ = 80.0
+LTAS_MAX_HZ = 4000.0
+FFT_SIZE = 512
+SILHOUETTE_MIN = 0.25  # 화자 수를 자동으로 고를 때, 이보다 낮으면 한 명으로 판단
+
+
+def _read_wav(audio_path):
+    """16bit PCM WAV를 float32 (-1~1) mono 샘플로 읽습니다."""
+    with wave.open(str(audio_path), "rb") as wav:
+        rate, channels = wav.getframerate(), wav.getnchannels()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+
+def _pitch_intensity(audio_path):
+    """파일 전체의 (F0 시각, F0[Hz, 무성음은 0], 세기 시각, 세기[dB]) 또는 실패 시 None"""
+    try:
+        import parselmouth  # audio_analyzer 와 마찬가지로 처음 사용할 때 임포트
+        snd = parselmouth.Sound(str(audio_path))
+        pitch = snd.to_pitch(time_step=0.01)
+        intensity = snd.to_intensity(time_step=0.01)
+        return (np.asarray(pitch.xs()), np.asarray(pitch.selected_array["frequency"]),
+                np.asarray(intensity.xs()), np.asarray(intensity.values[0]))
+    except Exception as e:
+        print(f"   > [Diarization] ⚠️ 음높이/세기 계산 실패, 스펙트럼 특징만 사용: {e}")
+        return None
+
+
+def _ltas(samples: np.ndarray, rate: int) -> np.ndarray:
+    """구간의 장기 평균 스펙트럼을 로그 간격 대역 LTAS_BANDS개로 줄인 값 (전체 음량 차이는 제거)"""
+    if len(samples) < FFT_SIZE:
+        return np.full(LTAS_BANDS, np.nan)
+    hop = FFT_SIZE // 2
+    count = 1 + (len(samples) - FFT_SIZE) // hop
+    frames = np.lib.stride_tricks.as_strided(samples, shape=(count, FFT_SIZE),
+                                             strides=(samples.strides[0] * hop, samples.strides[0]))
+    power = (np.abs(np.fft.rfft(frames * np.hanning(FFT_SIZE), axis=1)) ** 2).mean(axis=0)
+    freqs = np.fft.rfftfreq(FFT_SIZE, 1.0 / rate)
+    edges = np.geomspace(LTAS_MIN_HZ, min(LTAS_MAX_HZ, rate / 2), LTAS_BANDS + 1)
+    bands = np.array([power[(freqs >= lo) & (freqs < hi)].sum() for lo, hi in zip(edges[:-1], edges[1:])])
+    log_bands = np.log(bands + 1e-10)
+    return log_bands - log_bands.mean()
+
+
+def segment_features(audio_path, segments: list) -> np.ndarray:
+    """문장별 특징 행렬 (문장 수 × 특징 수, 열마다 표준화). 계산할 수 없는 값은 열 평균으로 채웁니다."""
+    samples, rate = _read_wav(audio_path)
+    tracks = _pitch_intensity(audio_path)
+    rows = []
+    for segment in segments:
+        start, end = segment["start"], segment["end"]
+        row = list(_ltas(samples[int(start * rate):int(end * rate)], rate))
+        if tracks:
+            pitch_times, f0, intensity_times, intensity = tracks
+            voiced = f0[(pitch_times >= start) & (pitch_times <= end) & (f0 > 0)]
+            level = intensity[(intensity_times >= start) & (intensity_times <= end)]
+            if len(voiced) >= 5:
+                log_f0 = np.log(voiced)
+                # 음높이는 발표자를 가장 잘 구분하므로 가중치를 더 줌 (열 2번 반복)
+                row += [np.median(log_f0)] * 2 + [np.subtract(*np.percentile(log_f0, [90, 10]))]
+            else:
+                row += [np.nan] * 3
+            row.append(level.mean() if len(level) else np.nan)
+        rows.append(row)
+
+    features = np.asarray(rows, dtype=np.float64).reshape(len(segments), -1)
+    if not len(features):
+        return features
+    column_mean = np.nanmean(np.where(np.isnan(features).all(axis=0), 0, features), axis=0)
+    features = np.where(np.isnan(features), column_mean, features)
+    std = features.std(axis=0)
+    return (features - features.mean(axis=0)) / np.where(std > 1e-9, std, 1.0)
+
+
+def kmeans(features: np.ndarray, k: int, n_init: int = 8, max_iter: int = 50, seed: int = 0):
+    """k-means++ 초기화 k-means. 반환값: (군집 번호 배열, 관성)"""
+    rng = np.random.default_rng(seed)
+    best_labels, best_inertia = None, np.inf
+    for _ in range(n_init):
+        centers = [features[rng.integers(len(features))]]
+        for _ in range(1, k):
+            distance = np.min([((features - c) ** 2).sum(axis=1) for c in centers], axis=0)
+            total = distance.sum()
+            index = rng.choice(len(features), p=distance / total) if total > 0 else rng.integers(len(features))
+            centers.append(features[index])
+        centers = np.array(centers)
+        for _ in range(max_iter):
+            distance = ((features[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+            labels = distance.argmin(axis=1)
+            updated = np.array([features[labels == j].mean(axis=0) if np.any(labels == j) else centers[j]
+                                for j in range(k)])
+            if np.allclose(updated, centers):
+                break
+            centers = updated
+        inertia = ((features - centers[labels]) ** 2).sum()
+        if inertia < best_inertia:
+            best_labels, best_inertia = labels, inertia
+    return best_labels, best_inertia
+
+
+def _silhouette(features: np.ndarray, labels: np.ndarray) -> float:
+    distance = np.sqrt(((features[:, None, :] - features[None, :, :]) ** 2).sum(axis=2))
+    scores = []
+    for i, label in enumerate(labels):
+        same = labels == label
+        if same.sum() <= 1:
+            scores.append(0.0)
+            continue
+        a = distance[i, same].sum() / (same.sum() - 1)
+        b = min(distance[i, labels == other].mean() for other in set(labels.tolist()) - {label})
+        scores.append((b - a) / max(a, b) if max(a, b) > 0 else 0.0)
+    return float(np.mean(scores))
+
+
+def diarize_segments(audio_path, segments: list, speaker_count: int = None, max_speakers: int = 3) -> list:
+    """
+    문장마다 화자 번호(0부터)를 붙여 반환합니다.
+    speaker_count를 주면 그 수로 묶고, 없으면 2~max_speakers 중 실루엣 점수가 가장 높은 수를 고릅니다.
+    """
+    if not segments:
+        return []
+    features = segment_features(audio_path, segments)
+    if speaker_count is None:
+        speaker_count, best_score = 1, SILHOUETTE_MIN
+        for k in range(2, min(max_speakers, len(segments) - 1) + 1):
+            labels, _ = kmeans(features, k)
+            score = _silhouette(features, labels)
+            if score > best_score:
+                speaker_count, best_score = k, score
+    speaker_count = max(1, min(speaker_count, len(segments)))
+    if speaker_count == 1:
+        return [0] * len(segments)
+    labels, _ = kmeans(features, speaker_count)
+    return labels.tolist()
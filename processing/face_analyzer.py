@@ -1,45 +1,72 @@
-import mediapipe as mp
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
-import cv2  # OpenCV 사용
 import numpy as np
 import os
 from pathlib import Path
+from utils.metrics import inc_counter
+from processing.blendshape_features import compute_frame_metrics
 
-# MediaPipe 핵심 컴포넌트
-FaceLandmarker = vision.FaceLandmarker
-FaceLandmarkerOptions = vision.FaceLandmarkerOptions
-VisionRunningMode = vision.RunningMode
+# ⭐️ mediapipe/cv2는 임포트만으로 수 초가 걸리므로 처음 사용할 때 로드합니다. (_load_vision_libs)
+mp = None
+python = None
+vision = None
+cv2 = None
 
 # 모델을 전역 변수로 관리하여 한번만 로드
 face_landmarker_instance = None
 MODEL_PATH = Path(__file__).resolve().parent.parent / "face_landmarker.task"
+# ⭐️ 워커 프로세스 풀 모드: 부모 프로세스가 읽어 둔 모델 파일 바이트 (fork 후 자식들이 공유)
+_model_asset_buffer = None
+
+def _load_vision_libs():
+    """MediaPipe/OpenCV 모듈을 (한 번만) 임포트합니다."""
+    global mp, python, vision, cv2
+    if mp is None:
+        import mediapipe as _mp
+        from mediapipe.tasks import python as _python
+        from mediapipe.tasks.python import vision as _vision
+        import cv2 as _cv2  # OpenCV 사용
+        python, vision, cv2 = _python, _vision, _cv2
+        mp = _mp
+
+def preload_face_model_asset():
+    """
+    모델 파일을 메모리에 읽어 둡니다. (워커 프로세스를 fork하기 전 부모에서 호출)
+    MediaPipe 그래프는 내부 스레드를 쓰므로 fork로 공유할 수 없어, 모델 바이트만 공유하고
+    그래프는 각 워커가 처음 사용할 때 이 버퍼로 만듭니다.
+    """
+    global _model_asset_buffer
+    _load_vision_libs()
+    _model_asset_buffer = MODEL_PATH.read_bytes()
+    return len(_model_asset_buffer)
 
 def setup_face_landmarker():
     """
-    서버 시작 시 MediaPipe FaceLandmarker 모델을 로드합니다.
+    MediaPipe FaceLandmarker 모델을 로드합니다. (서버 시작 후 백그라운드 warm-up에서 호출)
     """
     global face_landmarker_instance
     if face_landmarker_instance:
         return face_landmarker_instance
 
     print("   > [1/5] AI 모델(MediaPipe) 로드 중...")
+    _load_vision_libs()
     
-    if not MODEL_PATH.exists():
+    if _model_asset_buffer is None and not MODEL_PATH.exists():
         print(f"❌ 모델 파일({MODEL_PATH})을 찾을 수 없습니다.")
         print("-> https://storage.googleapis.com/mediapipe-models/face_landmarker/face_landmarker/float16/1/face_landmarker.task")
         print(f"-> 위 주소에서 'face_landmarker.task' 파일을 다운로드하여 {MODEL_PATH.parent} 폴더에 저장하세요.")
         raise FileNotFoundError(f"모델 파일({MODEL_PATH})을 찾을 수 없습니다. 다운로드가 필요합니다.")
 
     try:
-        base_options = python.BaseOptions(model_asset_path=str(MODEL_PATH))
-        options = FaceLandmarkerOptions(
+        if _model_asset_buffer is not None:
+            base_options = python.BaseOptions(model_asset_buffer=_model_asset_buffer)
+        else:
+            base_options = python.BaseOptions(model_asset_path=str(MODEL_PATH))
+        options = vision.FaceLandmarkerOptions(
             base_options=base_options,
-            running_mode=VisionRunningMode.IMAGE,
+            running_mode=vision.RunningMode.IMAGE,
             num_faces=1,
             output_face_blendshapes=True
         )
-        face_landmarker_instance = FaceLandmarker.create_from_options(options)
+        face_landmarker_instance = vision.FaceLandmarker.create_from_options(options)
         print("   > [1/5] ✅ MediaPipe 모델 로드 완료.")
         return face_landmarker_instance
     except Exception as e:
@@ -48,65 +75,127 @@ def setup_face_landmarker():
 
 # 
 # ❗️ [수정] ❗️: 더 많은 데이터를 반환하도록 함수 수정
+# ⭐️ [수정] 지표 계산은 processing/blendshape_features.py 의 등록된 파생 지표로 (영상 분석과 같은 계산)
 def _process_blendshapes(blendshapes: list) -> dict:
-    """JS 코드의 processBlendshapes 함수를 Python으로 변환합니다."""
+    """JS 코드의 processBlendshapes 함수를 Python으로 변환합니다. (프레임 하나용)"""
     if not blendshapes:
         return {}
-        
-    # 카테고리 이름과 점수를 딕셔너리로 변환 (Top-10을 위해)
     cats = {c.category_name: c.score for c in blendshapes[0]}
-    
-    def pick(n):
-        return cats.get(n, 0) # 해당 키가 없으면 0 반환
-
-    # --- 기존 계산 ---
-    gaze_h = ((pick('eyeLookOutLeft') - pick('eyeLookInLeft')) + (pick('eyeLookInRight') - pick('eyeLookOutRight'))) / 2
-    gaze_v = ((pick('eyeLookUpLeft') - pick('eyeLookDownLeft')) + (pick('eyeLookUpRight') - pick('eyeLookDownRight'))) / 2
-    smile = (pick('mouthSmileLeft') + pick('mouthSmileRight')) / 2
-    frown = (pick('mouthFrownLeft') + pick('mouthFrownRight')) / 2
-    brow_down = (pick('browDownLeft') + pick('browDownRight')) / 2
-    jaw_open = pick('jawOpen')
-    
-    # --- ❗️ [추가] ❗️: 사진 UI에 있던 추가 데이터 ---
-    brow_up = (pick('browInnerUp') + pick('browOuterUpLeft') + pick('browOuterUpRight')) / 3
-    mouth_open = pick('mouthOpen') # jawOpen과 다름
-    squint = (pick('eyeSquintLeft') + pick('eyeSquintRight')) / 2
-    
-    return {
-        "gaze_h": gaze_h,
-        "gaze_v": gaze_v,
-        "smile": smile,
-        "frown": frown,
-        "brow_down": brow_down,
-        "jaw_open": jaw_open,
-        "brow_up": brow_up,      # 추가
-        "mouth_open": mouth_open,  # 추가
-        "squint": squint,        # 추가
-        "all_blendshapes": cats  # ❗️ Top-10 리스트를 위한 전체 데이터
-    }
+    data = compute_frame_metrics(cats)
+    data["all_blendshapes"] = cats  # ❗️ Top-10 리스트를 위한 전체 데이터
+    return data
 
-def analyze_image(image_path: str) -> dict:
+# ⭐️ [수정] num_faces 인자 추가 → 팀 발표 모드에서 여러 얼굴 추적 (processing/team_analyzer.py)
+def create_video_landmarker(num_faces: int = 1):
     """
-    단일 이미지 파일을 분석하여 표정/시선 데이터를 반환합니다.
+    실시간 리허설 모드용 FaceLandmarker를 새로 만듭니다. (VIDEO 모드, 연결마다 하나씩, 사용 후 close() 필요)
+    VIDEO 모드는 이전 프레임의 추적 결과를 이어 쓰므로 매 프레임 전체 검출을 하는 IMAGE 모드보다 빠릅니다.
+    """
+    _load_vision_libs()
+    if _model_asset_buffer is not None:
+        base_options = python.BaseOptions(model_asset_buffer=_model_asset_buffer)
+    else:
+        base_options = python.BaseOptions(model_asset_path=str(MODEL_PATH))
+    options = vision.FaceLandmarkerOptions(
+        base_options=base_options,
+        running_mode=vision.RunningMode.VIDEO,
+        num_faces=num_faces,
+        output_face_blendshapes=True
+    )
+    return vision.FaceLandmarker.create_from_options(options)
+
+def analyze_video_frame(landmarker, jpeg_bytes: bytes, timestamp_ms: int) -> dict:
+    """
+    스트리밍으로 받은 JPEG 프레임 하나를 분석합니다. (timestamp_ms는 연결 안에서 계속 증가해야 함)
+    반환 형식은 analyze_image 와 같습니다.
+    """
+    try:
+        image_bgr = cv2.imdecode(np.frombuffer(jpeg_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image_bgr is None:
+            return {"error": "이미지를 디코딩할 수 없습니다."}
+
+        image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
+        results = landmarker.detect_for_video(mp_image, timestamp_ms)
+
+        if results.face_blendshapes:
+            inc_counter("face_frames_total", result="detected")
+            return _process_blendshapes(results.face_blendshapes)
+        inc_counter("face_frames_total", result="missed")
+        return {"error": "얼굴 미검출"}
+
+    except Exception as e:
+        print(f"   > 실시간 프레임 분석 오류: {e}")
+        return {"error": str(e)}
+
+# 얼굴 상자 계산에 쓰는 랜드마크 (이마 위, 턱 끝, 왼쪽/오른쪽 볼 끝) - 478개 전체를 훑지 않기 위함
+FACE_BOX_LANDMARKS = (10, 152, 234, 454)
+
+def _face_box(landmarks: list) -> tuple:
+    """정규화 좌표 얼굴 상자 (x1, y1, x2, y2)"""
+    points = [landmarks[i] for i in FACE_BOX_LANDMARKS] if len(landmarks) > max(FACE_BOX_LANDMARKS) else landmarks
+    xs = [p.x for p in points]
+    ys = [p.y for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+def detect_faces_for_video(landmarker, image_path: str, timestamp_ms: int) -> tuple:
+    """
+    ⭐️ [신규] 팀 발표 모드: 프레임 이미지 하나에서 모든 얼굴의 (얼굴 상자, 블렌드셰이프 카테고리 목록)을 뽑습니다.
+    landmarker는 create_video_landmarker(num_faces) 로 만든 VIDEO 모드 인스턴스 (timestamp_ms는 계속 증가해야 함)
+    반환값: (얼굴 목록, None) 또는 ([], 오류 메시지)
+    """
+    try:
+        image_bgr = cv2.imread(image_path)
+        if image_bgr is None:
+            return [], "이미지 파일을 읽을 수 없습니다."
+
+        image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
+        results = landmarker.detect_for_video(mp_image, timestamp_ms)
+
+        faces = [(_face_box(landmarks), categories)
+                 for landmarks, categories in zip(results.face_landmarks, results.face_blendshapes)]
+        return faces, None if faces else "얼굴 미검출"
+
+    except Exception as e:
+        print(f"   > 이미지 분석 오류 ({image_path}): {e}")
+        return [], str(e)
+
+def detect_face_blendshapes(image_path: str) -> tuple:
+    """
+    ⭐️ [신규] 이미지 파일 하나에서 블렌드셰이프 카테고리 목록만 뽑습니다. (영상 분석 루프용)
+    반환값: (face_blendshapes[0], None) 또는 (None, 오류 메시지)
+    지표 계산은 BlendshapeExtractor 가 모든 프레임을 모은 뒤 한 번에 합니다.
+    (face_frames_total 메트릭도 호출하는 쪽에서 모아서 기록: BlendshapeExtractor.frame_counts())
     """
     landmarker = setup_face_landmarker()
     if not landmarker:
-        return {"error": "MediaPipe 모델이 로드되지 않았습니다."}
+        return None, "MediaPipe 모델이 로드되지 않았습니다."
     
     try:
         image_bgr = cv2.imread(image_path)
         if image_bgr is None:
-            return {"error": "이미지 파일을 읽을 수 없습니다."}
+            return None, "이미지 파일을 읽을 수 없습니다."
         
         image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
         results = landmarker.detect(mp_image)
         
         if results.face_blendshapes:
-            return _process_blendshapes(results.face_blendshapes) # ❗️ 수정된 함수 호출
+            return results.face_blendshapes[0], None
         else:
-            return {"error": "얼굴 미검출"}
+            return None, "얼굴 미검출"
             
     except Exception as e:
         print(f"   > 이미지 분석 오류 ({image_path}): {e}")
-        return {"error": str(e)}
\ No newline at end of file
+        return None, str(e)
+
+def analyze_image(image_path: str) -> dict:
+    """
+    단일 이미지 파일을 분석하여 표정/시선 데이터를 반환합니다.
+    """
+    categories, error = detect_face_blendshapes(image_path)
+    inc_counter("face_frames_total", result="missed" if error else "detected")
+    if error:
+        return {"error": error}
+    return _process_blendshapes([categories]) # ❗️ 수정된 함수 호출
\ No newline at end of file
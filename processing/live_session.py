@@ -0,0 +1,363 @@
+# [신규 파일] processing/live_session.py
+import asyncio
+import math
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from processing.face_analyzer import create_video_landmarker, analyze_video_frame
+from processing.audio_analyzer import (
+    transcribe_samples, analyze_prosody_for_segments, load_local_whisper_model, SAMPLE_RATE
+)
+from processing.ai_scorer import get_ai_score, is_openai_configured
+from processing.data_combiner import align_data
+from utils.metrics import inc_counter, observe, add_gauge
+
+# ⭐️ 실시간 리허설 모드 (WebSocket /ws/live)
+#
+# 클라이언트 → 서버
+#   텍스트: {"type": "start", "criteria": [...], "analysisProfile": "fast"}  (연결 직후 1회)
+#           {"type": "stop"}  (발표 종료 → 최종 결과 요청)
+#   바이너리: [0x01][float64 LE 촬영 시각(초, 세션 시작 기준)][JPEG 바이트]  카메라 프레임
+#             [0x02][PCM16 LE, 16kHz mono 샘플]                            마이크 오디오 (끊김 없이 연속 전송)
+# 서버 → 클라이언트
+#   {"type": "indicators", ...}  시선/미소/발표 속도/목소리 떨림 (프레임 분석마다, 오디오만 오면 1초마다)
+#   {"type": "transcript", "segments": [...]}  새로 인식된 문장
+#   {"type": "result", "result": {...}}  업로드 분석과 같은 형식의 최종 결과
+#
+# 실시간 예산: 얼굴 분석은 연결마다 최신 프레임 1장만 대기시키고 나머지는 버립니다. (밀려서 지연되지 않도록)
+# 음성 인식은 LIVE_ASR_CHUNK_SEC마다 새 오디오를 인식하고, 밀리면 다음 인식에서 모아서 처리합니다.
+# 인식이 실시간보다 느려 밀린 오디오가 LIVE_ASR_MAX_BACKLOG_SEC를 넘으면 가장 오래된 오디오부터 버립니다.
+# (자막이 계속 더 늦어지지 않도록, 버린 시간은 live_audio_dropped_seconds_total)
+
+FRAME_MESSAGE = 0x01
+AUDIO_MESSAGE = 0x02
+_FRAME_HEADER = struct.Struct("<Bd")
+
+LIVE_MAX_SESSIONS = int(os.getenv("LIVE_MAX_SESSIONS", "2"))
+LIVE_MAX_FPS = float(os.getenv("LIVE_MAX_FPS", "8"))
+LIVE_WHISPER_MODEL = os.getenv("LIVE_WHISPER_MODEL", "base")
+LIVE_ASR_CHUNK_SEC = 5.0       # 음성 인식 단위 (초)
+LIVE_ASR_MAX_CHUNK_SEC = 30.0  # Whisper 입력 창 길이
+LIVE_ASR_MAX_BACKLOG_SEC = 2 * LIVE_ASR_MAX_CHUNK_SEC  # 인식 대기 오디오 최대 길이
+LIVE_ROLLING_SEC = 3.0         # 시선/미소/떨림 이동 평균 구간 (초)
+LIVE_SPEECH_RATE_SEC = 15.0    # 발표 속도 계산 구간 (초)
+_SILENCE_RMS = 1e-3            # 이보다 조용한 구간은 인식하지 않음 (무음에서 Whisper가 문장을 지어내는 것 방지)
+
+_sessions_lock = threading.Lock()
+_active_sessions = 0
+
+
+def try_acquire_live_slot() -> bool:
+    """동시 실시간 세션 수가 LIVE_MAX_SESSIONS 미만이면 자리를 확보합니다."""
+    global _active_sessions
+    with _sessions_lock:
+        if _active_sessions >= LIVE_MAX_SESSIONS:
+            return False
+        _active_sessions += 1
+    add_gauge("live_sessions", 1)
+    return True
+
+
+def release_live_slot():
+    global _active_sessions
+    with _sessions_lock:
+        _active_sessions = max(0, _active_sessions - 1)
+    add_gauge("live_sessions", -1)
+
+
+def _quiet_cut_point(samples: np.ndarray) -> int:
+    """마지막 1초 중 가장 조용한 20ms 지점을 찾아 인식 구간을 자릅니다. (단어 중간에서 끊기는 것을 줄임)"""
+    block = SAMPLE_RATE // 50
+    search_start = max(0, len(samples) - SAMPLE_RATE)
+    blocks = (len(samples) - search_start) // block
+    if blocks == 0:
+        return len(samples)
+    tail = samples[search_start:search_start + blocks * block]
+    energy = np.square(tail.reshape(blocks, block)).mean(axis=1)
+    return search_start + int(np.argmin(energy)) * block + block // 2
+
+
+class LiveSession:
+    """WebSocket 연결 하나의 실시간 분석 상태 (얼굴 분석/음성 인식/운율 작업과 누적 결과)"""
+
+    def __init__(self, send_json, custom_criteria: list = None, settings: dict = None):
+        self._send_json = send_json
+        self._send_lock = asyncio.Lock()
+        self.custom_criteria = custom_criteria or []
+        self.settings = settings or {}
+        self.closing = False
+
+        self.landmarker = None
+        self._last_timestamp_ms = -1
+        self._latest_frame = None  # (촬영 시각, JPEG, 수신 시각) - 최신 1장만 보관
+        self._frame_event = asyncio.Event()
+        self._last_accepted_time = None
+        self.vision_results = []
+        self._recent_vision = deque()
+
+        self._pending_audio = []  # 아직 인식하지 않은 오디오 조각들
+        self._pending_samples = 0
+        self._recent_audio = np.zeros(0, dtype=np.float32)  # 운율 이동 평균용 최근 오디오
+        self._audio_event = asyncio.Event()
+        self.received_samples = 0
+        self.transcribed_until = 0.0
+        self.segments = []
+        self.rolling_prosody = {"jitter": 0.0, "shimmer": 0.0}
+        self.asr_error = None
+
+        self.stats = {"frames_received": 0, "frames_processed": 0, "frames_dropped": 0, "asr_chunks": 0,
+                      "audio_dropped_sec": 0.0}
+        self._latencies = deque(maxlen=500)
+        self._tasks = []
+        self._started = time.monotonic()
+
+    async def start(self):
+        """모델을 준비하고 얼굴 분석/음성 인식/운율 작업을 시작합니다."""
+        self.landmarker = await asyncio.to_thread(create_video_landmarker)
+        await asyncio.to_thread(load_local_whisper_model, LIVE_WHISPER_MODEL)
+        self._tasks = [asyncio.create_task(self._video_loop()),
+                       asyncio.create_task(self._asr_loop())]
+        if self.settings.get("prosody", True):
+            self._tasks.append(asyncio.create_task(self._prosody_loop()))
+
+    async def _send(self, message: dict):
+        async with self._send_lock:
+            await self._send_json(message)
+
+    # ---------- 입력 ----------
+
+    def feed(self, message: bytes):
+        """클라이언트가 보낸 바이너리 메시지(프레임/오디오)를 받습니다. 분석은 하지 않고 바로 반환합니다."""
+        if not message or self.closing:
+            return
+        if message[0] == FRAME_MESSAGE and len(message) > _FRAME_HEADER.size:
+            _, captured_at = _FRAME_HEADER.unpack_from(message)
+            if not math.isfinite(captured_at):
+                # NaN/inf 촬영 시각은 프레임 간격 계산·정렬을 깨뜨리므로 받지 않음 (버린 프레임으로 집계)
+                self.stats["frames_received"] += 1
+                self.stats["frames_dropped"] += 1
+                inc_counter("live_frames_total", result="invalid")
+                return
+            self._offer_frame(captured_at, message[_FRAME_HEADER.size:])
+        elif message[0] == AUDIO_MESSAGE:
+            pcm = message[1:len(message) - (len(message) - 1) % 2]
+            self._add_audio(np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0)
+
+    def _drop_frame(self):
+        self.stats["frames_dropped"] += 1
+        inc_counter("live_frames_total", result="dropped")
+
+    def _offer_frame(self, captured_at: float, jpeg: bytes):
+        self.stats["frames_received"] += 1
+        # 초당 LIVE_MAX_FPS장을 넘는 프레임은 버림
+        if self._last_accepted_time is not None and captured_at - self._last_accepted_time < 1.0 / LIVE_MAX_FPS:
+            self._drop_frame()
+            return
+        # 아직 분석을 시작하지 못한 이전 프레임이 있으면 새 프레임으로 교체 (밀린 프레임은 분석하지 않음)
+        if self._latest_frame is not None:
+            self._drop_frame()
+        self._last_accepted_time = captured_at
+        self._latest_frame = (captured_at, jpeg, time.monotonic())
+        self._frame_event.set()
+
+    def _add_audio(self, samples: np.ndarray):
+        self._pending_audio.append(samples)
+        self._pending_samples += len(samples)
+        self.received_samples += len(samples)
+        keep = int(LIVE_ROLLING_SEC * SAMPLE_RATE)
+        self._recent_audio = np.concatenate([self._recent_audio, samples])[-keep:]
+        self._shed_audio_backlog()
+        if self._pending_samples >= LIVE_ASR_CHUNK_SEC * SAMPLE_RATE:
+            self._audio_event.set()
+
+    def _shed_audio_backlog(self):
+        """인식 대기 오디오가 LIVE_ASR_MAX_BACKLOG_SEC를 넘으면 앞(가장 오래된) 부분을 버립니다."""
+        excess = self._pending_samples - int(LIVE_ASR_MAX_BACKLOG_SEC * SAMPLE_RATE)
+        if excess <= 0:
+            return
+        remaining = excess
+        while remaining > 0:
+            head = self._pending_audio[0]
+            if len(head) <= remaining:
+                self._pending_audio.pop(0)
+                remaining -= len(head)
+            else:
+                self._pending_audio[0] = head[remaining:]
+                remaining = 0
+        self._pending_samples -= excess
+        # 버린 오디오만큼 다음 인식 구간의 시작 시각을 뒤로 옮김 (문장 시각은 계속 세션 기준으로 맞음)
+        self.transcribed_until += excess / SAMPLE_RATE
+        self.stats["audio_dropped_sec"] = round(self.stats["audio_dropped_sec"] + excess / SAMPLE_RATE, 2)
+        inc_counter("live_audio_dropped_seconds_total", excess / SAMPLE_RATE)
+
+    # ---------- 분석 작업 ----------
+
+    def _analyze_frame(self, captured_at: float, jpeg: bytes) -> dict:
+        # VIDEO 모드는 타임스탬프가 계속 증가해야 함
+        timestamp_ms = max(int(captured_at * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        data = analyze_video_frame(self.landmarker, jpeg, timestamp_ms)
+        data.pop("all_blendshapes", None)
+        data["time"] = captured_at
+        return data
+
+    async def _video_loop(self):
+        while not self.closing:
+            await self._frame_event.wait()
+            self._frame_event.clear()
+            frame, self._latest_frame = self._latest_frame, None
+            if frame is None:
+                continue
+            captured_at, jpeg, received_at = frame
+            data = await asyncio.to_thread(self._analyze_frame, captured_at, jpeg)
+            self.vision_results.append(data)
+            self._recent_vision.append(data)
+            while self._recent_vision and self._recent_vision[0]["time"] < captured_at - LIVE_ROLLING_SEC:
+                self._recent_vision.popleft()
+            self.stats["frames_processed"] += 1
+            inc_counter("live_frames_total", result="processed")
+
+            latency = time.monotonic() - received_at
+            self._latencies.append(latency)
+            observe("live_indicator_latency_seconds", latency)
+            await self._send_indicators(captured_at, latency, face_detected="error" not in data)
+
+    def _take_audio_chunk(self, final: bool):
+        """인식할 오디오 구간을 꺼냅니다. final이 아니면 조용한 지점에서 자르고 나머지는 다음 구간으로 남깁니다."""
+        if not self._pending_samples:
+            return None
+        pending = np.concatenate(self._pending_audio)
+        limit = int(LIVE_ASR_MAX_CHUNK_SEC * SAMPLE_RATE)
+        if final and len(pending) <= limit:
+            cut = len(pending)
+        else:
+            cut = _quiet_cut_point(pending[:limit])
+        chunk, rest = pending[:cut], pending[cut:]
+        self._pending_audio = [rest] if len(rest) else []
+        self._pending_samples = len(rest)
+        return chunk
+
+    def _transcribe_chunk(self, chunk: np.ndarray, offset: float) -> list:
+        if np.sqrt(np.mean(np.square(chunk))) < _SILENCE_RMS:
+            return []
+        raw_segments, error = transcribe_samples(chunk, LIVE_WHISPER_MODEL)
+        if error:
+            self.asr_error = error
+            return []
+        segments = [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in raw_segments]
+        if self.settings.get("prosody", True):
+            segments = analyze_prosody_for_segments(chunk, segments, verbose=False)
+        for segment in segments:
+            segment["start"] = round(segment["start"] + offset, 2)
+            segment["end"] = round(min(segment["end"], len(chunk) / SAMPLE_RATE) + offset, 2)
+        return segments
+
+    async def _asr_loop(self):
+        while True:
+            await self._audio_event.wait()
+            self._audio_event.clear()
+            while self._pending_samples >= LIVE_ASR_CHUNK_SEC * SAMPLE_RATE or (self.closing and self._pending_samples):
+                chunk = self._take_audio_chunk(final=self.closing)
+                offset = self.transcribed_until
+                self.transcribed_until += len(chunk) / SAMPLE_RATE
+                segments = await asyncio.to_thread(self._transcribe_chunk, chunk, offset)
+                self.stats["asr_chunks"] += 1
+                if segments:
+                    self.segments.extend(segments)
+                    await self._send({"type": "transcript", "segments": segments})
+            if self.closing:
+                return
+
+    async def _prosody_loop(self):
+        """최근 LIVE_ROLLING_SEC초 오디오의 jitter/shimmer를 1초마다 갱신합니다."""
+        while not self.closing:
+            await asyncio.sleep(1.0)
+            samples = self._recent_audio
+            if len(samples) < SAMPLE_RATE:
+                continue
+            window = [{"start": 0.0, "end": len(samples) / SAMPLE_RATE}]
+            window = await asyncio.to_thread(analyze_prosody_for_segments, samples, window, False)
+            self.rolling_prosody = {"jitter": window[0]["jitter"], "shimmer": window[0]["shimmer"]}
+            # 카메라 프레임이 오지 않는(오디오만 보내는) 연결에도 지표를 보냄
+            if not self.vision_results:
+                await self._send_indicators(self.received_samples / SAMPLE_RATE, None, face_detected=False)
+
+    # ---------- 지표/결과 ----------
+
+    def _speech_rate(self, now: float) -> float:
+        recent = [s for s in self.segments if s["end"] >= now - LIVE_SPEECH_RATE_SEC]
+        spoken = sum(s["end"] - s["start"] for s in recent)
+        return round(sum(len(s["text"]) for s in recent) / spoken, 2) if spoken > 0 else 0.0
+
+    async def _send_indicators(self, now: float, latency: float, face_detected: bool):
+        faces = [f for f in self._recent_vision if "error" not in f]
+        averages = {key: round(sum(f[key] for f in faces) / len(faces), 3) if faces else 0.0
+                    for key in ("gaze_h", "gaze_v", "smile")}
+        await self._send({
+            "type": "indicators",
+            "time": round(now, 2),
+            "face_detected": face_detected,
+            **averages,
+            "speech_rate_cps": self._speech_rate(now),
+            "jitter": round(self.rolling_prosody["jitter"], 3),
+            "shimmer": round(self.rolling_prosody["shimmer"], 3),
+            "latency_ms": round(latency * 1000, 1) if latency is not None else None,
+            "dropped_frames": self.stats["frames_dropped"],
+        })
+
+    async def finish(self) -> dict:
+        """남은 오디오까지 인식한 뒤 업로드 분석과 같은 형식의 최종 결과를 만듭니다."""
+        self.closing = True
+        self._frame_event.set()
+        self._audio_event.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        aligned_data = await asyncio.to_thread(align_data, self.vision_results, self.segments)
+        if is_openai_configured():
+            ai_result = await asyncio.to_thread(get_ai_score, aligned_data, self.custom_criteria,
+                                                self.settings.get("prompt_chars", 4000))
+        elif self.asr_error:
+            ai_result = {"ai_feedback": f"## 🤖 로컬 음성인식 오류\n\n**오류:** {self.asr_error}\n\n시선/표정 분석 데이터는 정상적으로 추출되었습니다."}
+        else:
+            ai_result = {"ai_feedback": "## 🤖 음성/표정/운율 분석 완료\n\nOpenAI API 키가 설정되지 않아 **AI 자동 채점 기능은 비활성화**되었습니다."}
+
+        latencies = sorted(self._latencies)
+        duration = max(self.received_samples / SAMPLE_RATE,
+                       self.vision_results[-1]["time"] if self.vision_results else 0.0)
+        return {
+            "ai_assessment": ai_result,
+            "analysis_summary": {
+                "total_frames_processed": len(self.vision_results),
+                "duration_analyzed_sec": round(duration, 2),
+                "face_detected_frames": len([f for f in self.vision_results if "error" not in f]),
+                "live": {
+                    **self.stats,
+                    "session_sec": round(time.monotonic() - self._started, 2),
+                    "latency_p50_ms": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+                    "latency_p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 1) if latencies else None,
+                    "whisper_model": LIVE_WHISPER_MODEL,
+                },
+            },
+            "raw_data": self.vision_results,
+            "aligned_transcript_data": aligned_data,
+        }
+
+    async def close(self):
+        """연결 종료 시 (정상/비정상 모두) 작업을 멈추고 모델을 해제합니다."""
+        self.closing = True
+        # 인식하지 않은 오디오는 버리고, 진행 중이던 프레임/구간 분석은 끝난 뒤 작업이 종료되도록 함
+        self._pending_audio = []
+        self._pending_samples = 0
+        self._frame_event.set()
+        self._audio_event.set()
+        for task in self._tasks[2:]:
+            task.cancel()  # 운율 작업은 대기 중 취소해도 무방
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.landmarker:
+            await asyncio.to_thread(self.landmarker.close)
+            self.landmarker = None
@@ -1,83 +1,193 @@
 from pathlib import Path
+import json
+import math
+import os
+import queue
+import threading
 import time as timer 
 
 # 모든 처리 모듈을 여기서 임포트
-from processing.video_analyzer import extract_all_frames, extract_audio
-from processing.face_analyzer import analyze_image
-from processing.audio_analyzer import transcribe_audio_with_timestamps, analyze_prosody_for_segments
+from processing.video_analyzer import extract_all_frames, extract_audio, probe_duration
+from processing.face_analyzer import detect_face_blendshapes
+from processing.blendshape_features import BlendshapeExtractor
+from processing.audio_analyzer import (
+    transcribe_audio_with_timestamps, analyze_prosody_for_segments, get_audio_duration, DEFAULT_WHISPER_MODEL
+)
 from processing.ai_scorer import get_ai_score, is_openai_configured
 from processing.data_combiner import align_data
+from processing.team_analyzer import TeamFaceAnalyzer, analyze_team_segments, merge_presenter_frames
 from utils.helpers import cleanup_dirs
+from utils.scratch import PARTIAL_DIR, owner_info
+from utils.metrics import JobTimings, observe, inc_counter, add_gauge, set_gauge
+from utils.profiler import JobProfiler
+from utils.job_store import get_job_dir, save_job_result
+from processing.warmup import wait_for_models
 
 FRAME_RATE = 5
 job_status = {} # 작업 상태를 main.py 대신 여기서 관리
 
+# ⭐️ 동시에 실행할 분석 작업 수 (나머지는 대기열에서 기다림)
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "2"))
+_job_slots = threading.BoundedSemaphore(MAX_CONCURRENT_JOBS)
+_queue_lock = threading.Lock()
+_queue_counts = {"waiting": 0, "running": 0}
+_avg_job_seconds = 60.0  # 최근 작업 시간의 지수 이동 평균 (예상 대기 시간 계산용)
+
+# ⭐️ 분석 작업은 FastAPI 공용 스레드 풀(BackgroundTasks)이 아니라 전용 실행 스레드에서 처리합니다.
+# 대기 중인 작업(모델 로딩 대기, 실행 슬롯 대기)이 공용 스레드를 붙잡고 있으면
+# 업로드가 몰릴 때 /analyze, /status, /queue 같은 다른 동기 엔드포인트까지 멈추기 때문입니다.
+_job_queue = queue.Queue()
+_runner_lock = threading.Lock()
+_job_runners = []
+
+# ⭐️ 긴 영상은 일정 길이의 구간(window) 단위로 나눠서 처리 (메모리/임시 디스크 사용량을 영상 길이와 무관하게 유지)
+# 구간마다 추출 → 얼굴 분석 → 음성 인식 → 운율 → 정렬까지 끝내고, 결과는 partials/<job_id>/ 에 기록합니다.
+WINDOW_SEC = float(os.getenv("WINDOW_SEC", "120"))
+WINDOWED_MIN_DURATION_SEC = float(os.getenv("WINDOWED_MIN_DURATION_SEC", "1200"))  # 0이면 사용 안 함
+RAW_DATA_MAX_FRAMES = int(os.getenv("RAW_DATA_MAX_FRAMES", "7200"))  # 구간 처리 시 raw_data 최대 프레임 수
+
+# ⭐️ AI 채점 후 PDF 보고서/대회 점수표까지 만드는 마지막 단계 (kyuchan/report_generator 사용, 0이면 끔)
+REPORT_STAGE_ENABLED = os.getenv("REPORT_STAGE_ENABLED", "1") != "0"
+
+def register_job(job_id: str):
+    """작업을 접수 상태로 등록하고 대기열 길이를 늘립니다."""
+    job_status[job_id] = {"status": "Pending", "message": "0/6: 작업 대기 중..."}
+    with _queue_lock:
+        _queue_counts["waiting"] += 1
+        set_gauge("analysis_queue_depth", _queue_counts["waiting"])
+
+def set_max_concurrent_jobs(count: int):
+    """동시 실행 작업 수를 바꿉니다. (워커 프로세스 풀 모드에서는 워커 수로 설정)"""
+    global MAX_CONCURRENT_JOBS, _job_slots
+    MAX_CONCURRENT_JOBS = max(1, count)
+    _job_slots = threading.BoundedSemaphore(MAX_CONCURRENT_JOBS)
+
+def submit_analysis_task(job_id: str, *args, **kwargs):
+    """
+    run_analysis_task 와 같은 인자로 작업을 대기열에 넣고 바로 반환합니다.
+    실행 스레드(MAX_CONCURRENT_JOBS개)가 대기열에서 하나씩 꺼내 실행합니다.
+    """
+    _ensure_job_runners()
+    _job_queue.put((job_id, args, kwargs))
+
+def _ensure_job_runners():
+    with _runner_lock:
+        _job_runners[:] = [t for t in _job_runners if t.is_alive()]
+        while len(_job_runners) < MAX_CONCURRENT_JOBS:
+            runner = threading.Thread(target=_job_runner_loop, name=f"analysis-runner-{len(_job_runners)}",
+                                      daemon=True)
+            runner.start()
+            _job_runners.append(runner)
+
+def _job_runner_loop():
+    while True:
+        job_id, args, kwargs = _job_queue.get()
+        try:
+            run_analysis_task(job_id, *args, **kwargs)
+        except Exception as e:
+            # 파이프라인 오류는 _run_analysis_pipeline 에서 처리됨 (여기는 실행 스레드가 죽지 않도록)
+            print(f"❌ 분석 작업 실행 오류 (Job: {job_id}): {e}")
+            job_status[job_id] = {"status": "Error", "message": str(e)}
+
+def mark_job_started():
+    """대기 중이던 작업 하나가 실행을 시작했음을 기록합니다."""
+    with _queue_lock:
+        _queue_counts["waiting"] = max(0, _queue_counts["waiting"] - 1)
+        _queue_counts["running"] += 1
+        set_gauge("analysis_queue_depth", _queue_counts["waiting"])
+
+def mark_job_finished(elapsed_sec: float):
+    """실행 중이던 작업 하나가 끝났음을 기록하고 평균 작업 시간을 갱신합니다."""
+    global _avg_job_seconds
+    with _queue_lock:
+        _queue_counts["running"] = max(0, _queue_counts["running"] - 1)
+        _avg_job_seconds = 0.8 * _avg_job_seconds + 0.2 * elapsed_sec
+
+def get_queue_stats() -> dict:
+    """대기 중/실행 중 작업 수와 새 작업의 예상 대기 시간(초)을 반환합니다."""
+    with _queue_lock:
+        waiting = _queue_counts["waiting"]
+        running = _queue_counts["running"]
+    # 새 작업 앞에 있는 작업들이 슬롯 수만큼 병렬로 처리된다고 가정
+    ahead = max(0, waiting + running - MAX_CONCURRENT_JOBS + 1)
+    return {
+        "waiting": waiting,
+        "running": running,
+        "max_concurrent": MAX_CONCURRENT_JOBS,
+        "estimated_wait_sec": round(ahead * _avg_job_seconds / MAX_CONCURRENT_JOBS, 1),
+    }
+
 # ⭐️ [수정] custom_criteria 인자 추가
-def run_analysis_task(job_id: str, video_path: Path, frame_dir: Path, video_dir: Path, custom_criteria: list):
+# ⭐️ [수정] submitted_at(작업 접수 시각, time.monotonic 기준) 인자 추가 → 대기 시간 측정
+# ⭐️ [수정] profile 인자 추가 → True이면 이 작업만 프로파일링 (utils/profiler.py)
+# ⭐️ [수정] analysis_profile 인자 추가 → 프레임 수/Whisper 모델/운율 분석/프롬프트 크기 (analysis_profiles.py)
+# ⭐️ [수정] report_meta 인자 추가 → {"team_name", "competition_name"} 보고서 제목/점수표 주제
+# ⭐️ [수정] team_size 인자 추가 → 값이 있으면 팀 발표 모드 (여러 얼굴 추적 + 화자 구분, processing/team_analyzer.py)
+def run_analysis_task(job_id: str, video_path: Path, frame_dir: Path, video_dir: Path, custom_criteria: list,
+                      submitted_at: float = None, profile: bool = False, analysis_profile: tuple = None,
+                      report_meta: dict = None, team_size: int = None):
+    """
+    실행 슬롯을 확보한 뒤 분석 파이프라인을 실행합니다. (모델 로딩/슬롯이 빌 때까지 호출한 스레드가 대기)
+    서버에서는 submit_analysis_task 의 전용 실행 스레드나 워커 프로세스에서만 호출합니다.
+    """
+    # 서버 시작 직후라면 AI 모델 로드가 끝날 때까지 대기열에서 기다립니다.
+    if not wait_for_models(timeout=0):
+        job_status[job_id] = {"status": "Pending", "message": "0/6: AI 모델 로딩 대기 중..."}
+        wait_for_models()
+    job_slots = _job_slots
+    job_slots.acquire()
+    mark_job_started()
+
+    started = timer.monotonic()
+    try:
+        _run_analysis_pipeline(job_id, video_path, frame_dir, video_dir, custom_criteria,
+                               submitted_at, profile, analysis_profile, report_meta, team_size)
+    finally:
+        mark_job_finished(timer.monotonic() - started)
+        job_slots.release()
+
+def _run_analysis_pipeline(job_id: str, video_path: Path, frame_dir: Path, video_dir: Path, custom_criteria: list,
+                           submitted_at: float, profile: bool, analysis_profile: tuple, report_meta: dict = None,
+                           team_size: int = None):
     """
-    전체 분석 파이프라인을 실행하는 백그라운드 작업입니다.
+    전체 분석 파이프라인을 실행합니다.
     (총 6단계로 구성)
     """
-    all_vision_results = []
-    audio_path = frame_dir / "audio.wav" 
-    
+    profile_name, settings = analysis_profile or ("standard", {})
+    frame_rate = settings.get("frame_rate", FRAME_RATE)
+
+    queue_wait = timer.monotonic() - submitted_at if submitted_at else 0.0
+    observe("analysis_queue_wait_seconds", queue_wait)
+    timings = JobTimings(queue_wait)
+    job_outcome = "error"
+    profiler = None
+
     try:
-        # 1. 오디오 추출
-        job_status[job_id] = {"status": "Analyzing", "message": "1/6: 오디오 트랙 추출 중..."}
-        extract_audio(video_path, audio_path)
-        
-        # 2. 프레임 추출
-        job_status[job_id] = {"status": "Analyzing", "message": "2/6: 비디오 프레임 추출 중..."}
-        frame_paths = extract_all_frames(video_path, frame_dir, FRAME_RATE)
-        
-        if not frame_paths:
-            raise Exception("비디오에서 프레임을 추출할 수 없습니다.")
-        
-        total_frames = len(frame_paths)
-        
-        # 3. 각 프레임 분석 (MediaPipe)
-        job_status[job_id] = {"status": "Analyzing", "message": f"3/6: 얼굴 데이터 분석 중... (0/{total_frames})"}
-        print(f"   > [3/6] 모든 프레임 분석 시작 (Job: {job_id})...")
-        for i, path in enumerate(frame_paths):
-            data = analyze_image(str(path))
-            data["time"] = i / FRAME_RATE
-            all_vision_results.append(data)
-            
-            if i % 20 == 0 or i == total_frames - 1:
-                job_status[job_id] = {
-                    "status": "Analyzing", 
-                    "message": f"3/6: 얼굴 데이터 분석 중...",
-                    "progress": i + 1,
-                    "total": total_frames
-                }
-        print(f"   > [3/6] ✅ 프레임 분석 완료 (Job: {job_id}).")
-        
-        # 4. 음성 인식 (로컬 Whisper)
-        job_status[job_id] = {"status": "Analyzing", "message": "4/6: ❗️로컬 음성 인식 실행 중... (시간 소요)❗️"}
-        audio_segments, whisper_error = transcribe_audio_with_timestamps(str(audio_path))
-        
+        # ⭐️ [수정] 진행 중 게이지/프로파일러 시작도 try 안에서 (시작 중 실패해도 finally에서 정리·오류 상태 기록)
+        add_gauge("analysis_jobs_in_progress", 1)
+        if profile:
+            profiler = JobProfiler(job_id)
+            profiler.start()
+
+        video_duration = probe_duration(video_path)
+        # 팀 발표 모드는 화자 구분(목소리 묶기)과 얼굴 추적이 영상 전체를 봐야 하므로 구간 처리를 쓰지 않습니다.
+        if not team_size and WINDOWED_MIN_DURATION_SEC > 0 and video_duration >= WINDOWED_MIN_DURATION_SEC:
+            print(f"   > 긴 영상({video_duration:.0f}초): {WINDOW_SEC:.0f}초 구간 단위로 분석 (Job: {job_id})")
+            all_vision_results, aligned_data, whisper_error, frame_counts, team_analysis = _analyze_in_windows(
+                job_id, video_path, frame_dir, video_duration, settings, timings)
+        else:
+            all_vision_results, aligned_data, whisper_error, frame_counts, team_analysis = _analyze_whole_video(
+                job_id, video_path, frame_dir, settings, timings, profile_name, team_size)
+
         ai_report_message = ""
         if whisper_error:
-            print(f"   > [4/6] ❗️ 음성 인식 오류: {whisper_error}")
-            audio_segments = []
             ai_report_message = f"## 🤖 로컬 음성인식 오류\n\n**오류:** {whisper_error}\n\n시선/표정 분석 데이터는 정상적으로 추출되었습니다."
-        else:
-            print(f"   > [4/6] ✅ 음성 인식 완료 (Job: {job_id}).")
-
-        # 5. 음성 운율 분석 (Praat)
-        job_status[job_id] = {"status": "Analyzing", "message": "5/6: ❗️음성 운율(목소리 떨림) 분석 중...❗️"}
-        audio_segments = analyze_prosody_for_segments(audio_path, audio_segments)
-
-        # 6. 데이터 정렬 및 AI 채점
-        job_status[job_id] = {"status": "Analyzing", "message": "6/6: 데이터 정렬 및 AI 채점 중..."}
-        
-        # 6-1. 정렬
-        aligned_data = align_data(all_vision_results, audio_segments)
         
         # 6-2. AI 채점
         if is_openai_configured():
             # ⭐️ [수정] custom_criteria를 get_ai_score에 전달
-            ai_result = get_ai_score(aligned_data, custom_criteria)
+            with timings.stage("ai_scoring"):
+                ai_result = get_ai_score(aligned_data, custom_criteria, settings.get("prompt_chars", 4000))
         else:
             # Whisper는 성공했으나 OpenAI 키가 없는 경우
             if not whisper_error:
@@ -87,18 +197,32 @@ def run_analysis_task(job_id: str, video_path: Path, frame_dir: Path, video_dir:
         
         print("   > [6/6] ✅ 데이터 정렬 및 AI 채점 완료.")
 
+        # 7. (선택) PDF 보고서 및 대회 점수표
+        report_info = {}
+        if REPORT_STAGE_ENABLED and custom_criteria and ai_result.get("reviews"):
+            job_status[job_id] = {"status": "Analyzing", "message": "6/6: 결과 보고서(PDF) 생성 중..."}
+            with timings.stage("report"):
+                report_info = _generate_job_report(job_id, ai_result, custom_criteria, report_meta or {})
+
         final_result = {
             "ai_assessment": ai_result,
             "analysis_summary": {
-                "total_frames_processed": len(all_vision_results),
-                "duration_analyzed_sec": len(all_vision_results) / FRAME_RATE,
-                "face_detected_frames": len([f for f in all_vision_results if "error" not in f]),
+                "total_frames_processed": frame_counts["total"],
+                "duration_analyzed_sec": frame_counts["total"] / frame_rate,
+                "analysis_profile": {"name": profile_name, **settings},
+                "face_detected_frames": frame_counts["face_detected"],
+                "timings": timings.summary(),
+                **({"profile_url": f"/jobs/{job_id}/profile"} if profiler else {}),
             },
             "raw_data": all_vision_results,
-            "aligned_transcript_data": aligned_data
+            "aligned_transcript_data": aligned_data,
+            **({"team_analysis": team_analysis} if team_analysis else {}),
+            **report_info,
         }
         
+        save_job_result(job_id, final_result)
         job_status[job_id] = {"status": "Complete", "result": final_result}
+        job_outcome = "complete"
         print(f"\n✅✅✅ [작업 완료] (Job: {job_id})")
 
     except Exception as e:
@@ -108,4 +232,327 @@ def run_analysis_task(job_id: str, video_path: Path, frame_dir: Path, video_dir:
     
     finally:
         # 분석이 성공하든 실패하든 임시 파일 정리
-        cleanup_dirs(video_dir, frame_dir)
\ No newline at end of file
+        cleanup_dirs(video_dir, frame_dir, get_partial_dir(job_id))
+        if profiler:
+            try:
+                profiler.stop()
+            except Exception as e:
+                print(f"   > [Profile] ⚠️ 프로파일 저장 실패: {e}")
+        add_gauge("analysis_jobs_in_progress", -1)
+        inc_counter("analysis_jobs_total", status=job_outcome)
+        observe("analysis_job_seconds", timings.summary()["total_wall_sec"])
+
+def _report_inputs(ai_result: dict, custom_criteria: list):
+    """
+    채점 기준/AI 채점 결과를 report_generator 형식으로 바꿉니다.
+    (기준의 score → 배점 weight, 리뷰는 기준 이름으로 짝지음 / 없는 기준은 0점)
+    """
+    reviews = {r.get("name"): r for r in ai_result.get("reviews", [])}
+    criteria, grading_result = [], []
+    for criterion in custom_criteria:
+        name = criterion.get("name", "")
+        criteria.append({"name": name, "weight": int(criterion.get("score", 0) or 0)})
+        review = reviews.get(name, {})
+        try:
+            score = str(max(0, int(round(float(review.get("score", 0))))))
+        except (TypeError, ValueError):
+            score = "0"
+        grading_result.append({"score": score, "feedback": review.get("feedback", "평가 결과 없음")})
+    return criteria, grading_result
+
+def _generate_job_report(job_id: str, ai_result: dict, custom_criteria: list, report_meta: dict) -> dict:
+    """
+    jobs/<job_id>/report.pdf 를 만들고, 대회명이 있으면 대회 점수표에 팀 결과를 추가합니다.
+    보고서 생성에 실패해도 분석 결과는 그대로 완료 처리합니다.
+    """
+    try:
+        try:
+            from kyuchan.report_generator import create_pdf, save_summary_excel  # fpdf/pandas 필요 (선택 의존성)
+        except ImportError as e:
+            raise Exception(f"보고서 모듈을 불러올 수 없습니다: {e}")
+
+        team_name = report_meta.get("team_name") or "발표"
+        criteria, grading_result = _report_inputs(ai_result, custom_criteria)
+        create_pdf(team_name, criteria, grading_result, output_path=str(get_job_dir(job_id) / "report.pdf"))
+        competition_name = report_meta.get("competition_name")
+        if competition_name:
+            save_summary_excel(team_name, competition_name, criteria, grading_result)
+        print(f"   > [보고서] ✅ 결과 보고서 생성 완료 (Job: {job_id}).")
+        return {"report_url": f"/jobs/{job_id}/report.pdf"}
+    except Exception as e:
+        print(f"   > [보고서] ⚠️ 결과 보고서 생성 실패: {e}")
+        return {"report_error": str(e)}
+
+def _record_face_frames(extractor: BlendshapeExtractor):
+    """얼굴 검출/미검출 프레임 수를 메트릭에 한 번에 기록합니다. (프레임마다 기록하면 잠금 비용이 쌓임)"""
+    detected, missed = extractor.frame_counts()
+    inc_counter("face_frames_total", detected, result="detected")
+    inc_counter("face_frames_total", missed, result="missed")
+
+def _analyze_whole_video(job_id: str, video_path: Path, frame_dir: Path, settings: dict,
+                         timings: JobTimings, profile_name: str, team_size: int = None):
+    """
+    영상 전체를 한 번에 처리합니다. (1~6-1단계)
+    반환값: (프레임별 분석 결과, 정렬 데이터, 음성 인식 오류, 프레임 수, 팀 발표 분석 결과 또는 None)
+    팀 발표 모드에서는 프레임별 결과에 얼굴마다 한 줄씩 "presenter"(발표자 ID)가 붙고,
+    정렬 데이터의 문장마다 말한 발표자와 그 발표자 얼굴의 평균 지표가 들어갑니다.
+    """
+    frame_rate = settings.get("frame_rate", FRAME_RATE)
+    audio_path = frame_dir / "audio.wav" 
+
+    # 1. 오디오 추출
+    job_status[job_id] = {"status": "Analyzing", "message": "1/6: 오디오 트랙 추출 중..."}
+    with timings.stage("audio_extract"):
+        extract_audio(video_path, audio_path)
+    
+    # 2. 프레임 추출
+    job_status[job_id] = {"status": "Analyzing", "message": "2/6: 비디오 프레임 추출 중..."}
+    with timings.stage("frame_extract"):
+        frame_paths = extract_all_frames(video_path, frame_dir, frame_rate)
+    
+    if not frame_paths:
+        raise Exception("비디오에서 프레임을 추출할 수 없습니다.")
+    
+    total_frames = len(frame_paths)
+    
+    # 3. 각 프레임 분석 (MediaPipe)
+    job_status[job_id] = {"status": "Analyzing", "message": f"3/6: 얼굴 데이터 분석 중... (0/{total_frames})"}
+    print(f"   > [3/6] 모든 프레임 분석 시작 (Job: {job_id})...")
+    # ⭐️ [수정] 프레임마다 점수만 행렬에 모으고, 표정/시선 지표는 마지막에 한 번에 계산 (blendshape_features.py)
+    with timings.stage("face_analysis"):
+        if team_size:
+            team = TeamFaceAnalyzer(frame_rate, team_size)
+        else:
+            extractor = BlendshapeExtractor(total_frames)
+        try:
+            for i, path in enumerate(frame_paths):
+                if team_size:
+                    team.add_frame(i, str(path))
+                else:
+                    extractor.add(i / frame_rate, *detect_face_blendshapes(str(path)))
+
+                if i % 20 == 0 or i == total_frames - 1:
+                    job_status[job_id] = {
+                        "status": "Analyzing",
+                        "message": f"3/6: 얼굴 데이터 분석 중...",
+                        "progress": i + 1,
+                        "total": total_frames
+                    }
+        finally:
+            if team_size:
+                team.close()
+        if team_size:
+            presenters = team.presenters()
+            all_vision_results = merge_presenter_frames(presenters)
+            # 짧게 보여 제외된 얼굴(TEAM_MIN_TRACK_SEC)만 있던 프레임은 검출 프레임으로 세지 않음
+            face_detected = len({frame["time"] for frame in all_vision_results})
+            inc_counter("face_frames_total", face_detected, result="detected")
+            inc_counter("face_frames_total", total_frames - face_detected, result="missed")
+            print(f"   > [3/6] 팀 발표 모드: 발표자 {len(presenters)}명 추적 (Job: {job_id})")
+        else:
+            all_vision_results = extractor.results()
+            face_detected = extractor.frame_counts()[0]
+            _record_face_frames(extractor)
+    face_seconds = timings.wall("face_analysis")
+    if face_seconds > 0:
+        timings.extra["frames_per_sec"] = round(total_frames / face_seconds, 2)
+        observe("face_analysis_fps", total_frames / face_seconds)
+    print(f"   > [3/6] ✅ 프레임 분석 완료 (Job: {job_id}).")
+    
+    # 4. 음성 인식 (로컬 Whisper)
+    job_status[job_id] = {"status": "Analyzing", "message": "4/6: ❗️로컬 음성 인식 실행 중... (시간 소요)❗️"}
+    with timings.stage("transcription"):
+        audio_segments, whisper_error = transcribe_audio_with_timestamps(
+            str(audio_path), settings.get("whisper_model", DEFAULT_WHISPER_MODEL))
+    audio_duration = get_audio_duration(audio_path)
+    if audio_duration > 0:
+        timings.extra["audio_duration_sec"] = round(audio_duration, 2)
+        timings.extra["audio_rtf"] = round(timings.wall("transcription") / audio_duration, 3)
+    
+    if whisper_error:
+        print(f"   > [4/6] ❗️ 음성 인식 오류: {whisper_error}")
+        audio_segments = []
+    else:
+        print(f"   > [4/6] ✅ 음성 인식 완료 (Job: {job_id}).")
+
+    # 5. 음성 운율 분석 (Praat)
+    job_status[job_id] = {"status": "Analyzing", "message": "5/6: ❗️음성 운율(목소리 떨림) 분석 중...❗️"}
+    if settings.get("prosody", True):
+        with timings.stage("prosody"):
+            audio_segments = analyze_prosody_for_segments(audio_path, audio_segments)
+    else:
+        print(f"   > [5/6] 분석 프로필 '{profile_name}': 음성 운율 분석 생략")
+
+    # 6. 데이터 정렬 및 AI 채점
+    job_status[job_id] = {"status": "Analyzing", "message": "6/6: 데이터 정렬 및 AI 채점 중..."}
+    
+    # 6-1. 정렬 (팀 발표 모드: 문장별 발표자 구분 후 발표자별 정렬)
+    team_analysis = None
+    if team_size:
+        with timings.stage("diarization"):
+            aligned_data, team_analysis = analyze_team_segments(presenters, audio_path, audio_segments)
+    else:
+        with timings.stage("alignment"):
+            aligned_data = align_data(all_vision_results, audio_segments)
+
+    frame_counts = {"total": total_frames, "face_detected": face_detected}
+    return all_vision_results, aligned_data, whisper_error, frame_counts, team_analysis
+
+def get_partial_dir(job_id: str) -> Path:
+    return PARTIAL_DIR / job_id
+
+def _compact_vision_record(data: dict) -> dict:
+    """디스크에 기록할 프레임 결과: 수치는 소수점 3자리, all_blendshapes는 화면에 쓰는 상위 10개만 남김"""
+    record = {key: round(value, 3) if isinstance(value, float) else value
+              for key, value in data.items() if key != "all_blendshapes"}
+    blendshapes = data.get("all_blendshapes")
+    if blendshapes:
+        top = sorted(blendshapes.items(), key=lambda item: item[1], reverse=True)[:10]
+        record["all_blendshapes"] = {name: round(score, 3) for name, score in top}
+    return record
+
+def _append_jsonl(path: Path, records: list):
+    # 구간 하나를 한 번에 기록 (/partial 조회 중에도 줄 단위로 읽을 수 있도록)
+    if not records:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+        f.flush()
+
+def _read_jsonl(path: Path, stride: int = 1) -> list:
+    records = []
+    if not path.exists():
+        return records
+    with open(path, encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            if i % stride:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break  # 아직 기록 중인 마지막 줄
+    return records
+
+def _write_progress(partial_dir: Path, progress: dict):
+    tmp_path = partial_dir / "progress.json.tmp"
+    tmp_path.write_text(json.dumps(progress, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, partial_dir / "progress.json")
+
+def _analyze_in_windows(job_id: str, video_path: Path, frame_dir: Path, video_duration: float,
+                        settings: dict, timings: JobTimings):
+    """
+    긴 영상을 WINDOW_SEC 길이의 구간으로 나눠 구간마다 1~6-1단계를 처리합니다.
+    구간 결과는 partials/<job_id>/ 의 JSONL 파일에 추가하고, 구간 임시 파일은 바로 삭제합니다.
+    (구간이 겹치지 않으므로 경계에 걸친 문장은 두 구간으로 나뉠 수 있습니다)
+    반환값은 _analyze_whole_video 와 같으며, raw_data는 RAW_DATA_MAX_FRAMES 이하로 간추립니다. (팀 발표 분석은 None)
+    """
+    frame_rate = settings.get("frame_rate", FRAME_RATE)
+    window_count = max(1, math.ceil(video_duration / WINDOW_SEC))
+    partial_dir = get_partial_dir(job_id)
+    os.makedirs(partial_dir, exist_ok=True)
+    vision_path = partial_dir / "vision.jsonl"
+    aligned_path = partial_dir / "aligned.jsonl"
+
+    total_frames = 0
+    face_detected = 0
+    audio_duration = 0.0
+    whisper_error = None
+    # owner: 작업이 비정상 종료되어 폴더가 남으면 정리 스레드가 지움 (utils/scratch.py)
+    progress = {"window_sec": WINDOW_SEC, "total_windows": window_count, "windows_done": 0,
+                "duration_sec": round(video_duration, 2), "owner": owner_info()}
+    _write_progress(partial_dir, progress)
+
+    for index in range(window_count):
+        start = index * WINDOW_SEC
+        length = min(WINDOW_SEC, video_duration - start)
+        window_dir = frame_dir / f"window-{index:04d}"
+        os.makedirs(window_dir, exist_ok=True)
+        audio_path = window_dir / "audio.wav"
+
+        def report(step: str, **extra):
+            job_status[job_id] = {"status": "Analyzing", "message": f"{step} (구간 {index + 1}/{window_count})",
+                                  "window": index + 1, "total_windows": window_count,
+                                  "partial_url": f"/jobs/{job_id}/partial", **extra}
+
+        # 1~2. 구간 오디오/프레임 추출
+        report("1/6: 오디오 트랙 추출 중...")
+        with timings.stage("audio_extract"):
+            extract_audio(video_path, audio_path, start, length)
+        report("2/6: 비디오 프레임 추출 중...")
+        with timings.stage("frame_extract"):
+            frame_paths = extract_all_frames(video_path, window_dir, frame_rate, start, length)
+
+        # 3. 얼굴 분석 (시간은 영상 전체 기준)
+        with timings.stage("face_analysis"):
+            extractor = BlendshapeExtractor(len(frame_paths))
+            for i, path in enumerate(frame_paths):
+                extractor.add(start + i / frame_rate, *detect_face_blendshapes(str(path)))
+                if i % 20 == 0 or i == len(frame_paths) - 1:
+                    report("3/6: 얼굴 데이터 분석 중...", progress=i + 1, total=len(frame_paths))
+            vision_results = extractor.results()
+            _record_face_frames(extractor)
+        total_frames += len(vision_results)
+        face_detected += len([f for f in vision_results if "error" not in f])
+
+        # 4. 음성 인식
+        report("4/6: ❗️로컬 음성 인식 실행 중... (시간 소요)❗️")
+        with timings.stage("transcription"):
+            audio_segments, error = transcribe_audio_with_timestamps(
+                str(audio_path), settings.get("whisper_model", DEFAULT_WHISPER_MODEL))
+        audio_duration += get_audio_duration(audio_path)
+        if error:
+            print(f"   > [4/6] ❗️ 음성 인식 오류 (구간 {index + 1}): {error}")
+            whisper_error = error
+            audio_segments = []
+
+        # 5. 운율 분석 (구간 WAV 기준 시간으로 계산한 뒤 영상 전체 기준으로 이동)
+        if settings.get("prosody", True):
+            report("5/6: ❗️음성 운율(목소리 떨림) 분석 중...❗️")
+            with timings.stage("prosody"):
+                audio_segments = analyze_prosody_for_segments(audio_path, audio_segments)
+        for segment in audio_segments:
+            segment["start"] += start
+            segment["end"] += start
+
+        # 6-1. 구간 정렬 후 결과를 디스크에 기록
+        report("6/6: 데이터 정렬 중...")
+        with timings.stage("alignment"):
+            aligned = align_data(vision_results, audio_segments)
+        _append_jsonl(vision_path, [_compact_vision_record(v) for v in vision_results])
+        _append_jsonl(aligned_path, aligned)
+        progress["windows_done"] = index + 1
+        _write_progress(partial_dir, progress)
+
+        del extractor, vision_results, audio_segments, aligned
+        cleanup_dirs(window_dir)
+
+    if total_frames == 0:
+        raise Exception("비디오에서 프레임을 추출할 수 없습니다.")
+
+    face_seconds = timings.wall("face_analysis")
+    if face_seconds > 0:
+        timings.extra["frames_per_sec"] = round(total_frames / face_seconds, 2)
+        observe("face_analysis_fps", total_frames / face_seconds)
+    if audio_duration > 0:
+        timings.extra["audio_duration_sec"] = round(audio_duration, 2)
+        timings.extra["audio_rtf"] = round(timings.wall("transcription") / audio_duration, 3)
+    timings.extra["windows"] = window_count
+
+    job_status[job_id] = {"status": "Analyzing", "message": "6/6: 데이터 정렬 및 AI 채점 중..."}
+    stride = max(1, math.ceil(total_frames / RAW_DATA_MAX_FRAMES))
+    raw_data = _read_jsonl(vision_path, stride)
+    aligned_data = _read_jsonl(aligned_path)
+    return raw_data, aligned_data, whisper_error, {"total": total_frames, "face_detected": face_detected}, None
+
+def load_partial_results(job_id: str):
+    """
+    구간 단위로 처리 중인 작업의 지금까지 결과를 읽습니다. (구간 처리 작업이 아니거나 끝났으면 None)
+    워커 프로세스 풀 모드에서도 디스크에서 읽으므로 같은 방식으로 동작합니다.
+    """
+    partial_dir = get_partial_dir(job_id)
+    try:
+        progress = json.loads((partial_dir / "progress.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    progress.pop("owner", None)
+    return {**progress, "aligned_transcript_data": _read_jsonl(partial_dir / "aligned.jsonl")}
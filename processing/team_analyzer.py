@@ -0,0 +1,253 @@
+# [신규 파일] processing/team_analyzer.py
+import os
+import numpy as np
+
+from processing.face_analyzer import create_video_landmarker, detect_faces_for_video
+from processing.blendshape_features import BlendshapeExtractor, DERIVED_METRICS
+from processing.diarization import diarize_segments
+from processing.data_combiner import align_data
+
+# ⭐️ 팀 발표 모드 (발표자 여러 명)
+# 1. 얼굴: VIDEO 모드 FaceLandmarker(num_faces=팀 인원)로 프레임마다 여러 얼굴을 뽑고,
+#    IoU(얼굴 상자 겹침) 추적으로 프레임 사이 같은 사람에게 같은 발표자 ID를 붙입니다. (재식별 모델 없음)
+# 2. 음성: Whisper 문장마다 목소리 특징으로 화자를 묶고 (diarization.py),
+#    화자 묶음마다 그 시간에 입(jawOpen)을 가장 많이 움직인 발표자를 그 화자로 봅니다.
+# 3. 결과: 발표자별 요약/발언 타임라인/정렬 데이터 (result["team_analysis"])
+#
+# 프레임당 비용: MediaPipe는 추적 중인 얼굴 수가 num_faces보다 적으면 매 프레임 얼굴 검출기를 다시 돌리므로,
+# num_faces는 최대값이 아니라 실제 팀 인원으로 맞춥니다. 얼굴 상자는 랜드마크 4개로 계산하고,
+# 추적은 (활성 추적 수 × 얼굴 수)의 IoU 비교뿐이라 얼굴이 늘어도 모델 추론 외 비용은 거의 늘지 않습니다.
+TEAM_DEFAULT_FACES = int(os.getenv("TEAM_DEFAULT_FACES", "3"))
+TEAM_MAX_FACES = int(os.getenv("TEAM_MAX_FACES", "6"))
+TEAM_IOU_THRESHOLD = float(os.getenv("TEAM_IOU_THRESHOLD", "0.3"))
+TEAM_MAX_MISSED_SEC = float(os.getenv("TEAM_MAX_MISSED_SEC", "2.0"))  # 고개 돌림/가려짐을 같은 사람으로 이어 줄 시간
+TEAM_MIN_TRACK_SEC = float(os.getenv("TEAM_MIN_TRACK_SEC", "2.0"))    # 이보다 짧게 보인 얼굴(지나가는 사람 등)은 제외
+
+
+def resolve_team_size(team_size: int = None) -> int:
+    """요청한 팀 인원을 2~TEAM_MAX_FACES 로 맞춥니다. (없으면 TEAM_DEFAULT_FACES)"""
+    return max(2, min(int(team_size or TEAM_DEFAULT_FACES), TEAM_MAX_FACES))
+
+
+def box_iou(a: tuple, b: tuple) -> float:
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    overlap = width * height
+    return overlap / ((a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - overlap)
+
+
+class IoUTracker:
+    """
+    직전 얼굴 상자와의 IoU가 큰 순서로 짝을 짓는 간단한 추적기.
+    max_missed 프레임 넘게 보이지 않은 추적은 끝난 것으로 보고, 이후 같은 자리의 얼굴은 새 추적으로 시작합니다.
+    (끊긴 추적은 merge_fragments() 에서 위치로 다시 이어 붙임)
+    """
+
+    def __init__(self, iou_threshold: float = TEAM_IOU_THRESHOLD, max_missed: int = 10):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.tracks = []  # {"box", "first_box", "first", "last"}
+
+    def update(self, index: int, boxes: list) -> list:
+        """프레임 index의 얼굴 상자들에 추적 번호를 붙여 반환합니다. (boxes와 같은 순서)"""
+        active = [n for n, track in enumerate(self.tracks) if index - track["last"] <= self.max_missed]
+        pairs = sorted(((box_iou(self.tracks[n]["box"], box), n, j) for n in active for j, box in enumerate(boxes)),
+                       reverse=True)
+        assigned = [None] * len(boxes)
+        used = set()
+        for iou, n, j in pairs:
+            if iou < self.iou_threshold:
+                break
+            if n in used or assigned[j] is not None:
+                continue
+            assigned[j] = n
+            used.add(n)
+        for j, box in enumerate(boxes):
+            if assigned[j] is None:
+                self.tracks.append({"box": box, "first_box": box, "first": index, "last": index})
+                assigned[j] = len(self.tracks) - 1
+            else:
+                self.tracks[assigned[j]].update(box=box, last=index)
+        return assigned
+
+    def merge_fragments(self) -> dict:
+        """
+        시간이 겹치지 않고, 앞 추적이 끝난 자리에서 뒤 추적이 시작된 경우 같은 사람으로 이어 붙입니다.
+        (팀 발표에서는 발표자들이 대체로 자기 자리를 지키므로 위치가 신원의 단서)
+        반환값: 추적 번호 -> 대표 추적 번호
+        """
+        owner = {}
+        chains = []  # [대표 번호, 마지막 프레임, 마지막 상자]
+        for n in sorted(range(len(self.tracks)), key=lambda n: self.tracks[n]["first"]):
+            track = self.tracks[n]
+            candidates = [chain for chain in chains if chain[1] < track["first"]
+                          and box_iou(chain[2], track["first_box"]) >= self.iou_threshold / 2]
+            if candidates:
+                chain = max(candidates, key=lambda chain: box_iou(chain[2], track["first_box"]))
+                chain[1], chain[2] = track["last"], track["box"]
+                owner[n] = chain[0]
+            else:
+                chains.append([n, track["last"], track["box"]])
+                owner[n] = n
+        return owner
+
+
+class TeamFaceAnalyzer:
+    """
+    프레임마다 여러 얼굴을 분석해 추적 번호별 BlendshapeExtractor 에 모읍니다.
+
+        team = TeamFaceAnalyzer(frame_rate, team_size)
+        for i, path in enumerate(frame_paths):
+            team.add_frame(i, str(path))
+        presenters = team.presenters()   # {"P1": [프레임 결과...], ...}
+        team.close()
+    """
+
+    def __init__(self, frame_rate: float, team_size: int = None):
+        self.frame_rate = frame_rate
+        self.team_size = resolve_team_size(team_size)
+        self.landmarker = create_video_landmarker(self.team_size)
+        self.tracker = IoUTracker(max_missed=max(1, int(TEAM_MAX_MISSED_SEC * frame_rate)))
+        self._extractors = []
+        self._boxes = []  # 추적 번호별 얼굴 상자 중심 x 합 (발표자 번호를 왼쪽부터 매기기 위함)
+
+    def add_frame(self, index: int, image_path: str):
+        time = index / self.frame_rate
+        faces, _ = detect_faces_for_video(self.landmarker, image_path, int(index * 1000 / self.frame_rate))
+        for track, (box, categories) in zip(self.tracker.update(index, [box for box, _ in faces]), faces):
+            if track == len(self._extractors):
+                self._extractors.append(BlendshapeExtractor())
+                self._boxes.append(0.0)
+            self._extractors[track].add(time, categories)
+            self._boxes[track] += (box[0] + box[2]) / 2
+
+    def close(self):
+        self.landmarker.close()
+
+    def presenters(self) -> dict:
+        """
+        발표자 ID("P1"부터, 화면 왼쪽부터) -> 시간순 프레임 결과 목록 (analyze_image 결과 + "time")
+        TEAM_MIN_TRACK_SEC 보다 짧게 보인 얼굴은 제외합니다.
+        """
+        groups = {}
+        for track, owner in self.tracker.merge_fragments().items():
+            groups.setdefault(owner, []).append(track)
+
+        people = []
+        for tracks in groups.values():
+            frames = sorted((frame for n in tracks for frame in self._extractors[n].results()), key=lambda f: f["time"])
+            if len(frames) < TEAM_MIN_TRACK_SEC * self.frame_rate:
+                continue
+            center_x = sum(self._boxes[n] for n in tracks) / len(frames)
+            people.append((center_x, frames))
+        people.sort(key=lambda person: person[0])
+        return {f"P{i + 1}": frames for i, (_, frames) in enumerate(people)}
+
+
+def _mouth_activity(presenters: dict, segments: list) -> np.ndarray:
+    """
+    (발표자 수 × 문장 수) 입 움직임 점수: 문장 시간 동안 jaw_open 의 표준편차를 발표자별 중앙값으로 나눈 값
+    (입을 원래 벌리고 있는 사람도 '움직임'으로 비교) 화면에 없던 발표자는 NaN
+    """
+    activity = np.full((len(presenters), len(segments)), np.nan)
+    for p, frames in enumerate(presenters.values()):
+        times = np.array([f["time"] for f in frames])
+        jaw = np.array([f["jaw_open"] for f in frames])
+        for s, segment in enumerate(segments):
+            inside = jaw[(times >= segment["start"]) & (times <= segment["end"])]
+            if len(inside) >= 2:
+                activity[p, s] = inside.std()
+        if not np.isnan(activity[p]).all():
+            median = np.nanmedian(activity[p])
+            activity[p] /= median if median > 1e-6 else 1.0
+    return activity
+
+
+def attribute_speakers(presenters: dict, segments: list, speaker_labels: list) -> tuple:
+    """
+    문장별 발표자 ID 목록과 {화자 묶음 번호: 발표자 ID} 를 반환합니다.
+    화자 묶음마다 입 움직임 평균이 가장 큰 발표자를 고르고 (여러 묶음이 한 사람에게 갈 수 있음),
+    입 움직임을 볼 수 없는 묶음은 "S<번호>" (얼굴 없는 화자) 로 둡니다.
+    """
+    ids = list(presenters)
+    activity = _mouth_activity(presenters, segments) if ids else np.empty((0, len(segments)))
+    labels = np.asarray(speaker_labels)
+    mapping = {}
+    for cluster in sorted(set(speaker_labels)):
+        scores = activity[:, labels == cluster]
+        seen = (~np.isnan(scores)).sum(axis=1)
+        if seen.any():
+            mean = np.where(seen > 0, np.nansum(scores, axis=1) / np.maximum(seen, 1), -np.inf)
+            mapping[cluster] = ids[int(np.argmax(mean))]
+        else:
+            mapping[cluster] = f"S{cluster + 1}"
+    return [mapping[label] for label in speaker_labels], mapping
+
+
+def _vision_summary(frames: list) -> dict:
+    if not frames:
+        return {}
+    return {name: round(float(np.mean([f[name] for f in frames])), 3) for name in DERIVED_METRICS}
+
+
+def analyze_team_segments(presenters: dict, audio_path, audio_segments: list) -> tuple:
+    """
+    문장을 발표자에게 나눠 주고 발표자별로 정렬합니다.
+    반환값: (aligned_transcript_data (문장마다 "presenter" 추가, 그 발표자의 얼굴로 평균), team_analysis)
+    """
+    # 화자 수는 실루엣 점수로 고르고, 추적한 얼굴 수는 상한으로만 사용
+    # (잠깐 화면에 잡힌 사람이나 카메라를 보지 않는 발표자 때문에 화자 수가 틀리지 않도록)
+    max_speakers = len(presenters) or TEAM_MAX_FACES
+    try:
+        speaker_labels = diarize_segments(audio_path, audio_segments, max_speakers=max_speakers)
+        method = "voice+mouth"
+    except Exception as e:
+        print(f"   > [Team] ⚠️ 화자 구분 실패, 입 움직임만 사용: {e}")
+        speaker_labels = list(range(len(audio_segments)))  # 문장마다 따로 입 움직임으로 판단
+        method = "mouth"
+    segment_presenters, mapping = attribute_speakers(presenters, audio_segments, speaker_labels)
+
+    aligned_by_presenter = {}
+    for presenter_id in dict.fromkeys(list(presenters) + segment_presenters):
+        segments = [seg for seg, owner in zip(audio_segments, segment_presenters) if owner == presenter_id]
+        aligned_by_presenter[presenter_id] = [{**row, "presenter": presenter_id}
+                                              for row in align_data(presenters.get(presenter_id, []), segments)]
+    aligned_data = sorted((row for rows in aligned_by_presenter.values() for row in rows), key=lambda r: r["start"])
+
+    timeline = []
+    for segment, owner in zip(audio_segments, segment_presenters):
+        if timeline and timeline[-1]["presenter"] == owner:
+            timeline[-1]["end"] = segment["end"]
+            timeline[-1]["segments"] += 1
+        else:
+            timeline.append({"presenter": owner, "start": segment["start"], "end": segment["end"], "segments": 1})
+
+    summaries = []
+    for presenter_id, rows in aligned_by_presenter.items():
+        frames = presenters.get(presenter_id, [])
+        summaries.append({
+            "id": presenter_id,
+            "frames": len(frames),
+            "first_seen_sec": round(frames[0]["time"], 2) if frames else None,
+            "last_seen_sec": round(frames[-1]["time"], 2) if frames else None,
+            "speaking_sec": round(sum(r["end"] - r["start"] for r in rows), 2),
+            "segments": len(rows),
+            "vision_avg": _vision_summary(frames),
+        })
+
+    team_analysis = {
+        "presenters": summaries,
+        "timeline": timeline,
+        "aligned_by_presenter": aligned_by_presenter,
+        "diarization": {"method": method, "speaker_clusters": len(set(speaker_labels)),
+                        "cluster_to_presenter": {str(k): v for k, v in mapping.items()}},
+    }
+    return aligned_data, team_analysis
+
+
+def merge_presenter_frames(presenters: dict) -> list:
+    """발표자별 프레임 결과를 시간순 하나의 목록으로 (프레임마다 "presenter" 추가, raw_data 용)"""
+    frames = [{**frame, "presenter": presenter_id} for presenter_id, rows in presenters.items() for frame in rows]
+    return sorted(frames, key=lambda f: f["time"])
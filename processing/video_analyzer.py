@@ -1,27 +1,71 @@
 import subprocess
 import os
+import time
 from pathlib import Path
+from utils.metrics import observe
+from utils.profiler import record_subprocess
+
+def _run_ffmpeg(args: list, op: str):
+    """FFmpeg 하위 프로세스를 실행하고 실행 시간을 메트릭/프로파일러에 기록합니다."""
+    started = time.perf_counter()
+    returncode = None
+    try:
+        completed = subprocess.run(args, check=True, capture_output=True, text=True)
+        returncode = completed.returncode
+        return completed
+    except subprocess.CalledProcessError as e:
+        returncode = e.returncode
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        observe("ffmpeg_seconds", elapsed, op=op)
+        record_subprocess(args, elapsed, returncode)
+
+def _window_args(start: float = None, duration: float = None) -> list:
+    """입력 파일 앞에 붙이는 구간 지정 옵션 (-ss/-t를 -i 앞에 두어 키프레임 탐색으로 빠르게 이동)"""
+    args = []
+    if start:
+        args += ['-ss', f'{start:.3f}']
+    if duration:
+        args += ['-t', f'{duration:.3f}']
+    return args
+
+def probe_duration(video_path: Path) -> float:
+    """FFprobe로 영상 길이(초)를 읽습니다. 읽을 수 없으면 0을 반환합니다."""
+    try:
+        completed = _run_ffmpeg([
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            str(video_path)
+        ], op="probe")
+        return float(completed.stdout.strip() or 0)
+    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+        return 0.0
 
 # 
 # ❗️ [추가] ❗️: FFmpeg로 오디오 트랙을 16khz mono wav 파일로 추출
-def extract_audio(video_path: Path, output_audio_path: Path) -> Path:
+# ⭐️ [수정] start/duration 인자 추가 → 긴 영상을 구간(window) 단위로 나눠 추출할 때 사용
+def extract_audio(video_path: Path, output_audio_path: Path, start: float = None, duration: float = None) -> Path:
     """
     FFmpeg를 사용하여 비디오에서 오디오 트랙을 추출합니다.
     Whisper AI가 가장 선호하는 16kHz, 16-bit, mono .wav 파일로 변환합니다.
+    start/duration을 주면 해당 구간만 추출합니다.
     """
     print(f"   > [2/5] 오디오 트랙 추출 중...")
     
     try:
         # ffmpeg -i [입력] -vn (비디오X) -acodec pcm_s16le (16비트) -ar 16000 (16kHz) -ac 1 (모노) [출력]
-        subprocess.run([
+        _run_ffmpeg([
             'ffmpeg',
+            *_window_args(start, duration),
             '-i', str(video_path),
             '-vn',                         # 비디오 트랙 무시
             '-acodec', 'pcm_s16le',      # 오디오 코덱 (표준 WAV)
             '-ar', '16000',                # 샘플링 레이트 (Whisper 권장)
             '-ac', '1',                    # 오디오 채널 (모노)
             str(output_audio_path)
-        ], check=True, capture_output=True, text=True)
+        ], op="extract_audio")
         
         print(f"   > [2/5] ✅ 오디오 추출 완료: {output_audio_path.name}")
         return output_audio_path
@@ -34,21 +78,25 @@ def extract_audio(video_path: Path, output_audio_path: Path) -> Path:
         raise Exception("FFmpeg가 설치되지 않았습니다.")
 
 
-def extract_all_frames(video_path: Path, output_dir: Path, fps: int) -> list[Path]:
+def extract_all_frames(video_path: Path, output_dir: Path, fps: int,
+                       start: float = None, duration: float = None) -> list[Path]:
     """
     FFmpeg를 사용하여 비디오에서 프레임을 추출합니다.
+    start/duration을 주면 해당 구간만 추출합니다. (프레임 번호는 구간 시작 기준)
     """
     print(f"   > [3/5] 비디오 프레임 추출 중... (초당 {fps} 프레임)")
     
-    output_pattern = output_dir / "frame-%04d.jpg"
+    # ⭐️ [수정] 프레임 번호는 자릿수가 넘칠 수 있으므로(10fps × 17분 = 10,000장) 넉넉히 채우고 숫자 순으로 정렬
+    output_pattern = output_dir / "frame-%06d.jpg"
     
     try:
-        subprocess.run([
+        _run_ffmpeg([
             'ffmpeg',
+            *_window_args(start, duration),
             '-i', str(video_path),
             '-vf', f'fps={fps}',
             str(output_pattern)
-        ], check=True, capture_output=True, text=True) 
+        ], op="extract_frames")
         
     except subprocess.CalledProcessError as e:
         print("❌ FFmpeg 프레임 추출 오류!", e.stderr)
@@ -57,6 +105,6 @@ def extract_all_frames(video_path: Path, output_dir: Path, fps: int) -> list[Pat
         print("❌ 'ffmpeg' 명령을 찾을 수 없습니다.")
         raise Exception("FFmpeg가 설치되지 않았습니다.")
 
-    frames = sorted([f for f in output_dir.glob('*.jpg')])
+    frames = sorted(output_dir.glob('frame-*.jpg'), key=lambda f: int(f.stem.rsplit('-', 1)[1]))
     print(f"   > [3/5] ✅ {len(frames)}개 프레임 추출 완료.")
-    return frames
\ No newline at end of file
+    return frames
@@ -0,0 +1,59 @@
+# [신규 파일] processing/warmup.py
+import threading
+import time
+
+from processing.face_analyzer import setup_face_landmarker
+from processing.audio_analyzer import load_local_whisper_model
+
+# ⭐️ AI 모델 백그라운드 로드 (서버는 모델 로드를 기다리지 않고 바로 응답을 시작)
+# status: not_started → loading → ready | failed
+warmup_state = {"status": "not_started", "error": None, "elapsed_sec": None}
+_warmup_done = threading.Event()
+
+
+def mark_warmup_loading():
+    warmup_state["status"] = "loading"
+
+
+def mark_warmup_finished(error: str = None, elapsed_sec: float = None):
+    """warm-up 결과를 기록하고 대기 중인 작업들을 깨웁니다. (워커 프로세스 풀도 사용)"""
+    warmup_state["status"] = "failed" if error else "ready"
+    warmup_state["error"] = error
+    warmup_state["elapsed_sec"] = elapsed_sec
+    _warmup_done.set()
+
+
+def _warmup():
+    started = time.perf_counter()
+    error = None
+    try:
+        setup_face_landmarker()
+        load_local_whisper_model()
+        print(f"   > [Warm-up] ✅ AI 모델 로드 완료 ({time.perf_counter() - started:.1f}초)")
+    except Exception as e:
+        error = str(e)
+        print(f"❌ 치명적 오류: AI 모델 로드 실패! {e}")
+    finally:
+        mark_warmup_finished(error, round(time.perf_counter() - started, 2))
+
+
+def start_model_warmup() -> threading.Thread:
+    """MediaPipe/Whisper 모델 로드를 백그라운드 스레드에서 시작합니다."""
+    mark_warmup_loading()
+    thread = threading.Thread(target=_warmup, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_ready() -> bool:
+    return warmup_state["status"] == "ready"
+
+
+def wait_for_models(timeout: float = None) -> bool:
+    """
+    warm-up이 끝날 때까지 기다립니다. (성공/실패 무관)
+    warm-up을 시작하지 않은 경우(벤치마크 등 직접 로드한 경우)에는 바로 반환합니다.
+    """
+    if warmup_state["status"] == "not_started":
+        return True
+    return _warmup_done.wait(timeout)
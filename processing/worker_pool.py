@@ -0,0 +1,225 @@
+# [신규 파일] processing/worker_pool.py
+import gc
+import multiprocessing as mp
+import os
+import threading
+import time
+
+from processing import task_manager
+from processing.warmup import mark_warmup_loading, mark_warmup_finished
+from utils.metrics import export_and_reset, merge_exported, set_gauge, inc_counter, add_gauge
+
+# ⭐️ 분석 워커 프로세스 풀 (preload-and-fork)
+#
+#   uvicorn 프로세스 ──(작업 큐)──▶ 모델 호스트 프로세스 ──fork──▶ 워커 N개
+#          ▲                        (Whisper 가중치/MediaPipe 모델 바이트 1회 로드)
+#          └──────────(이벤트 큐: 작업 상태, 메트릭, 워커 메모리)──────────┘
+#
+# 호스트는 모델을 한 번만 로드한 뒤 워커를 fork하므로 가중치 메모리는 copy-on-write로 공유됩니다.
+# 워커는 WORKER_MAX_JOBS개 작업을 처리하면 종료되고, 호스트가 새 워커를 fork합니다. (메모리 증가 제한)
+# ANALYSIS_WORKERS=0(기본값)이면 사용하지 않고 기존처럼 uvicorn 프로세스 안에서 분석합니다.
+
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "0"))
+WORKER_MAX_JOBS = int(os.getenv("WORKER_MAX_JOBS", "20"))
+MEMORY_REPORT_INTERVAL_SEC = 5.0
+
+_pool = {"host": None, "job_queue": None, "shutdown": None, "workers": {}}
+
+
+def is_worker_pool_supported() -> bool:
+    return ANALYSIS_WORKERS > 0 and "fork" in mp.get_all_start_methods()
+
+
+def is_worker_pool_running() -> bool:
+    return _pool["host"] is not None and _pool["host"].is_alive()
+
+
+def read_process_memory(pid: int) -> dict:
+    """/proc/<pid>/smaps_rollup 에서 RSS/PSS/공유/전용 메모리(바이트)를 읽습니다."""
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) * 1024
+    except OSError:
+        return {}
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+class _ForwardingStatus(dict):
+    """워커 안에서 task_manager.job_status 대신 사용: 상태 변경을 이벤트 큐로 메인 프로세스에 전달합니다."""
+
+    def __init__(self, event_queue):
+        super().__init__()
+        self._event_queue = event_queue
+
+    def __setitem__(self, job_id, value):
+        self._event_queue.put(("status", job_id, value))
+
+
+def _worker_main(slot: int, max_jobs: int, job_queue, event_queue, current_job):
+    task_manager.job_status = _ForwardingStatus(event_queue)
+    handled = 0
+    while handled < max_jobs:
+        item = job_queue.get()
+        if item is None:
+            break
+        job_id, args, kwargs = item
+        current_job.value = job_id.encode("ascii")
+        event_queue.put(("started", job_id, slot))
+        started = time.monotonic()
+        try:
+            task_manager.run_analysis_task(job_id, *args, **kwargs)
+        finally:
+            current_job.value = b""
+            event_queue.put(("finished", job_id, time.monotonic() - started))
+            event_queue.put(("metrics", None, export_and_reset()))
+        handled += 1
+
+
+def _host_main(worker_count: int, max_jobs: int, job_queue, event_queue, shutdown):
+    from processing.audio_analyzer import load_local_whisper_model
+    from processing.face_analyzer import preload_face_model_asset
+
+    parent_pid = os.getppid()
+    started = time.perf_counter()
+    try:
+        load_local_whisper_model()
+        preload_face_model_asset()
+        event_queue.put(("ready", None, round(time.perf_counter() - started, 2)))
+    except Exception as e:
+        # 단일 프로세스 모드와 마찬가지로 모델 없이도 워커는 띄움 (각 단계에서 오류 처리)
+        print(f"❌ 치명적 오류: AI 모델 로드 실패! {e}")
+        event_queue.put(("ready", str(e), round(time.perf_counter() - started, 2)))
+
+    # 로드된 객체를 GC 추적 대상에서 빼서, 워커의 GC가 공유 페이지를 건드려 복사되는 것을 줄임
+    gc.freeze()
+
+    fork_ctx = mp.get_context("fork")
+    current_jobs = [fork_ctx.Array("c", 64, lock=False) for _ in range(worker_count)]
+    workers = [None] * worker_count
+
+    def fork_worker(slot):
+        process = fork_ctx.Process(target=_worker_main, name=f"analysis-worker-{slot}", daemon=True,
+                                   args=(slot, max_jobs, job_queue, event_queue, current_jobs[slot]))
+        process.start()
+        workers[slot] = process
+
+    for slot in range(worker_count):
+        fork_worker(slot)
+    print(f"   > [Worker Pool] ✅ 분석 워커 {worker_count}개 시작 (작업 {max_jobs}개마다 재시작)")
+
+    last_report = 0.0
+    while not shutdown.wait(1.0):
+        if os.getppid() != parent_pid:
+            break  # 메인 프로세스가 사라졌으면 함께 종료
+        for slot, process in enumerate(workers):
+            if process.is_alive():
+                continue
+            process.join()
+            job_id = current_jobs[slot].value.decode("ascii")
+            if job_id:
+                # 작업 도중 비정상 종료 (메모리 부족으로 인한 강제 종료 등)
+                event_queue.put(("status", job_id, {"status": "Error",
+                                                    "message": f"분석 워커가 비정상 종료되었습니다. (exit {process.exitcode})"}))
+                event_queue.put(("finished", job_id, 0.0))
+                current_jobs[slot].value = b""
+            event_queue.put(("restarted", slot, process.exitcode))
+            fork_worker(slot)
+
+        if time.monotonic() - last_report >= MEMORY_REPORT_INTERVAL_SEC:
+            last_report = time.monotonic()
+            stats = {"host": {"pid": os.getpid(), **read_process_memory(os.getpid())}}
+            for slot, process in enumerate(workers):
+                stats[f"worker-{slot}"] = {"pid": process.pid,
+                                           "job_id": current_jobs[slot].value.decode("ascii") or None,
+                                           **read_process_memory(process.pid)}
+            event_queue.put(("workers", None, stats))
+
+    for process in workers:
+        process.terminate()
+    for process in workers:
+        process.join(timeout=10)
+
+
+def _handle_events(event_queue):
+    """메인 프로세스: 워커 풀에서 올라오는 이벤트를 task_manager 상태와 메트릭에 반영합니다."""
+    while True:
+        try:
+            kind, key, payload = event_queue.get()
+        except (EOFError, OSError):
+            return
+        try:
+            _apply_event(kind, key, payload)
+        except Exception as e:
+            print(f"   > [Worker Pool] ⚠️ 이벤트 처리 오류 ({kind}): {e}")
+
+
+def _apply_event(kind: str, key, payload):
+    if kind == "status":
+        task_manager.job_status[key] = payload
+    elif kind == "started":
+        task_manager.mark_job_started()
+        add_gauge("analysis_jobs_in_progress", 1)
+    elif kind == "finished":
+        task_manager.mark_job_finished(payload)
+        add_gauge("analysis_jobs_in_progress", -1)
+    elif kind == "metrics":
+        merge_exported(payload)
+    elif kind == "ready":
+        mark_warmup_finished(key, payload)
+    elif kind == "restarted":
+        inc_counter("worker_restarts_total", worker=f"worker-{key}")
+    elif kind == "workers":
+        _pool["workers"] = payload
+        for name, stats in payload.items():
+            for field in ("rss", "pss", "shared", "private"):
+                if field in stats:
+                    set_gauge("worker_memory_bytes", stats[field], worker=name, kind=field)
+
+
+def start_worker_pool(worker_count: int = ANALYSIS_WORKERS, max_jobs: int = WORKER_MAX_JOBS):
+    """모델 호스트 프로세스를 띄웁니다. 호스트가 모델을 로드한 뒤 워커들을 fork합니다."""
+    spawn_ctx = mp.get_context("spawn")
+    # 작업 큐: 메인만 넣고 워커는 꺼내기만 하므로 일반 Queue (업로드 요청이 파이프 용량 때문에 막히지 않도록)
+    # 이벤트 큐: 호스트에서 fork된 워커가 넣어야 하므로 피더 스레드 없이 파이프에 바로 쓰는 SimpleQueue
+    job_queue = spawn_ctx.Queue()
+    event_queue = spawn_ctx.SimpleQueue()
+    shutdown = spawn_ctx.Event()
+
+    mark_warmup_loading()
+    task_manager.set_max_concurrent_jobs(worker_count)
+    host = spawn_ctx.Process(target=_host_main, name="analysis-model-host",
+                             args=(worker_count, max_jobs, job_queue, event_queue, shutdown))
+    host.start()
+    threading.Thread(target=_handle_events, args=(event_queue,), name="worker-pool-events", daemon=True).start()
+    _pool.update(host=host, job_queue=job_queue, shutdown=shutdown)
+    print(f"   > [Worker Pool] 모델 호스트 프로세스 시작 (pid {host.pid}, 워커 {worker_count}개)")
+
+
+def stop_worker_pool():
+    if _pool["host"] is None:
+        return
+    _pool["shutdown"].set()
+    _pool["host"].join(timeout=30)
+    if _pool["host"].is_alive():
+        _pool["host"].terminate()
+    _pool["host"] = None
+
+
+def submit_to_worker_pool(job_id: str, *args, **kwargs):
+    """run_analysis_task 와 같은 인자로 작업을 워커 풀 대기열에 넣습니다."""
+    _pool["job_queue"].put((job_id, args, kwargs))
+
+
+def get_worker_stats() -> dict:
+    """가장 최근에 보고된 워커별 메모리(rss/pss/shared/private, 바이트)와 현재 작업"""
+    return {"running": is_worker_pool_running(), "max_jobs_per_worker": WORKER_MAX_JOBS,
+            "processes": _pool["workers"]}
@@ -0,0 +1,88 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from processing.blendshape_features import BLENDSHAPE_NAMES, BlendshapeExtractor, compute_frame_metrics
+from processing.face_analyzer import _process_blendshapes
+
+FRAMES = 5000
+METRICS = ("gaze_h", "gaze_v", "smile", "frown", "brow_down", "jaw_open", "brow_up", "mouth_open", "squint")
+
+
+def reference_process_blendshapes(categories: list) -> dict:
+    """블렌드셰이프 레지스트리 도입 전의 pick() 기반 계산 (기준 결과)"""
+    cats = {c.category_name: c.score for c in categories}
+
+    def pick(n):
+        return cats.get(n, 0)
+
+    return {
+        "gaze_h": ((pick('eyeLookOutLeft') - pick('eyeLookInLeft')) + (pick('eyeLookInRight') - pick('eyeLookOutRight'))) / 2,
+        "gaze_v": ((pick('eyeLookUpLeft') - pick('eyeLookDownLeft')) + (pick('eyeLookUpRight') - pick('eyeLookDownRight'))) / 2,
+        "smile": (pick('mouthSmileLeft') + pick('mouthSmileRight')) / 2,
+        "frown": (pick('mouthFrownLeft') + pick('mouthFrownRight')) / 2,
+        "brow_down": (pick('browDownLeft') + pick('browDownRight')) / 2,
+        "jaw_open": pick('jawOpen'),
+        "brow_up": (pick('browInnerUp') + pick('browOuterUpLeft') + pick('browOuterUpRight')) / 3,
+        "mouth_open": pick('mouthOpen'),
+        "squint": (pick('eyeSquintLeft') + pick('eyeSquintRight')) / 2,
+        "all_blendshapes": cats,
+    }
+
+
+def random_frames(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [[SimpleNamespace(index=i, category_name=name, score=rng.random()) for i, name in enumerate(BLENDSHAPE_NAMES)]
+            for _ in range(count)]
+
+
+def assert_same_result(actual: dict, expected: dict):
+    assert list(actual)[:len(METRICS)] == list(METRICS)
+    for name in METRICS:
+        assert actual[name] == pytest.approx(expected[name], abs=1e-12)
+    assert actual["all_blendshapes"] == expected["all_blendshapes"]
+    assert list(actual["all_blendshapes"]) == list(expected["all_blendshapes"])
+
+
+def test_single_frame_path_matches_reference():
+    for categories in random_frames(FRAMES):
+        assert_same_result(_process_blendshapes([categories]), reference_process_blendshapes(categories))
+
+
+def test_extractor_matches_reference_with_missed_frames():
+    frames = random_frames(FRAMES, seed=1)
+    extractor = BlendshapeExtractor(16)  # 용량보다 많은 프레임 (배열 확장 경로 포함)
+    for i, categories in enumerate(frames):
+        if i % 7 == 0:
+            extractor.add(i / 5, None, "얼굴 미검출")
+        else:
+            extractor.add(i / 5, categories)
+
+    assert extractor.frame_counts() == (FRAMES - len(range(0, FRAMES, 7)), len(range(0, FRAMES, 7)))
+    for i, (result, categories) in enumerate(zip(extractor.results(), frames)):
+        assert result["time"] == i / 5
+        if i % 7 == 0:
+            assert result == {"error": "얼굴 미검출", "time": i / 5}
+        else:
+            assert_same_result(result, reference_process_blendshapes(categories))
+
+
+def test_extractor_keeps_unknown_categories():
+    categories = random_frames(1)[0][:5] + [SimpleNamespace(index=99, category_name="newShape", score=0.25)]
+    extractor = BlendshapeExtractor()
+    extractor.add(0.0, categories)
+    result = extractor.results()[0]
+    assert result["all_blendshapes"]["newShape"] == 0.25
+    assert_same_result({**result}, reference_process_blendshapes(categories))
+
+
+def test_frame_metrics_match_batch_metrics():
+    frames = random_frames(50, seed=2)
+    extractor = BlendshapeExtractor(len(frames))
+    for categories in frames:
+        extractor.add(0.0, categories)
+    for result, categories in zip(extractor.results(), frames):
+        single = compute_frame_metrics({c.category_name: c.score for c in categories})
+        for name in METRICS:
+            assert single[name] == pytest.approx(result[name], abs=1e-12)
@@ -0,0 +1,81 @@
+from processing.team_analyzer import IoUTracker, attribute_speakers, box_iou
+
+LEFT = (0.10, 0.20, 0.35, 0.60)
+RIGHT = (0.60, 0.25, 0.85, 0.65)
+
+
+def shifted(box: tuple, dx: float) -> tuple:
+    return box[0] + dx, box[1], box[2] + dx, box[3]
+
+
+def test_box_iou():
+    assert box_iou(LEFT, LEFT) == 1.0
+    assert box_iou(LEFT, RIGHT) == 0.0
+    assert 0.0 < box_iou(LEFT, shifted(LEFT, 0.05)) < 1.0
+
+
+def test_tracker_keeps_ids_while_faces_move_and_swap_order():
+    tracker = IoUTracker(iou_threshold=0.3, max_missed=3)
+    first = tracker.update(0, [LEFT, RIGHT])
+    assert first == [0, 1]
+    for index in range(1, 20):
+        dx = 0.005 * index
+        boxes = [shifted(RIGHT, -dx), shifted(LEFT, dx)]  # 검출 순서가 바뀌어도 같은 사람은 같은 번호
+        assert tracker.update(index, boxes) == [1, 0]
+    assert len(tracker.tracks) == 2
+
+
+def test_tracker_bridges_short_gaps_only():
+    tracker = IoUTracker(iou_threshold=0.3, max_missed=3)
+    tracker.update(0, [LEFT, RIGHT])
+    tracker.update(1, [RIGHT])          # 왼쪽 사람이 잠깐 고개를 돌림
+    tracker.update(2, [RIGHT])
+    assert tracker.update(3, [LEFT, RIGHT]) == [0, 1]
+
+    for index in range(4, 10):          # max_missed 보다 오래 안 보이면 새 추적
+        tracker.update(index, [RIGHT])
+    assert tracker.update(10, [LEFT, RIGHT]) == [2, 1]
+
+
+def test_merge_fragments_rejoins_by_position():
+    tracker = IoUTracker(iou_threshold=0.3, max_missed=2)
+    for index in range(5):
+        tracker.update(index, [LEFT, RIGHT])
+    for index in range(5, 12):
+        tracker.update(index, [RIGHT])
+    for index in range(12, 15):
+        tracker.update(index, [shifted(LEFT, 0.02), RIGHT])
+    tracker.update(15, [(0.40, 0.70, 0.55, 0.95), RIGHT])  # 다른 자리에 나타난 사람
+
+    assert len(tracker.tracks) == 4
+    owner = tracker.merge_fragments()
+    assert owner[2] == owner[0] == 0   # 같은 자리로 돌아온 왼쪽 사람
+    assert owner[1] == 1
+    assert owner[3] == 3               # 위치가 다르면 다른 사람
+
+
+def test_merge_fragments_never_joins_overlapping_tracks():
+    tracker = IoUTracker(iou_threshold=0.3, max_missed=1)
+    tracker.update(0, [LEFT])
+    tracker.update(1, [LEFT, shifted(LEFT, 0.12)])  # 겹치는 시간에 나란히 선 두 사람
+    owner = tracker.merge_fragments()
+    assert owner[0] != owner[1]
+
+
+def frames(jaw_values: list, start: float = 0.0) -> list:
+    return [{"time": start + i * 0.2, "jaw_open": jaw} for i, jaw in enumerate(jaw_values)]
+
+
+def test_attribute_speakers_uses_mouth_movement():
+    talking = [0.1, 0.5] * 15
+    still = [0.05] * 30
+    presenters = {"P1": frames(talking[:15] + still[:15]), "P2": frames(still[:15] + talking[:15])}
+    segments = [{"start": 0.0, "end": 2.8}, {"start": 3.0, "end": 5.8}]
+    labels, mapping = attribute_speakers(presenters, segments, [0, 1])
+    assert labels == ["P1", "P2"]
+    assert mapping == {0: "P1", 1: "P2"}
+
+
+def test_attribute_speakers_without_faces():
+    labels, _ = attribute_speakers({}, [{"start": 0.0, "end": 1.0}, {"start": 1.0, "end": 2.0}], [1, 0])
+    assert labels == ["S2", "S1"]
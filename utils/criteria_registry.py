@@ -0,0 +1,152 @@
+# [신규 파일] utils/criteria_registry.py
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+from utils.json_helpers import STANDARD_DIR
+
+# ⭐️ 채점 기준 레지스트리
+# - 기준 목록을 정규화(공백 정리, 배점 정수화)하고 같은 이름의 중복 항목을 제거합니다.
+# - 정규화된 내용의 해시를 버전 ID로 사용합니다. (같은 기준이면 어느 대회든 같은 ID → AI 채점 캐시 키)
+# - 버전별 기준은 standard/versions/<ID>.json 에 한 번만 저장하고, standard/<대회명>.json 은 내용이 바뀔 때만 다시 씁니다.
+# - 대회별 파일은 수정 시각(mtime)이 바뀐 경우에만 다시 읽는 메모리 색인으로 조회합니다.
+VERSIONS_DIR = STANDARD_DIR / "versions"
+VERSION_ID_LENGTH = 12
+
+_lock = threading.Lock()
+_index = {}     # 대회 파일명(safe_name) -> {"competition", "criteria_id", "criteria", "mtime_ns"}
+_versions = {}  # 버전 ID -> 정규화된 기준 목록
+
+
+def safe_competition_name(competition_name: str) -> str:
+    """json_helpers 와 같은 규칙으로 대회명을 파일명으로 바꿉니다."""
+    return re.sub(r'[\\/*?:"<>|]', '', competition_name).replace(" ", "_") or "default_criteria"
+
+
+def normalize_criteria(criteria: list) -> list:
+    """
+    기준 항목을 {"name", "score", "description"} 형태로 정리하고, 같은 이름(공백 무시)의 중복 항목은 첫 항목만 남깁니다.
+    이름이 없는 항목은 버립니다.
+    """
+    normalized = []
+    seen = set()
+    for item in criteria or []:
+        if not isinstance(item, dict):
+            continue
+        name = " ".join(str(item.get("name", "")).split())
+        if not name or name.replace(" ", "") in seen:
+            continue
+        try:
+            score = int(round(float(item.get("score", 0) or 0)))
+        except (TypeError, ValueError):
+            score = 0
+        normalized.append({"name": name, "score": score,
+                           "description": " ".join(str(item.get("description", "") or "").split())})
+        seen.add(name.replace(" ", ""))
+    return normalized
+
+
+def criteria_version_id(criteria: list) -> str:
+    """정규화된 기준 목록의 내용 해시 (항목 순서 포함)"""
+    canonical = json.dumps(normalize_criteria(criteria), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:VERSION_ID_LENGTH]
+
+
+def _write_json(path: Path, data):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, path)
+
+
+def _refresh_index():
+    """standard/*.json 중 새로 생겼거나 수정된 파일만 다시 읽고, 지워진 파일은 색인에서 뺍니다. (_lock 안에서 호출)"""
+    present = set()
+    try:
+        entries = list(os.scandir(STANDARD_DIR))
+    except FileNotFoundError:
+        entries = []
+    for entry in entries:
+        if not entry.is_file() or not entry.name.endswith(".json") or entry.name.startswith("."):
+            continue
+        safe_name = entry.name[:-len(".json")]
+        present.add(safe_name)
+        mtime_ns = entry.stat().st_mtime_ns
+        cached = _index.get(safe_name)
+        if cached and cached["mtime_ns"] == mtime_ns:
+            continue
+        try:
+            with open(entry.path, encoding="utf-8") as f:
+                criteria = normalize_criteria(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"   > [Criteria] ⚠️ 기준 파일 로드 오류 ({entry.name}): {e}")
+            continue
+        criteria_id = criteria_version_id(criteria)
+        _versions.setdefault(criteria_id, criteria)
+        _index[safe_name] = {"competition": safe_name, "criteria_id": criteria_id,
+                             "criteria": criteria, "mtime_ns": mtime_ns}
+    for safe_name in set(_index) - present:
+        del _index[safe_name]
+
+
+def register_criteria(criteria: list, competition_name: str = None) -> tuple:
+    """
+    기준 목록을 정규화해 버전으로 등록합니다. competition_name이 있으면 대회 기준 파일도 갱신합니다.
+    (내용이 같으면 파일을 다시 쓰지 않음)  반환값: (버전 ID, 정규화된 기준 목록)
+    """
+    normalized = normalize_criteria(criteria)
+    criteria_id = criteria_version_id(normalized)
+    with _lock:
+        _versions.setdefault(criteria_id, normalized)
+        os.makedirs(VERSIONS_DIR, exist_ok=True)
+        version_path = VERSIONS_DIR / f"{criteria_id}.json"
+        if not version_path.exists():
+            _write_json(version_path, normalized)
+
+        if competition_name:
+            _refresh_index()
+            safe_name = safe_competition_name(competition_name)
+            current = _index.get(safe_name)
+            if not current or current["criteria_id"] != criteria_id:
+                _write_json(STANDARD_DIR / f"{safe_name}.json", normalized)
+                _refresh_index()
+                print(f"   > [Criteria] ✅ 채점 기준 '{safe_name}' 저장 (버전 {criteria_id})")
+    return criteria_id, normalized
+
+
+def list_competitions() -> list:
+    """대회별 현재 기준 버전 목록"""
+    with _lock:
+        _refresh_index()
+        return [{"competition": e["competition"], "criteria_id": e["criteria_id"], "count": len(e["criteria"])}
+                for e in sorted(_index.values(), key=lambda e: e["competition"])]
+
+
+def get_criteria(criteria_id_or_competition: str):
+    """
+    버전 ID 또는 대회명으로 기준을 찾습니다. 반환값: (버전 ID, 기준 목록) 또는 찾지 못하면 None
+    """
+    key = criteria_id_or_competition.strip()
+    with _lock:
+        _refresh_index()
+        if key in _versions:
+            return key, _versions[key]
+        entry = _index.get(safe_competition_name(key))
+        if entry:
+            return entry["criteria_id"], entry["criteria"]
+        # 대회 파일이 바뀌어 색인에 없는 예전 버전
+        if re.fullmatch(r"[0-9a-f]{%d}" % VERSION_ID_LENGTH, key):
+            version_path = VERSIONS_DIR / f"{key}.json"
+            if version_path.exists():
+                with version_path.open(encoding="utf-8") as f:
+                    _versions[key] = normalize_criteria(json.load(f))
+                return key, _versions[key]
+    return None
+
+
+def competitions_using(criteria_id: str) -> list:
+    with _lock:
+        return sorted(e["competition"] for e in _index.values() if e["criteria_id"] == criteria_id)
@@ -1,9 +1,9 @@
 # [재구성 파일] utils/helpers.py
 import os
 import shutil
-import uuid
 from pathlib import Path
 from fastapi import UploadFile
+from utils.scratch import create_session, setup_scratch_roots
 
 # 프로젝트 루트 디렉토리를 기준으로 경로 설정
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -16,20 +16,16 @@ def setup_temp_dirs():
     os.makedirs(UPLOAD_DIR, exist_ok=True)
     os.makedirs(FRAME_DIR, exist_ok=True)
     # ⭐️ [수정] JSON 폴더 생성 로직은 json_helpers.py의 setup_json_dirs로 이동
+    setup_scratch_roots()  # ⭐️ [수정] 임시 저장소 루트(디스크/RAM) 준비 (utils/scratch.py)
 
-def create_session_dirs():
+def create_session_dirs(expected_bytes: int = None):
     """
     각 요청마다 고유한 임시 폴더를 생성합니다.
     동시에 여러 요청이 들어와도 파일이 섞이지 않게 합니다.
+    ⭐️ [수정] utils/scratch.py 임시 저장소 사용: 업로드 크기(expected_bytes)로 RAM/디스크 루트 선택,
+    공간이 부족하면 ScratchSpaceError
     """
-    session_id = str(uuid.uuid4())
-    video_dir = UPLOAD_DIR / session_id
-    frame_session_dir = FRAME_DIR / session_id
-
-    os.makedirs(video_dir, exist_ok=True)
-    os.makedirs(frame_session_dir, exist_ok=True)
-    
-    return video_dir, frame_session_dir
+    return create_session(expected_bytes)
 
 def save_upload_file(upload_file: UploadFile, destination: Path) -> Path:
     """업로드된 파일을 지정된 경로에 저장합니다."""
@@ -0,0 +1,32 @@
+# [신규 파일] utils/job_store.py
+import json
+import os
+from pathlib import Path
+
+# ⭐️ 작업별 결과/산출물 보관 폴더 (jobs/<job_id>/result.json, report.pdf ...)
+# job_status 는 /status 조회 후 비워지므로, 나중에 다시 받아야 하는 결과는 여기에 남깁니다.
+BASE = Path(__file__).resolve().parent.parent
+JOB_DIR = BASE / "jobs"
+
+
+def get_job_dir(job_id: str) -> Path:
+    job_dir = JOB_DIR / job_id
+    os.makedirs(job_dir, exist_ok=True)
+    return job_dir
+
+
+def save_job_result(job_id: str, result: dict) -> Path:
+    """분석 결과를 result.json 으로 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+    path = get_job_dir(job_id) / "result.json"
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def get_job_artifact(job_id: str, name: str):
+    """작업 산출물 경로를 반환합니다. 없거나 작업 폴더 밖을 가리키면 None."""
+    path = (JOB_DIR / job_id / name).resolve()
+    if JOB_DIR.resolve() not in path.parents or not path.is_file():
+        return None
+    return path
@@ -1,7 +1,5 @@
 # [신규 파일] processing/json_helpers.py
-import json
 import os
-import re
 from pathlib import Path
 
 # ⭐️ JSON 기준 저장 디렉토리
@@ -14,35 +12,21 @@ def setup_json_dirs():
 def save_criteria_json(criteria: list, competition_name: str):
     """
     사용자 정의 채점 기준을 competition_name을 파일명으로 JSON 파일에 저장합니다.
+    ⭐️ [수정] criteria_registry 로 정규화/중복 제거 후, 내용이 바뀐 경우에만 저장합니다. (버전 ID 반환)
     """
-    # 파일명으로 사용할 수 없는 문자 제거 및 공백을 언더바로 변환
-    safe_name = re.sub(r'[\\/*?:"<>|]', '', competition_name).replace(" ", "_")
-    if not safe_name:
-        safe_name = "default_criteria"
-        
-    file_name = f"{safe_name}.json"
-    file_path = STANDARD_DIR / file_name
-    
+    from utils.criteria_registry import register_criteria  # criteria_registry가 이 모듈을 임포트하므로 함수 안에서
     try:
-        with file_path.open("w", encoding="utf-8") as f:
-            json.dump(criteria, f, ensure_ascii=False, indent=4)
-        print(f"   > [JSON Save] ✅ 채점 기준이 '{file_name}'으로 저장되었습니다.")
+        criteria_id, _ = register_criteria(criteria, competition_name)
+        return criteria_id
     except Exception as e:
         print(f"   > [JSON Save] ❌ 채점 기준 JSON 저장 실패: {e}")
-        
+        return None
+
 def load_criteria_json(competition_name: str) -> list:
     """
     competition_name에 해당하는 JSON 파일을 로드하여 기준 목록을 반환합니다.
+    ⭐️ [수정] criteria_registry 의 메모리 색인 사용 (파일이 수정된 경우에만 다시 읽음)
     """
-    safe_name = re.sub(r'[\\/*?:"<>|]', '', competition_name).replace(" ", "_")
-    file_name = f"{safe_name}.json"
-    file_path = STANDARD_DIR / file_name
-    
-    if file_path.exists():
-        try:
-            with file_path.open("r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"   > [JSON Load] ⚠️ JSON 파일 로드 오류 ({file_name}): {e}")
-            return []
-    return []
\ No newline at end of file
+    from utils.criteria_registry import get_criteria
+    found = get_criteria(competition_name)
+    return list(found[1]) if found else []
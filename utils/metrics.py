@@ -0,0 +1,194 @@
+# [신규 파일] utils/metrics.py
+import threading
+import time
+from contextlib import contextmanager
+
+# ⭐️ Prometheus 텍스트 포맷(/metrics)으로 내보낼 카운터/게이지/히스토그램
+# (외부 라이브러리 없이 프로세스 내부 dict로 관리합니다)
+
+SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+RATIO_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10)
+FPS_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 100, 200)
+BYTES_BUCKETS = (1e6, 5e6, 10e6, 50e6, 100e6, 250e6, 500e6, 1e9, 2e9)
+
+_lock = threading.Lock()
+_definitions = {}  # 메트릭 이름 -> (종류, 설명, 버킷)
+_values = {}       # (메트릭 이름, 라벨 튜플) -> 값 (히스토그램은 [버킷별 개수, 합계, 개수])
+
+
+def define_metric(name: str, kind: str, help_text: str, buckets: tuple = None):
+    """메트릭을 등록합니다. kind는 'counter', 'gauge', 'histogram' 중 하나입니다."""
+    if kind == "histogram" and not buckets:
+        buckets = SECONDS_BUCKETS
+    _definitions[name] = (kind, help_text, buckets)
+
+
+# --- 파이프라인 전반에서 사용하는 메트릭 정의 ---
+define_metric("analysis_stage_seconds", "histogram", "분석 단계별 실행 시간(wall clock, 초)")
+define_metric("analysis_stage_cpu_seconds", "histogram", "분석 단계별 작업 스레드 CPU 시간(초)")
+define_metric("analysis_job_seconds", "histogram", "분석 작업 전체 실행 시간(초)")
+define_metric("analysis_queue_wait_seconds", "histogram", "작업 접수부터 실행 시작까지 대기 시간(초)")
+define_metric("analysis_jobs_total", "counter", "종료된 분석 작업 수")
+define_metric("analysis_jobs_in_progress", "gauge", "현재 실행 중인 분석 작업 수")
+define_metric("analysis_queue_depth", "gauge", "실행 슬롯을 기다리는 분석 작업 수")
+define_metric("analysis_profile_selected_total", "counter", "작업에 적용된 분석 프로필 수")
+define_metric("face_analysis_fps", "histogram", "작업별 얼굴 분석 처리 속도(프레임/초)", FPS_BUCKETS)
+define_metric("face_frames_total", "counter", "분석한 프레임 수 (얼굴 검출 여부별)")
+define_metric("asr_real_time_factor", "histogram", "음성 인식 실시간 배율(처리 시간 / 오디오 길이)", RATIO_BUCKETS)
+define_metric("asr_audio_seconds_total", "counter", "음성 인식에 투입된 오디오 길이 합계(초)")
+define_metric("ffmpeg_seconds", "histogram", "FFmpeg 하위 프로세스 실행 시간(초)")
+define_metric("llm_request_seconds", "histogram", "OpenAI API 호출 지연 시간(초)")
+define_metric("llm_tokens_total", "counter", "OpenAI API 사용 토큰 수")
+define_metric("llm_score_cache_total", "counter", "AI 채점 결과 캐시 조회 수 (hit/miss)")
+define_metric("upload_bytes_total", "counter", "업로드된 영상 바이트 합계")
+define_metric("upload_size_bytes", "histogram", "업로드된 영상 크기 분포(바이트)", BYTES_BUCKETS)
+define_metric("worker_memory_bytes", "gauge", "분석 워커 프로세스 메모리 (rss/pss/shared/private)")
+define_metric("worker_restarts_total", "counter", "분석 워커 프로세스 재시작 횟수")
+define_metric("scratch_used_bytes", "gauge", "임시 저장소 루트별 세션 폴더 사용량(바이트)")
+define_metric("scratch_free_bytes", "gauge", "임시 저장소 루트별 여유 공간(바이트)")
+define_metric("scratch_sessions", "gauge", "임시 저장소 루트별 진행 중인 세션 수")
+define_metric("scratch_sessions_reclaimed_total", "counter", "정리 스레드가 지운 세션 폴더 수 (사유별)")
+define_metric("scratch_reclaimed_bytes_total", "counter", "정리 스레드가 회수한 임시 저장소 용량(바이트)")
+define_metric("scratch_admission_rejected_total", "counter", "임시 저장 공간 부족으로 거절한 작업 수")
+define_metric("live_sessions", "gauge", "실시간 리허설(WebSocket) 연결 수")
+define_metric("live_frames_total", "counter", "실시간 리허설 카메라 프레임 수 (분석/버림/잘못된 시각)")
+define_metric("live_indicator_latency_seconds", "histogram", "프레임 수신부터 실시간 지표 전송까지 지연 시간(초)")
+define_metric("live_audio_dropped_seconds_total", "counter", "실시간 리허설 음성 인식이 밀려 버린 오디오 길이(초)")
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc_counter(name: str, value: float = 1, **labels):
+    key = (name, _label_key(labels))
+    with _lock:
+        _values[key] = _values.get(key, 0) + value
+
+
+def set_gauge(name: str, value: float, **labels):
+    with _lock:
+        _values[(name, _label_key(labels))] = value
+
+
+def add_gauge(name: str, delta: float, **labels):
+    inc_counter(name, delta, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    buckets = _definitions[name][2]
+    key = (name, _label_key(labels))
+    with _lock:
+        hist = _values.get(key)
+        if hist is None:
+            hist = _values[key] = [[0] * len(buckets), 0.0, 0]
+        for i, upper in enumerate(buckets):
+            if value <= upper:
+                hist[0][i] += 1
+        hist[1] += value
+        hist[2] += 1
+
+
+def export_and_reset() -> dict:
+    """
+    지금까지 기록된 값을 내보내고 0으로 초기화합니다.
+    (워커 프로세스가 기록한 메트릭을 메인 프로세스로 옮길 때 사용)
+    """
+    global _values
+    with _lock:
+        exported, _values = _values, {}
+    return exported
+
+
+def merge_exported(exported: dict):
+    """export_and_reset()으로 받은 값을 현재 프로세스의 메트릭에 더합니다."""
+    with _lock:
+        for key, value in exported.items():
+            current = _values.get(key)
+            if isinstance(value, list):
+                if current is None:
+                    _values[key] = [list(value[0]), value[1], value[2]]
+                else:
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+                    current[2] += value[2]
+            else:
+                _values[key] = (current or 0) + value
+
+
+def _format_labels(label_items) -> str:
+    if not label_items:
+        return ""
+    body = ",".join(f'{k}="{v}"' for k, v in label_items)
+    return "{" + body + "}"
+
+
+def _format_number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def render_metrics() -> str:
+    """등록된 모든 메트릭을 Prometheus 텍스트 포맷 문자열로 변환합니다."""
+    with _lock:
+        snapshot = {key: ([list(v[0]), v[1], v[2]] if isinstance(v, list) else v) for key, v in _values.items()}
+
+    lines = []
+    for name, (kind, help_text, buckets) in _definitions.items():
+        series = sorted((labels, v) for (n, labels), v in snapshot.items() if n == name)
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in series:
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+                continue
+            counts, total, count = value
+            for upper, bucket_count in zip(buckets, counts):
+                le = _format_number(float(upper))
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {bucket_count}")
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {round(total, 6)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+class JobTimings:
+    """
+    분석 작업 하나의 단계별 wall/CPU 시간을 기록합니다.
+    기록과 동시에 analysis_stage_* 히스토그램에도 반영됩니다.
+    """
+
+    def __init__(self, queue_wait_sec: float = 0.0):
+        self.queue_wait_sec = queue_wait_sec
+        self.stages = {}
+        self.extra = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            # 같은 단계가 여러 번 실행되면 (구간 단위 처리) 시간을 누적
+            previous = self.stages.get(name, {"wall_sec": 0.0, "cpu_sec": 0.0})
+            self.stages[name] = {"wall_sec": round(previous["wall_sec"] + wall, 3),
+                                 "cpu_sec": round(previous["cpu_sec"] + cpu, 3)}
+            observe("analysis_stage_seconds", wall, stage=name)
+            observe("analysis_stage_cpu_seconds", cpu, stage=name)
+
+    def wall(self, name: str) -> float:
+        return self.stages.get(name, {}).get("wall_sec", 0.0)
+
+    def summary(self) -> dict:
+        """analysis_summary에 첨부할 작업별 시간 분석 결과"""
+        return {
+            "queue_wait_sec": round(self.queue_wait_sec, 3),
+            "total_wall_sec": round(time.perf_counter() - self._started, 3),
+            "stages": dict(self.stages),
+            **self.extra,
+        }
@@ -0,0 +1,138 @@
+# [신규 파일] utils/profiler.py
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# ⭐️ 작업(job) 단위 프로파일링
+# 요청 플래그 또는 관리자 API로 켠 작업에서만 동작하며, 일반 작업에는 오버헤드가 없습니다.
+PROFILE_DIR = Path(__file__).resolve().parent.parent / "profiles"
+SAMPLE_INTERVAL_SEC = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+
+# 다운로드 가능한 산출물 (파일명 -> MIME 타입)
+PROFILE_ARTIFACTS = {
+    "stacks.collapsed": "text/plain",        # flamegraph.pl / speedscope 호환 collapsed stack
+    "cprofile.pstats": "application/octet-stream",  # python -m pstats / snakeviz 로 열 수 있는 덤프
+    "functions.txt": "text/plain",           # 누적 시간 기준 상위 함수 목록
+    "subprocesses.json": "application/json", # FFmpeg 등 하위 프로세스 실행 시간
+}
+
+_local = threading.local()
+_pending_lock = threading.Lock()
+_pending_profiles = 0
+
+
+def request_profiling_for_next_jobs(count: int) -> int:
+    """관리자 API: 다음에 접수되는 count개의 작업을 프로파일링하도록 예약합니다."""
+    global _pending_profiles
+    with _pending_lock:
+        _pending_profiles = max(0, count)
+        return _pending_profiles
+
+
+def should_profile_job(requested: bool) -> bool:
+    """요청 플래그가 켜져 있거나 관리자 예약이 남아 있으면 True를 반환합니다."""
+    global _pending_profiles
+    if requested:
+        return True
+    with _pending_lock:
+        if _pending_profiles > 0:
+            _pending_profiles -= 1
+            return True
+    return False
+
+
+def record_subprocess(args: list, elapsed: float, returncode):
+    """현재 스레드에서 프로파일링 중인 작업이 있으면 하위 프로세스 실행 기록을 남깁니다."""
+    profiler = getattr(_local, "profiler", None)
+    if profiler is not None:
+        profiler.subprocesses.append({
+            "command": [str(a) for a in args],
+            "elapsed_sec": round(elapsed, 4),
+            "returncode": returncode,
+            "offset_sec": round(time.perf_counter() - profiler.started, 4),
+        })
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class JobProfiler:
+    """
+    작업 스레드 하나에 대해 cProfile(함수별 시간)과 샘플링 스택 프로파일을 동시에 기록합니다.
+    start()/stop()은 반드시 같은 작업 스레드에서 호출해야 합니다.
+    """
+
+    def __init__(self, job_id: str, interval: float = SAMPLE_INTERVAL_SEC):
+        self.job_id = job_id
+        self.interval = interval
+        self.output_dir = PROFILE_DIR / job_id
+        self.subprocesses = []
+        self.samples = Counter()
+        self.started = 0.0
+        self._profile = cProfile.Profile()
+        self._stop_event = threading.Event()
+        self._sampler = None
+        self._thread_id = None
+
+    def _sample_loop(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread_id = threading.get_ident()
+        _local.profiler = self
+        self._sampler = threading.Thread(target=self._sample_loop, name=f"profiler-{self.job_id}", daemon=True)
+        self._sampler.start()
+        self._profile.enable()
+        print(f"   > [Profile] 작업 프로파일링 시작 (Job: {self.job_id})")
+
+    def stop(self) -> Path:
+        self._profile.disable()
+        self._stop_event.set()
+        self._sampler.join()
+        _local.profiler = None
+        elapsed = time.perf_counter() - self.started
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        with (self.output_dir / "stacks.collapsed").open("w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        self._profile.dump_stats(str(self.output_dir / "cprofile.pstats"))
+
+        report = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=report)
+        stats.sort_stats("cumulative").print_stats(60)
+        with (self.output_dir / "functions.txt").open("w", encoding="utf-8") as f:
+            f.write(f"Job: {self.job_id}\nWall time: {elapsed:.3f}s, samples: {sum(self.samples.values())}\n\n")
+            f.write(report.getvalue())
+
+        with (self.output_dir / "subprocesses.json").open("w", encoding="utf-8") as f:
+            json.dump(self.subprocesses, f, ensure_ascii=False, indent=2)
+
+        print(f"   > [Profile] ✅ 프로파일 저장 완료: {self.output_dir}")
+        return self.output_dir
+
+
+def get_profile_artifact(job_id: str, artifact: str):
+    """저장된 프로파일 산출물의 경로를 반환합니다. 없으면 None을 반환합니다."""
+    if artifact not in PROFILE_ARTIFACTS or Path(job_id).name != job_id:
+        return None
+    path = PROFILE_DIR / job_id / artifact
+    return path if path.exists() else None
@@ -0,0 +1,340 @@
+# [신규 파일] utils/scratch.py
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from utils.metrics import set_gauge, inc_counter
+
+# ⭐️ 작업용 임시 저장소 (업로드 영상, 추출 프레임/오디오)
+# - 루트는 두 종류: 디스크(SCRATCH_DISK_ROOT, 기본값은 프로젝트 폴더 → 기존 uploads/, frames/ 그대로)
+#   와 RAM(tmpfs, SCRATCH_RAM_ROOT). 예상 사용량이 작은 작업만 RAM 루트를 사용합니다.
+# - 세션을 만들 때 예상 사용량만큼 여유 공간이 없으면 ScratchSpaceError (작업 접수 거절)
+# - 세션마다 <루트>/.sessions/<세션ID>.json 표식을 남기고, 정리 스레드(janitor)가 서버 시작 시와 주기적으로
+#   만료되었거나 주인 프로세스가 사라진 세션 폴더를 지웁니다. (비정상 종료 후 남은 수 GB 폴더 회수)
+# - 주인 프로세스는 PID만으로 판단하지 않습니다. 컨테이너 재시작 후에는 같은 PID(보통 1)를 다시 받으므로,
+#   프로세스마다 만든 인스턴스 ID와 /proc/<pid>/stat 의 프로세스 시작 시각을 함께 기록해 비교합니다.
+# - 구간 처리 중간 결과(partials/<작업ID>)도 주인이 사라졌으면 지우고,
+#   작업 결과(jobs/<작업ID>: result.json, report.pdf)는 SCRATCH_JOB_RESULT_TTL_SEC 가 지나면 지웁니다.
+# - 작업 프로파일(profiles/<작업ID>)은 같은 보관 기간이 지났거나 최근 SCRATCH_PROFILE_MAX_COUNT 개를 넘으면 지웁니다.
+BASE_DIR = Path(__file__).resolve().parent.parent
+PARTIAL_DIR = BASE_DIR / "partials"
+SCRATCH_DISK_ROOT = Path(os.getenv("SCRATCH_DISK_ROOT", str(BASE_DIR)))
+_ram_root = os.getenv("SCRATCH_RAM_ROOT", "/dev/shm/presentation-scratch" if os.path.isdir("/dev/shm") else "")
+SCRATCH_RAM_ROOT = Path(_ram_root) if _ram_root else None  # 빈 문자열이면 RAM 루트 사용 안 함
+
+SCRATCH_RAM_MAX_UPLOAD_BYTES = int(os.getenv("SCRATCH_RAM_MAX_UPLOAD_BYTES", str(100 * 1024 ** 2)))
+SCRATCH_RAM_RESERVE_BYTES = int(os.getenv("SCRATCH_RAM_RESERVE_BYTES", str(1024 ** 3)))    # tmpfs에 항상 남길 공간
+SCRATCH_DISK_RESERVE_BYTES = int(os.getenv("SCRATCH_DISK_RESERVE_BYTES", str(2 * 1024 ** 3)))
+SCRATCH_EXPANSION = float(os.getenv("SCRATCH_EXPANSION", "2.5"))  # 업로드 크기 대비 예상 사용량 (영상 + 프레임 + WAV)
+SCRATCH_SESSION_TTL_SEC = float(os.getenv("SCRATCH_SESSION_TTL_SEC", str(12 * 3600)))
+SCRATCH_ORPHAN_GRACE_SEC = float(os.getenv("SCRATCH_ORPHAN_GRACE_SEC", "600"))  # 표식 없는 폴더를 지우기 전 대기 시간
+SCRATCH_JANITOR_INTERVAL_SEC = float(os.getenv("SCRATCH_JANITOR_INTERVAL_SEC", "600"))
+SCRATCH_JOB_RESULT_TTL_SEC = float(os.getenv("SCRATCH_JOB_RESULT_TTL_SEC", str(7 * 24 * 3600)))  # 0이면 보관
+SCRATCH_PROFILE_MAX_COUNT = int(os.getenv("SCRATCH_PROFILE_MAX_COUNT", "50"))  # 0이면 개수 제한 없음
+
+SESSION_SUBDIRS = ("uploads", "frames")
+MARKER_DIR_NAME = ".sessions"
+_SESSION_NAME = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+
+_lock = threading.Lock()
+_reserved = {}  # 세션ID -> (루트 종류, 예상 사용량) : 아직 다 쓰지 않은 공간을 중복으로 내주지 않도록
+_janitor = {"thread": None, "stop": threading.Event()}
+INSTANCE_ID = uuid.uuid4().hex  # 이 프로세스(서버 실행)마다 새로 만듦
+
+
+class ScratchSpaceError(RuntimeError):
+    """작업에 필요한 임시 저장 공간이 부족할 때 발생합니다."""
+
+
+def _roots() -> dict:
+    roots = {"disk": SCRATCH_DISK_ROOT}
+    if SCRATCH_RAM_ROOT:
+        roots["ram"] = SCRATCH_RAM_ROOT
+    return roots
+
+
+def setup_scratch_roots():
+    """서버 시작 시 루트별 uploads/, frames/, .sessions/ 폴더를 만듭니다. RAM 루트를 못 쓰면 끕니다."""
+    global SCRATCH_RAM_ROOT
+    for kind, root in _roots().items():
+        try:
+            for name in SESSION_SUBDIRS + (MARKER_DIR_NAME,):
+                os.makedirs(root / name, exist_ok=True)
+        except OSError as e:
+            if kind == "disk":
+                raise
+            print(f"   > [Scratch] ⚠️ RAM 임시 저장소 사용 불가 ({root}): {e}")
+            SCRATCH_RAM_ROOT = None
+
+
+def _free_bytes(root: Path) -> int:
+    while not root.exists() and root.parent != root:
+        root = root.parent  # 아직 만들지 않은 루트는 상위 폴더가 있는 파일 시스템 기준
+    try:
+        usage = shutil.disk_usage(root)
+    except OSError:
+        return 0
+    return usage.free
+
+
+def _reserved_bytes(kind: str) -> int:
+    """이 프로세스가 내준 세션 중 아직 폴더가 남아 있는 세션의 예상 사용량 합계 (_lock 안에서 호출)"""
+    for session_id, (root_kind, _) in list(_reserved.items()):
+        if not (_roots().get(root_kind, SCRATCH_DISK_ROOT) / "uploads" / session_id).exists():
+            del _reserved[session_id]
+    return sum(need for root_kind, need in _reserved.values() if root_kind == kind)
+
+
+def choose_root(expected_bytes: int = None):
+    """
+    업로드 크기로 루트를 고르고, 여유 공간을 확인합니다. 반환값: (루트 종류, 루트 경로, 예상 사용량)
+    크기를 모르면 디스크 루트를 사용합니다.
+    """
+    need = int((expected_bytes or 0) * SCRATCH_EXPANSION)
+    roots = _roots()
+    if "ram" in roots and expected_bytes and expected_bytes <= SCRATCH_RAM_MAX_UPLOAD_BYTES:
+        if _free_bytes(roots["ram"]) - _reserved_bytes("ram") - need >= SCRATCH_RAM_RESERVE_BYTES:
+            return "ram", roots["ram"], need
+    free = _free_bytes(roots["disk"]) - _reserved_bytes("disk")
+    if free - need < SCRATCH_DISK_RESERVE_BYTES:
+        inc_counter("scratch_admission_rejected_total")
+        raise ScratchSpaceError(
+            f"임시 저장 공간이 부족합니다. (필요 약 {need / 1024 ** 2:.0f}MB, 여유 {max(free, 0) / 1024 ** 2:.0f}MB, "
+            f"최소 유지 {SCRATCH_DISK_RESERVE_BYTES / 1024 ** 2:.0f}MB)")
+    return "disk", roots["disk"], need
+
+
+def _process_start_time(pid: int):
+    """/proc/<pid>/stat 의 프로세스 시작 시각(부팅 후 clock tick) 또는 읽을 수 없으면 None"""
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii", errors="replace") as f:
+            # 두 번째 필드(실행 파일 이름)에 공백/괄호가 있을 수 있으므로 마지막 ')' 뒤부터 셈 (22번째 필드)
+            return int(f.read().rsplit(")", 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def owner_info() -> dict:
+    """표식에 기록할 현재 프로세스 정보"""
+    return {"instance": INSTANCE_ID, "pid": os.getpid(), "proc_start": _process_start_time(os.getpid())}
+
+
+def owner_alive(owner: dict) -> bool:
+    """owner_info() 로 기록한 프로세스가 아직 살아 있는지 (PID가 재사용된 경우는 죽은 것으로 판단)"""
+    pid = owner.get("pid", 0)
+    if pid == os.getpid():
+        return owner.get("instance") == INSTANCE_ID
+    if not _pid_alive(pid):
+        return False
+    recorded, current = owner.get("proc_start"), _process_start_time(pid)
+    return recorded is None or current is None or recorded == current
+
+
+def create_session(expected_bytes: int = None):
+    """
+    세션 폴더(uploads/<ID>, frames/<ID>)와 표식 파일을 만듭니다.
+    반환값: (video_dir, frame_dir)  공간이 부족하면 ScratchSpaceError
+    """
+    session_id = str(uuid.uuid4())
+    with _lock:
+        kind, root, need = choose_root(expected_bytes)
+        video_dir = root / "uploads" / session_id
+        frame_dir = root / "frames" / session_id
+        # 예약과 폴더 생성을 같은 잠금 안에서 (폴더가 없으면 _reserved_bytes()가 끝난 세션으로 보고 예약을 지움)
+        os.makedirs(video_dir, exist_ok=True)
+        os.makedirs(frame_dir, exist_ok=True)
+        _reserved[session_id] = (kind, need)
+    marker = {"session_id": session_id, "root": kind, **owner_info(), "created_at": time.time(),
+              "expected_bytes": need, "dirs": [str(video_dir), str(frame_dir)]}
+    # 폴더를 먼저 만들고 표식을 씀 (표식만 있고 폴더가 없으면 정리 스레드가 끝난 세션으로 보고 표식을 지움)
+    marker_path = root / MARKER_DIR_NAME / f"{session_id}.json"
+    os.makedirs(marker_path.parent, exist_ok=True)
+    tmp_path = marker_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(marker), encoding="utf-8")
+    os.replace(tmp_path, marker_path)
+    set_gauge("scratch_free_bytes", _free_bytes(root), root=kind)
+    return video_dir, frame_dir
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _reclaim(paths: list, reason: str, kind: str) -> int:
+    reclaimed = 0
+    for path in paths:
+        if os.path.isdir(path):
+            reclaimed += _dir_size(path)
+            shutil.rmtree(path, ignore_errors=True)
+    inc_counter("scratch_sessions_reclaimed_total", root=kind, reason=reason)
+    inc_counter("scratch_reclaimed_bytes_total", reclaimed, root=kind)
+    return reclaimed
+
+
+def sweep_scratch() -> dict:
+    """
+    루트별로 한 번 정리합니다.
+    - 폴더가 이미 지워진 세션(정상 종료)의 표식 삭제
+    - 주인 프로세스가 사라졌거나 SCRATCH_SESSION_TTL_SEC 가 지난 세션 폴더 삭제
+    - 표식 없이 SCRATCH_ORPHAN_GRACE_SEC 이상 지난 세션 폴더 삭제 (이 관리자 도입 전에 남은 폴더 등)
+    사용량 메트릭도 함께 갱신합니다. 반환값: 루트별 통계
+    """
+    now = time.time()
+    stats = {}
+    for kind, root in _roots().items():
+        marker_dir = root / MARKER_DIR_NAME
+        sessions = reclaimed = reclaimed_bytes = 0
+        marked = set()
+        for marker_path in marker_dir.glob("*.json") if marker_dir.is_dir() else []:
+            try:
+                marker = json.loads(marker_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                marker_path.unlink(missing_ok=True)
+                continue
+            marked.add(marker["session_id"])
+            dirs = [d for d in marker.get("dirs", []) if os.path.isdir(d)]
+            if not dirs:
+                marker_path.unlink(missing_ok=True)
+                continue
+            if not owner_alive(marker):
+                reason = "orphaned"
+            elif now - marker.get("created_at", now) > SCRATCH_SESSION_TTL_SEC:
+                reason = "expired"
+            else:
+                sessions += 1
+                continue
+            reclaimed_bytes += _reclaim(dirs, reason, kind)
+            reclaimed += 1
+            marker_path.unlink(missing_ok=True)
+
+        for subdir in SESSION_SUBDIRS:
+            parent = root / subdir
+            for entry in os.scandir(parent) if parent.is_dir() else []:
+                if (entry.is_dir() and _SESSION_NAME.match(entry.name) and entry.name not in marked
+                        and now - entry.stat().st_mtime > SCRATCH_ORPHAN_GRACE_SEC):
+                    reclaimed_bytes += _reclaim([entry.path], "unmarked", kind)
+                    reclaimed += 1
+
+        used = sum(_dir_size(root / subdir) for subdir in SESSION_SUBDIRS)
+        set_gauge("scratch_used_bytes", used, root=kind)
+        set_gauge("scratch_free_bytes", _free_bytes(root), root=kind)
+        set_gauge("scratch_sessions", sessions, root=kind)
+        stats[kind] = {"root": str(root), "sessions": sessions, "used_bytes": used, "free_bytes": _free_bytes(root),
+                       "reclaimed_sessions": reclaimed, "reclaimed_bytes": reclaimed_bytes}
+        if reclaimed:
+            print(f"   > [Scratch] 🧹 {kind} 임시 폴더 {reclaimed}개 정리 ({reclaimed_bytes / 1024 ** 2:.1f}MB)")
+    stats["partials"] = _sweep_partials(now)
+    stats["jobs"] = _sweep_job_results(now)
+    stats["profiles"] = _sweep_profiles(now)
+    return stats
+
+
+def _sweep_partials(now: float) -> dict:
+    """
+    partials/<작업ID>: 작업이 끝나면 파이프라인이 지우므로, 남아 있는 것은 진행 중이거나 비정상 종료된 작업.
+    progress.json 의 owner(owner_info)가 사라졌으면 지우고, owner가 없으면 SCRATCH_ORPHAN_GRACE_SEC 후 지웁니다.
+    """
+    reclaimed = reclaimed_bytes = 0
+    for entry in os.scandir(PARTIAL_DIR) if PARTIAL_DIR.is_dir() else []:
+        if not entry.is_dir() or not _SESSION_NAME.match(entry.name):
+            continue
+        try:
+            owner = json.loads(Path(entry.path, "progress.json").read_text(encoding="utf-8")).get("owner")
+        except (OSError, ValueError):
+            owner = None
+        if owner:
+            if owner_alive(owner):
+                continue
+            reason = "orphaned"
+        elif now - entry.stat().st_mtime > SCRATCH_ORPHAN_GRACE_SEC:
+            reason = "unmarked"
+        else:
+            continue
+        reclaimed_bytes += _reclaim([entry.path], reason, "partials")
+        reclaimed += 1
+    if reclaimed:
+        print(f"   > [Scratch] 🧹 중간 결과 폴더 {reclaimed}개 정리 ({reclaimed_bytes / 1024 ** 2:.1f}MB)")
+    return {"root": str(PARTIAL_DIR), "reclaimed_sessions": reclaimed, "reclaimed_bytes": reclaimed_bytes}
+
+
+def _sweep_job_results(now: float) -> dict:
+    """jobs/<작업ID>: 마지막 수정 후 SCRATCH_JOB_RESULT_TTL_SEC 가 지난 작업 결과를 지웁니다. (0이면 보관)"""
+    from utils.job_store import JOB_DIR  # job_store 는 표준 라이브러리만 사용 (순환 임포트 없음)
+    reclaimed = reclaimed_bytes = 0
+    if SCRATCH_JOB_RESULT_TTL_SEC > 0:
+        for entry in os.scandir(JOB_DIR) if JOB_DIR.is_dir() else []:
+            if (entry.is_dir() and _SESSION_NAME.match(entry.name)
+                    and now - entry.stat().st_mtime > SCRATCH_JOB_RESULT_TTL_SEC):
+                reclaimed_bytes += _reclaim([entry.path], "expired", "jobs")
+                reclaimed += 1
+    if reclaimed:
+        print(f"   > [Scratch] 🧹 보관 기간이 지난 작업 결과 {reclaimed}개 정리 ({reclaimed_bytes / 1024 ** 2:.1f}MB)")
+    return {"root": str(JOB_DIR), "reclaimed_sessions": reclaimed, "reclaimed_bytes": reclaimed_bytes}
+
+
+def _sweep_profiles(now: float) -> dict:
+    """profiles/<작업ID>: 보관 기간(SCRATCH_JOB_RESULT_TTL_SEC)이 지났거나 최신 SCRATCH_PROFILE_MAX_COUNT 개 밖인 프로파일 삭제"""
+    from utils.profiler import PROFILE_DIR  # profiler 는 표준 라이브러리만 사용 (순환 임포트 없음)
+    entries = [entry for entry in (os.scandir(PROFILE_DIR) if PROFILE_DIR.is_dir() else [])
+               if entry.is_dir() and _SESSION_NAME.match(entry.name)]
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    reclaimed = reclaimed_bytes = 0
+    for index, entry in enumerate(entries):
+        if SCRATCH_PROFILE_MAX_COUNT > 0 and index >= SCRATCH_PROFILE_MAX_COUNT:
+            reason = "over_limit"
+        elif SCRATCH_JOB_RESULT_TTL_SEC > 0 and now - entry.stat().st_mtime > SCRATCH_JOB_RESULT_TTL_SEC:
+            reason = "expired"
+        else:
+            continue
+        reclaimed_bytes += _reclaim([entry.path], reason, "profiles")
+        reclaimed += 1
+    if reclaimed:
+        print(f"   > [Scratch] 🧹 작업 프로파일 {reclaimed}개 정리 ({reclaimed_bytes / 1024 ** 2:.1f}MB)")
+    return {"root": str(PROFILE_DIR), "reclaimed_sessions": reclaimed, "reclaimed_bytes": reclaimed_bytes}
+
+
+def _janitor_loop(interval: float):
+    while True:
+        try:
+            sweep_scratch()
+        except Exception as e:
+            print(f"   > [Scratch] ⚠️ 임시 폴더 정리 오류: {e}")
+        if _janitor["stop"].wait(interval):
+            break
+
+
+def start_scratch_janitor(interval: float = SCRATCH_JANITOR_INTERVAL_SEC):
+    """정리 스레드 시작 (시작하자마자 한 번 정리한 뒤 interval초마다 반복)"""
+    if _janitor["thread"] and _janitor["thread"].is_alive():
+        return
+    _janitor["stop"].clear()
+    _janitor["thread"] = threading.Thread(target=_janitor_loop, args=(interval,), name="scratch-janitor", daemon=True)
+    _janitor["thread"].start()
+
+
+def stop_scratch_janitor():
+    _janitor["stop"].set()